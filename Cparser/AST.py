@@ -1,5 +1,44 @@
+# Every node class lists its attributes in __slots__, those the parser sets
+# and those later passes annotate it with, so nodes carry no __dict__.
+# lineno is set on every node, to None when the parser gives it no line.
+
+layouts = {}
+
+
+def fields(cls):
+    # names of the attributes of instances of cls, base classes first
+    try:
+        return layouts[cls]
+    except KeyError:
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(klass.__dict__.get('__slots__', ()))
+        layouts[cls] = tuple(names)
+        return layouts[cls]
+
+
+def children(node):
+    # the nodes node holds, in place of the vars(node).values() of old
+    if isinstance(node, List):
+        return node.elements
+    result = []
+    for name in fields(node.__class__):
+        child = getattr(node, name, None)
+        if isinstance(child, Node):
+            result.append(child)
+    return result
+
+
 class Node(object):
+    __slots__ = ('lineno',)
+
+    def __new__(cls, *args):
+        node = object.__new__(cls)
+        node.lineno = None
+        return node
+
     def __str__(self):
+        import TreePrinter  # adds printTree to every node class
         return self.printTree()
 
     def setLineNo(self, line):
@@ -10,6 +49,8 @@ class Node(object):
 
 
 class Program(Node):
+    __slots__ = ('declarations', 'fundefs', 'instructions', 'frame_size', 'varnames', 'code')
+
     def __init__(self, decl, fundef, instr):
         self.declarations = decl
         self.fundefs = fundef
@@ -17,12 +58,16 @@ class Program(Node):
 
 
 class FunctionCall(Node):
+    __slots__ = ('id', 'arglist', 'type')
+
     def __init__(self, id, arglist):
         self.id = id
         self.arglist = arglist
 
 
 class BinExpr(Node):
+    __slots__ = ('op', 'left', 'right', 'type', 'operand_types', 'operate', 'evaluate')
+
     def __init__(self, op, left, right):
         self.op = op
         self.left = left
@@ -30,15 +75,19 @@ class BinExpr(Node):
 
 
 class RelExpr(BinExpr):
-    pass
+    __slots__ = ()
 
 
 class Assignment(BinExpr):
+    __slots__ = ('address',)
+
     def __init__(self, left, right):
         BinExpr.__init__(self, '=', left, right)
 
 
 class List(Node):
+    __slots__ = ('elements',)
+
     def __init__(self, elements):
         self.elements = elements
 
@@ -55,18 +104,24 @@ class List(Node):
 
 
 class Declaration(Node):
+    __slots__ = ('type', 'initList')
+
     def __init__(self, type, initList):
         self.type = type
         self.initList = initList
 
 
 class InitList(List):
+    __slots__ = ()
+
     def addType(self, type):
         for e in self.elements:
             e.addType(type)
 
 
 class Init(Assignment):
+    __slots__ = ()
+
     def __init__(self, left, right):
         BinExpr.__init__(self, '=', left, right)
 
@@ -75,48 +130,54 @@ class Init(Assignment):
 
 
 class FunList(List):
-    pass
+    __slots__ = ()
 
 
 class DeclarationList(List):
-    pass
+    __slots__ = ()
 
 
 class InstructionList(List):
-    pass
+    __slots__ = ()
 
 
 class Const(Node):
+    __slots__ = ('value', 'type')
+
     def __init__(self, value):
         self.value = value
 
 
 class Integer(Const):
-    pass
+    __slots__ = ()
 
 
 class Float(Const):
-    pass
+    __slots__ = ()
 
 
 class String(Const):
-    pass
+    __slots__ = ()
 
 
 class ID(Node):
+    __slots__ = ('id', 'type', 'address')
+
     def __init__(self, id):
         self.id = id
 
 
 class ExpressionList(List):
-    pass
+    __slots__ = ()
 
 
 class ArgumentList(List):
-    pass
+    __slots__ = ()
 
 
 class Function(Node):
+    __slots__ = ('retType', 'id', 'arglist', 'body', 'address', 'frame_size', 'varnames', 'memo')
+
     def __init__(self, retType, id, arglist, body):
         self.body = body
         self.arglist = arglist
@@ -128,76 +189,90 @@ class Function(Node):
 
 
 class Variable(Node):
+    __slots__ = ('type', 'id')
+
     def __init__(self, type, id):
         self.type = type
         self.id = id
 
-        # ...
-
 
 class Argument(Variable):
-    pass
+    __slots__ = ()
 
 
 class Instruction(Node):
-    pass
+    __slots__ = ()
 
 
 class CompoundInstruction(Instruction):
+    __slots__ = ('decList', 'incList')
+
     def __init__(self, decList, incList):
         self.decList = decList
         self.incList = incList
 
 
 class FlowInstruction(Instruction):
-    pass
+    __slots__ = ()
 
 
 class BreakInstruction(FlowInstruction):
-    pass
+    __slots__ = ()
 
 
 class ContinueInstruction(FlowInstruction):
-    pass
+    __slots__ = ()
 
 
 class ReturnInstruction(Instruction):
+    __slots__ = ('returns',)
+
     def __init__(self, returns):
         self.returns = returns
 
 
 class LoopInstruction(Instruction):
+    __slots__ = ('condition', 'instructions')
+
     def __init__(self, condition, instructions):
         self.instructions = instructions
         self.condition = condition
 
 
 class RepeatLoopInstruction(LoopInstruction):
-    pass
+    __slots__ = ()
 
 
 class WhileLoopInstruction(LoopInstruction):
-    pass
+    __slots__ = ()
 
 
 class IfInstruction(Instruction):
+    __slots__ = ('condition', 'instruction')
+
     def __init__(self, condition, instruction):
         self.condition = condition
         self.instruction = instruction
 
 
 class IfElseInstruction(IfInstruction):
+    __slots__ = ('no_instruction',)
+
     def __init__(self, condition, yes_instruction, no_instruction):
         IfInstruction.__init__(self, condition, yes_instruction)
         self.no_instruction = no_instruction
 
 
 class LabeledInstruction(Instruction):
+    __slots__ = ('label', 'instruction')
+
     def __init__(self, label, instruction):
         self.label = label
         self.instruction = instruction
 
 
 class PrintInstruction(Instruction):
+    __slots__ = ('expr',)
+
     def __init__(self, expr):
         self.expr = expr
\ No newline at end of file
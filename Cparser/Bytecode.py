@@ -0,0 +1,358 @@
+import AST
+from Resolver import LOCAL
+from visit import *
+
+# Instructions are stored flat: code[pc] is the opcode and code[pc + 1] its
+# argument (0 when the opcode takes none), so every instruction is 2 wide.
+
+LOAD_CONST = 0
+LOAD_LOCAL = 1
+LOAD_GLOBAL = 2
+STORE_LOCAL = 3
+STORE_GLOBAL = 4
+BINARY_ADD = 5
+BINARY_SUBTRACT = 6
+BINARY_MULTIPLY = 7
+BINARY_DIVIDE = 8
+BINARY_MODULO = 9
+BINARY_OR = 10
+BINARY_AND = 11
+BINARY_XOR = 12
+BINARY_LSHIFT = 13
+BINARY_RSHIFT = 14
+COMPARE_LT = 15
+COMPARE_GT = 16
+COMPARE_LE = 17
+COMPARE_GE = 18
+COMPARE_EQ = 19
+COMPARE_NE = 20
+LOGICAL_AND = 21
+LOGICAL_OR = 22
+JUMP = 23
+JUMP_IF_FALSE = 24
+CALL = 25
+RET = 26
+PRINT = 27
+RAISE = 28
+HALT = 29
+TAIL_CALL = 30
+
+opname = dict((value, name) for name, value in globals().items() if name.isupper() and isinstance(value, int))
+
+binary_opcodes = {
+    '+': BINARY_ADD,
+    '-': BINARY_SUBTRACT,
+    '*': BINARY_MULTIPLY,
+    '/': BINARY_DIVIDE,
+    '%': BINARY_MODULO,
+    '|': BINARY_OR,
+    '&': BINARY_AND,
+    '^': BINARY_XOR,
+    'SHL': BINARY_LSHIFT,
+    'SHR': BINARY_RSHIFT,
+    '<': COMPARE_LT,
+    '>': COMPARE_GT,
+    '<=': COMPARE_LE,
+    '>=': COMPARE_GE,
+    '==': COMPARE_EQ,
+    '!=': COMPARE_NE,
+    '&&': LOGICAL_AND,
+    '||': LOGICAL_OR,
+}
+
+jump_opcodes = (JUMP, JUMP_IF_FALSE)
+
+
+class Code(object):
+    def __init__(self, name, arity=0, globalnames=None):
+        self.name = name
+        self.arity = arity
+        self.nlocals = 0
+        self.code = []
+        self.consts = []
+        self.lines = []
+        self.varnames = {}
+        self.globalnames = globalnames if globalnames is not None else self.varnames
+        self.functions = []
+        # MemoCache of the function's results, set by -O memo
+        self.memo = None
+
+    def __repr__(self):
+        return "<code {0}>".format(self.name)
+
+    def emit(self, op, arg=0):
+        self.code.extend((op, arg))
+        return len(self.code) - 2
+
+    def patch(self, at, target):
+        self.code[at + 1] = target
+
+    def here(self):
+        return len(self.code)
+
+    def const(self, value):
+        # 0.0 == -0.0, but they do not print the same
+        same = (lambda const: repr(const) == repr(value)) if type(value) is float else (lambda const: const == value)
+        for i, const in enumerate(self.consts):
+            if const is value or (type(const) is type(value) and not isinstance(value, Code) and same(const)):
+                return i
+        self.consts.append(value)
+        return len(self.consts) - 1
+
+    def mark_line(self, lineno):
+        if lineno is not None and (not self.lines or self.lines[-1][1] != lineno):
+            self.lines.append((self.here(), lineno))
+
+
+class Loop(object):
+    def __init__(self):
+        self.breaks = []
+        self.continues = []
+
+
+class BytecodeCompiler(object):
+    def __init__(self):
+        self.loops = []
+
+    def compile_program(self, program):
+        self.code = None
+        return self.compile(program)
+
+    def load(self, address):
+        if address is None:
+            self.code.emit(LOAD_CONST, self.code.const(None))
+        elif address[0] == LOCAL:
+            self.code.emit(LOAD_LOCAL, address[1])
+        else:
+            self.code.emit(LOAD_GLOBAL, address[1])
+
+    def store(self, address):
+        self.code.emit(STORE_LOCAL if address[0] == LOCAL else STORE_GLOBAL, address[1])
+
+    @on('node')
+    def compile(self, node):
+        pass
+
+    @when(AST.Program)
+    def compile(self, node):
+        program = self.program = self.code = Code('<program>')
+        program.varnames = program.globalnames = node.varnames
+        self.compile(node.declarations)
+        self.compile(node.fundefs)
+        self.compile(node.instructions)
+        program.emit(HALT)
+        program.nlocals = node.frame_size
+        return program
+
+    @when(AST.List)
+    def compile(self, node):
+        for element in node.elements:
+            self.compile(element)
+
+    @when(AST.Declaration)
+    def compile(self, node):
+        self.compile(node.initList)
+
+    @when(AST.Init)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        if node.address is None:
+            self.code.emit(RAISE, self.code.const("Variable {0} already defined".format(node.left)))
+            return
+
+        self.compile(node.right)
+        self.store(node.address)
+
+    @when(AST.Function)
+    def compile(self, node):
+        program = self.code
+        code = self.code = Code(node.id, node.arity(), program.globalnames)
+        code.varnames = node.varnames
+        code.memo = getattr(node, 'memo', None)
+
+        loops, self.loops = self.loops, []
+        self.compile(node.body)
+        self.loops = loops
+        code.emit(LOAD_CONST, code.const(None))
+        code.emit(RET)
+        code.nlocals = node.frame_size
+
+        self.code = program
+        program.functions.append(code)
+        program.mark_line(node.lineno)
+        program.emit(LOAD_CONST, program.const(code))
+        self.store(node.address)
+
+    @when(AST.CompoundInstruction)
+    def compile(self, node):
+        self.compile(node.decList)
+        self.compile(node.incList)
+
+    @when(AST.Assignment)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        if node.address is None:
+            self.code.emit(RAISE, self.code.const("Undeclared variable {0}".format(node.left)))
+            return
+
+        self.compile(node.right)
+        self.store(node.address)
+
+    @when(AST.BinExpr)
+    def compile(self, node):
+        self.compile(node.left)
+        self.compile(node.right)
+        self.code.emit(binary_opcodes[node.op])
+
+    @when(AST.Integer)
+    def compile(self, node):
+        self.code.emit(LOAD_CONST, self.code.const(node.value))
+
+    @when(AST.Float)
+    def compile(self, node):
+        self.code.emit(LOAD_CONST, self.code.const(node.value))
+
+    @when(AST.String)
+    def compile(self, node):
+        self.code.emit(LOAD_CONST, self.code.const(node.value[1:-1]))
+
+    @when(AST.ID)
+    def compile(self, node):
+        self.load(node.address)
+
+    @when(AST.WhileLoopInstruction)
+    def compile(self, node):
+        code = self.code
+        code.mark_line(node.lineno)
+        loop = Loop()
+        start = code.here()
+        exits = []
+        if node.condition is not None:
+            self.compile(node.condition)
+            exits.append(code.emit(JUMP_IF_FALSE))
+
+        self.loops.append(loop)
+        self.compile(node.instructions)
+        self.loops.pop()
+        code.emit(JUMP, start)
+
+        for at in loop.continues:
+            code.patch(at, start)
+        for at in loop.breaks + exits:
+            code.patch(at, code.here())
+
+    @when(AST.RepeatLoopInstruction)
+    def compile(self, node):
+        code = self.code
+        code.mark_line(node.lineno)
+        loop = Loop()
+        start = code.here()
+
+        self.loops.append(loop)
+        self.compile(node.instructions)
+        self.loops.pop()
+
+        condition = code.here()
+        if node.condition is not None:
+            self.compile(node.condition)
+            code.emit(JUMP_IF_FALSE, start)
+        else:
+            code.emit(JUMP, start)
+
+        for at in loop.continues:
+            code.patch(at, condition)
+        for at in loop.breaks:
+            code.patch(at, code.here())
+
+    @when(AST.IfInstruction)
+    def compile(self, node):
+        code = self.code
+        code.mark_line(node.lineno)
+        self.compile(node.condition)
+        skip = code.emit(JUMP_IF_FALSE)
+        self.compile(node.instruction)
+        code.patch(skip, code.here())
+
+    @when(AST.IfElseInstruction)
+    def compile(self, node):
+        code = self.code
+        code.mark_line(node.lineno)
+        self.compile(node.condition)
+        no = code.emit(JUMP_IF_FALSE)
+        self.compile(node.instruction)
+        end = code.emit(JUMP)
+        code.patch(no, code.here())
+        self.compile(node.no_instruction)
+        code.patch(end, code.here())
+
+    @when(AST.PrintInstruction)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        self.compile(node.expr)
+        self.code.emit(PRINT)
+
+    @when(AST.LabeledInstruction)
+    def compile(self, node):
+        self.compile(node.instruction)
+
+    @when(AST.ReturnInstruction)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        call = node.returns
+        if isinstance(call, AST.FunctionCall) and self.code is not self.program:
+            # replaces the frame of the running function instead of pushing one
+            for arg in call.arglist.elements:
+                self.compile(arg)
+            self.load(call.id.address)
+            self.code.emit(TAIL_CALL, len(call.arglist.elements))
+            return
+
+        self.compile(node.returns)
+        self.code.emit(RET)
+
+    @when(AST.ContinueInstruction)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        self.loops[-1].continues.append(self.code.emit(JUMP))
+
+    @when(AST.BreakInstruction)
+    def compile(self, node):
+        self.code.mark_line(node.lineno)
+        self.loops[-1].breaks.append(self.code.emit(JUMP))
+
+    @when(AST.FunctionCall)
+    def compile(self, node):
+        for arg in node.arglist.elements:
+            self.compile(arg)
+        self.load(node.id.address)
+        self.code.emit(CALL, len(node.arglist.elements))
+
+
+def disassemble(code):
+    lines = ["Disassembly of {0} ({1} argument(s), {2} local(s)):".format(code.name, code.arity, code.nlocals)]
+    linestarts = dict(code.lines)
+    targets = set(code.code[pc + 1] for pc in range(0, len(code.code), 2) if code.code[pc] in jump_opcodes)
+
+    for pc in range(0, len(code.code), 2):
+        op, arg = code.code[pc], code.code[pc + 1]
+        if op == LOAD_CONST or op == RAISE:
+            argrepr = repr(code.consts[arg])
+        elif op == LOAD_LOCAL or op == STORE_LOCAL:
+            argrepr = code.varnames.get(arg, '')
+        elif op == LOAD_GLOBAL or op == STORE_GLOBAL:
+            argrepr = code.globalnames.get(arg, '')
+        else:
+            argrepr = ''
+
+        line = "{0:>4} {1:>2}{2:>5} {3:<16}".format(linestarts.get(pc, ''), '>>' if pc in targets else '', pc, opname[op])
+        if op in (LOAD_CONST, LOAD_LOCAL, LOAD_GLOBAL, STORE_LOCAL, STORE_GLOBAL, CALL, TAIL_CALL, RAISE) or op in jump_opcodes:
+            line += "{0:>4}".format(arg)
+        if argrepr:
+            line += " ({0})".format(argrepr)
+        lines.append(line.rstrip())
+
+    for function in code.functions:
+        lines.append('')
+        lines.append(disassemble(function))
+
+    return '\n'.join(lines)
@@ -0,0 +1,100 @@
+import cPickle
+import hashlib
+import os
+import tempfile
+import zlib
+
+# Programs as the front end left them, kept between runs: the tree the
+# parser built and TypeChecker annotated, and what they printed about it,
+# pickled and compressed into a file named by a digest of the source and of
+# the front end itself (the grammar, as in grammar.sig, and the checker), so
+# a change to either makes a new entry. The least recently used entries are
+# removed once the files take more than `limit` bytes. main.py only uses a
+# cache when asked to (--cache or CPARSER_CACHE), in ~/.cache/Cparser unless
+# --cache-dir says otherwise.
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+FRONTEND = ('scanner.py', 'Cparser.py', 'AST.py', 'TypeChecker.py', 'SymbolTable.py')
+SUFFIX = '.ast'
+
+
+class Recorder(object):
+    # stands in for sys.stdout, passing on what is written and keeping it
+    def __init__(self, stream):
+        self.stream = stream
+        self.parts = []
+
+    def write(self, text):
+        self.stream.write(text)
+        self.parts.append(text)
+
+    def text(self):
+        return ''.join(self.parts)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class CompileCache(object):
+    def __init__(self, directory, limit=64 << 20):
+        self.directory = directory
+        self.limit = limit
+
+    def key(self, text):
+        digest = hashlib.sha1()
+        for name in FRONTEND:
+            with open(os.path.join(DIRECTORY, name), 'rb') as source:
+                digest.update(source.read())
+        digest.update(text)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(self, key):
+        # (program, diagnostics) stored under key, or None
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as stored:
+                entry = cPickle.loads(zlib.decompress(stored.read()))
+            os.utime(path, None)
+        except (IOError, OSError, zlib.error, cPickle.UnpicklingError, EOFError,
+                AttributeError, ImportError, ValueError):
+            return None
+        return entry
+
+    def store(self, key, program, diagnostics):
+        data = zlib.compress(cPickle.dumps((program, diagnostics), cPickle.HIGHEST_PROTOCOL), 1)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            # written aside and renamed, so a concurrent run never loads
+            # half a file
+            handle, temporary = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(handle, 'wb') as stored:
+                stored.write(data)
+            os.rename(temporary, self.path(key))
+        except (IOError, OSError):
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((status.st_mtime, status.st_size, path))
+
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.limit:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
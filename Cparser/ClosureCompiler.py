@@ -0,0 +1,325 @@
+import AST
+from Exceptions import *
+from Interpreter import optype
+from Memory import FramePool
+from Resolver import LOCAL
+from visit import *
+
+# Every compiled node is a Python closure taking the frame `f` of the running
+# function (a plain list of slots, addressed as assigned by Resolver). Globals
+# live in the list `g` shared by all closures of one program, so at top level
+# `f` and `g` are the same list.
+#
+# Closures are generated from small source templates, specialized on the kind
+# of each operand, so e.g. BinExpr('+', ID, Integer) becomes a single
+# `f[o0] + o1` closure instead of three nested calls.
+
+operand_forms = {
+    'const': 'o{0}',
+    'local': 'f[o{0}]',
+    'global': 'g[o{0}]',
+    'expr': 'o{0}(f)',
+}
+
+expr_templates = {
+    '+': 'return {0} + {1}',
+    '-': 'return {0} - {1}',
+    '*': 'return {0} * {1}',
+    '/': 'return {0} / {1}',
+    '%': 'return {0} % {1}',
+    '|': 'return {0} | {1}',
+    '&': 'return {0} & {1}',
+    '^': 'return {0} ^ {1}',
+    'SHL': 'return {0} << {1}',
+    'SHR': 'return {0} >> {1}',
+    '<': 'return 1 if {0} < {1} else 0',
+    '>': 'return 1 if {0} > {1} else 0',
+    '<=': 'return 1 if {0} <= {1} else 0',
+    '>=': 'return 1 if {0} >= {1} else 0',
+    '==': 'return 1 if {0} == {1} else 0',
+    '!=': 'return 1 if {0} != {1} else 0',
+    # both operands are always evaluated, as in Interpreter
+    '&&': 'return {2}({0}, {1})',
+    '||': 'return {2}({0}, {1})',
+}
+
+factories = {}
+
+
+def specialize(template, operands, g):
+    kinds = tuple(kind for kind, value in operands)
+    factory = factories.get((template, kinds))
+    if factory is None:
+        args = ', '.join('o{0}'.format(i) for i in range(len(operands)))
+        forms = [operand_forms[kind].format(i) for i, kind in enumerate(kinds)]
+        source = "def factory(g, {0}):\n    def run(f):\n        {1}\n    return run\n"
+        namespace = {'BREAK': BREAK, 'RETURN': RETURN}
+        exec source.format(args, template.format(*forms)) in namespace
+        factory = factories[(template, kinds)] = namespace['factory']
+
+    return factory(g, *[value for kind, value in operands])
+
+
+def nothing(f):
+    pass
+
+
+def sequence(closures):
+    closures = tuple(closures)
+    if not closures:
+        return nothing
+    elif len(closures) == 1:
+        return closures[0]
+
+    def run(f):
+        for closure in closures:
+            signal = closure(f)
+            if signal is not None:
+                return signal
+
+    return run
+
+
+class ClosureCompiler(object):
+    def __init__(self):
+        self.globals = []
+        self.returned = [None]
+        self.loops = []
+
+    def run(self, program):
+        self.compile(program)()
+
+    def operand(self, node):
+        if isinstance(node, AST.Const):
+            return 'const', self.constant(node)
+        elif isinstance(node, AST.ID):
+            return self.variable(node.address)
+        else:
+            return 'expr', self.compile(node)
+
+    def constant(self, node):
+        if isinstance(node, AST.String):
+            return node.value[1:-1]
+        return node.value
+
+    def variable(self, address):
+        if address is None:
+            return 'const', None
+        depth, slot = address
+        return ('local' if depth == LOCAL else 'global'), slot
+
+    def make(self, template, *operands):
+        return specialize(template, operands, self.globals)
+
+    @on('node')
+    def compile(self, node):
+        pass
+
+    @when(AST.Program)
+    def compile(self, node):
+        declarations = self.compile(node.declarations)
+        fundefs = self.compile(node.fundefs)
+        instructions = self.compile(node.instructions)
+        g, returned = self.globals, self.returned
+        size = node.frame_size
+
+        def run():
+            g[:] = [None] * size
+            declarations(g)
+            fundefs(g)
+            signal = instructions(g)
+            if signal is not None:
+                raise escape(signal, trampoline(returned[0]))
+
+        return run
+
+    @when(AST.DeclarationList)
+    def compile(self, node):
+        return sequence(self.compile(declaration) for declaration in node.elements)
+
+    @when(AST.Declaration)
+    def compile(self, node):
+        return sequence(self.compile(init) for init in node.initList.elements)
+
+    @when(AST.Init)
+    def compile(self, node):
+        if node.address is None:
+            return self.error("Variable {0} already defined".format(node.left))
+
+        return self.make('{0} = {1}', self.variable(node.address), self.operand(node.right))
+
+    @when(AST.FunList)
+    def compile(self, node):
+        return sequence(self.compile(function) for function in node.elements)
+
+    @when(AST.Function)
+    def compile(self, node):
+        loops, self.loops = self.loops, []
+        body = self.compile(node.body)
+        self.loops = loops
+
+        name, arity = node.id, node.arity()
+        pool = FramePool(node.frame_size)
+        acquire, release = pool.acquire, pool.release
+        returned = self.returned
+
+        def enter(args):
+            if len(args) != arity:
+                raise Exception("{0} takes {1} argument(s); {2} given".format(name, arity, len(args)))
+
+            f = acquire(args)
+            signal = body(f)
+            release(f)
+
+            if signal is RETURN:
+                return returned[0]
+            elif signal is not None:
+                raise escape(signal)
+
+        def fun(*args):
+            # enter() spelled out, to keep plain calls to one Python frame
+            if len(args) != arity:
+                raise Exception("{0} takes {1} argument(s); {2} given".format(name, arity, len(args)))
+
+            f = acquire(args)
+            signal = body(f)
+            release(f)
+
+            if signal is RETURN:
+                value = returned[0]
+                return trampoline(value) if value.__class__ is TailCall else value
+            elif signal is not None:
+                raise escape(signal)
+
+        fun.enter = enter
+        memo = getattr(node, 'memo', None)
+        if memo is not None:
+            fun = memo.wrap(fun)
+        return self.make('{0} = {1}', self.variable(node.address), ('const', fun))
+
+    @when(AST.CompoundInstruction)
+    def compile(self, node):
+        declarations = self.compile(node.decList)
+        instructions = self.compile(node.incList)
+
+        if declarations is nothing:
+            return instructions
+        return sequence([declarations, instructions])
+
+    @when(AST.InstructionList)
+    def compile(self, node):
+        return sequence(self.compile(instruction) for instruction in node.elements)
+
+    @when(AST.Assignment)
+    def compile(self, node):
+        if node.address is None:
+            return self.error("Undeclared variable {0}".format(node.left))
+
+        return self.make('{0} = {1}', self.variable(node.address), self.operand(node.right))
+
+    @when(AST.BinExpr)
+    def compile(self, node):
+        left = self.operand(node.left)
+        right = self.operand(node.right)
+        return self.make(expr_templates[node.op], left, right, ('const', optype[node.op]))
+
+    @when(AST.Const)
+    def compile(self, node):
+        return self.make('return {0}', ('const', self.constant(node)))
+
+    @when(AST.ID)
+    def compile(self, node):
+        return self.make('return {0}', self.variable(node.address))
+
+    @when(AST.WhileLoopInstruction)
+    def compile(self, node):
+        # a missing condition never ends the loop
+        condition = self.operand(node.condition) if node.condition is not None else ('const', True)
+        body, signals = self.compile_loop_body(node)
+        if not signals:
+            return self.make('while {0}: {1}(f)', condition, ('const', body))
+
+        return self.make('while {0}:\n'
+                         '            signal = {1}(f)\n'
+                         '            if signal is BREAK: break\n'
+                         '            if signal is RETURN: return signal', condition, ('const', body))
+
+    @when(AST.RepeatLoopInstruction)
+    def compile(self, node):
+        condition = self.operand(node.condition) if node.condition is not None else ('const', False)
+        body, signals = self.compile_loop_body(node)
+        if not signals:
+            return self.make('while True:\n'
+                             '            {1}(f)\n'
+                             '            if {0}: break', condition, ('const', body))
+
+        return self.make('while True:\n'
+                         '            signal = {1}(f)\n'
+                         '            if signal is BREAK: break\n'
+                         '            if signal is RETURN: return signal\n'
+                         '            if {0}: break', condition, ('const', body))
+
+    def compile_loop_body(self, node):
+        # the set collects the signals that can reach this loop from its body
+        self.loops.append(set())
+        body = self.compile(node.instructions)
+        return body, self.loops.pop()
+
+    @when(AST.IfInstruction)
+    def compile(self, node):
+        condition = self.operand(node.condition)
+        instruction = self.compile(node.instruction)
+        return self.make('if {0}: return {1}(f)', condition, ('const', instruction))
+
+    @when(AST.IfElseInstruction)
+    def compile(self, node):
+        condition = self.operand(node.condition)
+        instruction = self.compile(node.instruction)
+        no_instruction = self.compile(node.no_instruction)
+        return self.make('if {0}: return {1}(f)\n        else: return {2}(f)', condition,
+                         ('const', instruction), ('const', no_instruction))
+
+    @when(AST.PrintInstruction)
+    def compile(self, node):
+        return self.make('print {0}', self.operand(node.expr))
+
+    @when(AST.LabeledInstruction)
+    def compile(self, node):
+        return self.compile(node.instruction)
+
+    @when(AST.ReturnInstruction)
+    def compile(self, node):
+        for loop in self.loops:
+            loop.add(RETURN)
+        call = node.returns
+        if isinstance(call, AST.FunctionCall):
+            # the caller makes the call, see trampoline(); the arguments
+            # are evaluated before the callee, as in Interpreter
+            args = [self.operand(arg) for arg in call.arglist.elements]
+            forms = ''.join('{{{0}}}, '.format(i + 3) for i in range(len(args)))
+            return self.make('args = (' + forms + ')\n        {1}[0] = {2}({0}, args)\n        return RETURN',
+                             self.variable(call.id.address), ('const', self.returned), ('const', TailCall), *args)
+        return self.make('{1}[0] = {0}\n        return RETURN', self.operand(node.returns), ('const', self.returned))
+
+    @when(AST.ContinueInstruction)
+    def compile(self, node):
+        self.loops[-1].add(CONTINUE)
+        return self.make('return {0}', ('const', CONTINUE))
+
+    @when(AST.BreakInstruction)
+    def compile(self, node):
+        self.loops[-1].add(BREAK)
+        return self.make('return {0}', ('const', BREAK))
+
+    @when(AST.FunctionCall)
+    def compile(self, node):
+        callee = self.variable(node.id.address)
+        args = [self.operand(arg) for arg in node.arglist.elements]
+        forms = ', '.join('{{{0}}}'.format(i + 1) for i in range(len(args)))
+        return self.make('return {0}(' + forms + ')', callee, *args)
+
+    def error(self, message):
+        def run(f):
+            raise Exception(message)
+
+        return run
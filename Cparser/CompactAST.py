@@ -0,0 +1,186 @@
+from array import array
+import AST
+
+# A program tree in parallel arrays instead of one object per node. Node i
+# has the class classes[kind[i]] and the line lineno[i] (NOLINE for None);
+# its attributes, in the order of AST.fields(), are the entries of `links`
+# from first[i] on: the index of a node, or ~n for the constant pool[n].
+# For a List the entries are the number of elements and then the elements.
+#
+# Only nodes and constants (None, strings, numbers and tuples of them) are
+# kept, so a tree is compacted as the parser and TypeChecker leave it;
+# annotations of later passes that are not constants are left out, and
+# those passes run again on the tree expand() gives back.
+#
+# view() gives a node that reads its attributes from the arrays: an
+# instance of a subclass of its AST class, so the visitors dispatch on it
+# as on the node itself. Views are made as they are reached and kept, so
+# a node has one view. What is assigned to a view (the annotations of
+# TypeChecker, Resolver and the engines, or a child a pass replaced) goes
+# to `annotations`, by node index and name, and is read back from there.
+# So TypeChecker, the passes and every engine run on view() as on the tree
+# of objects (acceptance_test.py --compact), though the views and the
+# annotations they gather cost memory again as the program runs.
+
+NOLINE = -1
+UNSET = object()  # a slot that was never set
+constant_types = (basestring, int, long, float, tuple, type(None))
+
+
+class CompactTree(object):
+    def __init__(self, node):
+        self.classes = []
+        self.kinds = {}
+        self.layouts = []
+        self.kind = array('B')
+        self.lineno = array('i')
+        self.first = array('i')
+        self.links = array('i')
+        self.pool = [UNSET]
+        self.constants = {(object, UNSET): 0}
+        self.views = {}
+        self.made = {}  # node index -> its view
+        self.annotations = {}  # (node index, name) -> value assigned to its view
+        self.add(node)
+
+    def __len__(self):
+        return len(self.kind)
+
+    def register(self, cls):
+        kind = self.kinds[cls] = len(self.classes)
+        self.classes.append(cls)
+        self.layouts.append(tuple(name for name in AST.fields(cls) if name != 'lineno'))
+        return kind
+
+    def constant(self, value):
+        if not isinstance(value, constant_types) or isinstance(value, tuple) and \
+                not all(isinstance(item, constant_types) for item in value):
+            value = UNSET
+        key = (type(value), value)
+        try:
+            return self.constants[key]
+        except KeyError:
+            self.constants[key] = len(self.pool)
+            self.pool.append(value)
+            return len(self.pool) - 1
+
+    def add(self, root):
+        # appends root and its descendants in preorder, with a stack of the
+        # nodes still to add and the entry of `links` that will point to each
+        kind, lineno, first, links = self.kind, self.lineno, self.first, self.links
+        stack = [(root, None)]
+        while stack:
+            node, at = stack.pop()
+            index = len(kind)
+            if at is not None:
+                links[at] = index
+
+            cls = node.__class__
+            code = self.kinds.get(cls)
+            if code is None:
+                code = self.register(cls)
+            kind.append(code)
+            lineno.append(NOLINE if node.lineno is None else node.lineno)
+            first.append(len(links))
+
+            pending = []
+            if isinstance(node, AST.List):
+                links.append(len(node.elements))
+                for element in node.elements:
+                    pending.append((element, len(links)))
+                    links.append(0)
+            else:
+                for name in self.layouts[code]:
+                    value = getattr(node, name, UNSET)
+                    if isinstance(value, AST.Node):
+                        pending.append((value, len(links)))
+                        links.append(0)
+                    else:
+                        links.append(~self.constant(value))
+            stack.extend(reversed(pending))
+
+    def value(self, position):
+        link = self.links[position]
+        if link >= 0:
+            return self.view(link)
+        return self.pool[~link]
+
+    def view(self, index=0):
+        try:
+            return self.made[index]
+        except KeyError:
+            pass
+        cls = self.classes[self.kind[index]]
+        try:
+            view_class = self.views[cls]
+        except KeyError:
+            view_class = self.views[cls] = view_type(cls, self.layouts[self.kind[index]])
+        view = object.__new__(view_class)
+        view.tree = self
+        view.index = index
+        self.made[index] = view
+        return view
+
+    def expand(self):
+        # the tree of node objects the arrays hold; every node comes after
+        # its parent, so going backwards makes children first
+        nodes = [None] * len(self.kind)
+        for index in xrange(len(self.kind) - 1, -1, -1):
+            cls = self.classes[self.kind[index]]
+            node = object.__new__(cls)
+            line = self.lineno[index]
+            node.lineno = None if line == NOLINE else line
+            position = self.first[index]
+            if issubclass(cls, AST.List):
+                count = self.links[position]
+                node.elements = [nodes[link] for link in self.links[position + 1:position + 1 + count]]
+            else:
+                for offset, name in enumerate(self.layouts[self.kind[index]]):
+                    link = self.links[position + offset]
+                    value = nodes[link] if link >= 0 else self.pool[~link]
+                    if value is not UNSET:
+                        setattr(node, name, value)
+            nodes[index] = node
+        return nodes[0]
+
+
+def view_type(cls, layout):
+    # a subclass of cls reading every attribute from a CompactTree
+    def annotated(name, get):
+        def read(view):
+            value = view.tree.annotations.get((view.index, name), UNSET)
+            if value is UNSET:
+                value = get(view)
+                if value is UNSET:
+                    raise AttributeError(name)
+            return value
+
+        def write(view, value):
+            view.tree.annotations[view.index, name] = value
+        return property(read, write)
+
+    def attribute(offset):
+        return lambda view: view.tree.value(view.tree.first[view.index] + offset)
+
+    def lineno(view):
+        line = view.tree.lineno[view.index]
+        return None if line == NOLINE else line
+
+    def elements(view):
+        # kept once read, as visitors change the list in place
+        tree = view.tree
+        position = tree.first[view.index]
+        count = tree.links[position]
+        elements = [tree.value(position + 1 + offset) for offset in xrange(count)]
+        tree.annotations[view.index, 'elements'] = elements
+        return elements
+
+    # __class__ is cls, for the engines that find handlers by the exact class
+    namespace = {'__slots__': ('tree', 'index'), '__class__': property(lambda view: cls),
+                 'lineno': annotated('lineno', lineno)}
+    if issubclass(cls, AST.List):
+        namespace['elements'] = annotated('elements', elements)
+    else:
+        for offset, name in enumerate(layout):
+            namespace[name] = annotated(name, attribute(offset))
+    return type(cls.__name__, (cls,), namespace)
@@ -0,0 +1,228 @@
+#!/usr/bin/python
+import AST
+from Interpreter import optype
+from TypeChecker import NodeVisitor, ttype
+
+literal_types = {AST.Integer: 'int', AST.Float: 'float', AST.String: 'string'}
+
+def constant(node):
+    # value of a literal as the engines evaluate it
+    if isinstance(node, AST.String):
+        return node.value[1:-1]
+    return node.value
+
+
+def literal(type, value, lineno):
+    if type == 'string':
+        node = AST.String('"' + value + '"')
+    elif type == 'float':
+        node = AST.Float(value)
+    else:
+        node = AST.Integer(value)
+    node.type = type
+    node.setLineNo(lineno)
+    return node
+
+
+def text(node):
+    # one-line rendering of an expression, for reports
+    if isinstance(node, AST.Const):
+        return repr(node.value) if isinstance(node.value, float) else str(node.value)
+    elif isinstance(node, AST.ID):
+        return node.id
+    elif isinstance(node, AST.FunctionCall):
+        return "{0}({1})".format(node.id.id, ', '.join(text(arg) for arg in node.arglist.elements))
+    elif isinstance(node, AST.BinExpr):
+        return "({0} {1} {2})".format(text(node.left), node.op, text(node.right))
+    return node.__class__.__name__
+
+
+def pure(node):
+    # evaluating node has no effect besides its value and cannot fail
+    if isinstance(node, AST.FunctionCall):
+        return False
+    elif isinstance(node, AST.BinExpr):
+        if node.op not in optype:
+            return False
+        if node.op in ('/', '%') and not (isinstance(node.right, AST.Const) and constant(node.right)):
+            return False
+        # a negative shift count raises ValueError
+        if node.op in ('SHL', 'SHR') and not (isinstance(node.right, AST.Integer) and node.right.value >= 0):
+            return False
+        return pure(node.left) and pure(node.right)
+    return True
+
+
+def is_int(node, value):
+    return isinstance(node, AST.Integer) and node.value == value
+
+
+class ConstantFolder(NodeVisitor):
+    # Optional pass between TypeChecker and Resolver. Folds BinExpr and RelExpr
+    # subtrees over literals with the Interpreter.optype semantics and the
+    # TypeChecker.ttype result types, simplifies x+0, x-0, x*1, x/1 and x*0 on
+    # ints, and drops the condition of loops that can never exit it
+    # (condition None means unconditional). Every change is recorded in
+    # `changes` as a (lineno, message) pair.
+    max_size = 1024
+
+    def __init__(self):
+        self.changes = []
+        self.lineno = 0
+
+    def report(self, message):
+        self.changes.append((self.lineno, message))
+
+    def generic_visit(self, node, symbols):
+        return node
+
+    def statement(self, node):
+        self.lineno = node.lineno or self.lineno
+
+    def visit_all(self, elements, symbols):
+        for i, element in enumerate(elements):
+            elements[i] = self.visit(element, symbols)
+
+    def visit_Program(self, node, symbols):
+        self.visit(node.declarations, symbols)
+        self.visit(node.fundefs, symbols)
+        self.visit(node.instructions, symbols)
+        return node
+
+    def visit_DeclarationList(self, node, symbols):
+        self.visit_all(node.elements, symbols)
+        return node
+
+    def visit_Declaration(self, node, symbols):
+        self.visit_all(node.initList.elements, symbols)
+        return node
+
+    def visit_Init(self, node, symbols):
+        self.statement(node)
+        node.right = self.visit(node.right, symbols)
+        return node
+
+    def visit_FunList(self, node, symbols):
+        self.visit_all(node.elements, symbols)
+        return node
+
+    def visit_Function(self, node, symbols):
+        self.statement(node)
+        node.body = self.visit(node.body, symbols)
+        return node
+
+    def visit_CompoundInstruction(self, node, symbols):
+        self.visit(node.decList, symbols)
+        self.visit(node.incList, symbols)
+        return node
+
+    def visit_InstructionList(self, node, symbols):
+        self.visit_all(node.elements, symbols)
+        return node
+
+    def visit_ExpressionList(self, node, symbols):
+        self.visit_all(node.elements, symbols)
+        return node
+
+    def visit_Assignment(self, node, symbols):
+        self.statement(node)
+        node.right = self.visit(node.right, symbols)
+        return node
+
+    def visit_PrintInstruction(self, node, symbols):
+        self.statement(node)
+        node.expr = self.visit(node.expr, symbols)
+        return node
+
+    def visit_ReturnInstruction(self, node, symbols):
+        self.statement(node)
+        node.returns = self.visit(node.returns, symbols)
+        return node
+
+    def visit_LabeledInstruction(self, node, symbols):
+        self.statement(node)
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfInstruction(self, node, symbols):
+        self.statement(node)
+        node.condition = self.visit(node.condition, symbols)
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfElseInstruction(self, node, symbols):
+        self.visit_IfInstruction(node, symbols)
+        node.no_instruction = self.visit(node.no_instruction, symbols)
+        return node
+
+    def visit_WhileLoopInstruction(self, node, symbols):
+        self.statement(node)
+        if node.condition is not None:
+            node.condition = self.visit(node.condition, symbols)
+            if isinstance(node.condition, AST.Const) and constant(node.condition):
+                self.report("while condition {0} is always true, loop made unconditional".format(text(node.condition)))
+                node.condition = None
+        node.instructions = self.visit(node.instructions, symbols)
+        return node
+
+    def visit_RepeatLoopInstruction(self, node, symbols):
+        self.statement(node)
+        node.instructions = self.visit(node.instructions, symbols)
+        if node.condition is not None:
+            node.condition = self.visit(node.condition, symbols)
+            if isinstance(node.condition, AST.Const) and not constant(node.condition):
+                self.report("until condition {0} is always false, loop made unconditional".format(text(node.condition)))
+                node.condition = None
+        return node
+
+    def visit_FunctionCall(self, node, symbols):
+        self.visit(node.arglist, symbols)
+        return node
+
+    def visit_BinExpr(self, node, symbols):
+        node.left = self.visit(node.left, symbols)
+        node.right = self.visit(node.right, symbols)
+
+        if isinstance(node.left, AST.Const) and isinstance(node.right, AST.Const):
+            return self.fold(node)
+        return self.simplify(node)
+
+    visit_RelExpr = visit_BinExpr
+
+    def fold(self, node):
+        try:
+            type = ttype[node.op][literal_types[node.left.__class__]][literal_types[node.right.__class__]]
+        except KeyError:
+            return node
+
+        left, right = constant(node.left), constant(node.right)
+        if node.op == 'SHL' and right > self.max_size:
+            return node
+        if type == 'string' and len(left) * (right if node.op == '*' else 1) > self.max_size:
+            return node
+
+        try:
+            value = optype[node.op](left, right)
+        except (ArithmeticError, TypeError, ValueError):
+            return node
+
+        folded = literal(type, value, node.lineno or self.lineno)
+        self.report("folded {0} to {1}".format(text(node), text(folded)))
+        return folded
+
+    def simplify(self, node):
+        if getattr(node, 'type', None) != 'int':
+            return node
+
+        left, right, op = node.left, node.right, node.op
+        if (op in ('+', '-') and is_int(right, 0)) or (op in ('*', '/') and is_int(right, 1)):
+            result = left
+        elif (op == '+' and is_int(left, 0)) or (op == '*' and is_int(left, 1)):
+            result = right
+        elif op == '*' and ((is_int(right, 0) and pure(left)) or (is_int(left, 0) and pure(right))):
+            result = literal('int', 0, node.lineno or self.lineno)
+        else:
+            return node
+
+        self.report("simplified {0} to {1}".format(text(node), text(result)))
+        return result
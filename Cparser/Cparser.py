@@ -5,9 +5,10 @@ import AST
 
 
 class Cparser(object):
-    def __init__(self):
-        self.scanner = Scanner()
+    def __init__(self, scanner=None):
+        self.scanner = scanner if scanner is not None else Scanner()
         self.scanner.build()
+        self.errors = 0  # syntax errors met, in all sources
 
     tokens = Scanner.tokens
 
@@ -27,6 +28,7 @@ class Cparser(object):
     )
 
     def p_error(self, p):
+        self.errors += 1
         if p:
             error_str = "Syntax error at line {0}, column {1}: LexToken({2}, '{3}')"
             print(error_str.format(p.lineno, self.scanner.find_tok_column(p), p.type, p.value))
@@ -155,12 +157,12 @@ class Cparser(object):
 
     def p_const_int(self, p):
         """const : INTEGER"""
-        p[0] = AST.Integer(p[1])
+        p[0] = AST.Integer(int(p[1]))
         p[0].setLineNo(p.lineno(1))
 
     def p_const_float(self, p):
         """const : FLOAT"""
-        p[0] = AST.Float(p[1])
+        p[0] = AST.Float(float(p[1]))
         p[0].setLineNo(p.lineno(1))
 
     def p_const_str(self, p):
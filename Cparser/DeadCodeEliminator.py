@@ -0,0 +1,294 @@
+#!/usr/bin/python
+import AST
+from ConstantFolder import constant, pure
+from TypeChecker import NodeVisitor
+
+
+def empty():
+    # statement that does nothing; spliced away by the enclosing list
+    return AST.InstructionList([])
+
+
+def jumps(node, kind):
+    # whether node contains a `kind` statement aimed at the loop around node
+    if isinstance(node, kind):
+        return True
+    elif isinstance(node, AST.InstructionList):
+        return any(jumps(instruction, kind) for instruction in node.elements)
+    elif isinstance(node, AST.CompoundInstruction):
+        return jumps(node.incList, kind)
+    elif isinstance(node, AST.IfElseInstruction):
+        return jumps(node.instruction, kind) or jumps(node.no_instruction, kind)
+    elif isinstance(node, (AST.IfInstruction, AST.LabeledInstruction)):
+        return jumps(node.instruction, kind)
+    return False
+
+
+def completes(node):
+    # whether control can leave the statement normally, i.e. reach the next one
+    if isinstance(node, (AST.FlowInstruction, AST.ReturnInstruction)):
+        return False
+    elif isinstance(node, AST.InstructionList):
+        return all(completes(instruction) for instruction in node.elements)
+    elif isinstance(node, AST.CompoundInstruction):
+        return completes(node.incList)
+    elif isinstance(node, AST.IfElseInstruction):
+        return completes(node.instruction) or completes(node.no_instruction)
+    elif isinstance(node, AST.LabeledInstruction):
+        return completes(node.instruction)
+    elif isinstance(node, AST.WhileLoopInstruction):
+        return node.condition is not None or jumps(node.instructions, AST.BreakInstruction)
+    elif isinstance(node, AST.RepeatLoopInstruction):
+        if jumps(node.instructions, AST.BreakInstruction):
+            return True
+        return node.condition is not None and (completes(node.instructions) or
+                                               jumps(node.instructions, AST.ContinueInstruction))
+    return True
+
+
+class Liveness(NodeVisitor):
+    # Binds every name to its Init with the scoping rules of Resolver and
+    # counts the reads of each declared variable. `scope` is the list of
+    # enclosing blocks, innermost last; names bound to something other than
+    # an Init (arguments, functions) map to None.
+    def __init__(self):
+        self.reads = {}
+        self.writes = {}
+        self.keep = set()
+
+    def unused(self, program):
+        # the unused Inits and the assignments to them, when none of their
+        # right-hand sides needs to be evaluated
+        self.visit(program, None)
+        dead = set()
+        for init, reads in self.reads.items():
+            if reads or init in self.keep:
+                continue
+            stores = [init] + self.writes[init]
+            if all(pure(store.right) for store in stores):
+                dead.update(stores)
+        return dead
+
+    def lookup(self, name, scope):
+        for names in reversed(scope):
+            if name in names:
+                return names[name]
+        return None
+
+    def visit_Program(self, node, scope):
+        scope = [{}]
+        self.visit(node.declarations, scope)
+
+        for function in node.fundefs.elements:
+            # a function shares the slot of a global of the same name
+            if scope[0].get(function.id) is not None:
+                self.keep.add(scope[0][function.id])
+            scope[0][function.id] = None
+        self.visit(node.fundefs, scope)
+        self.visit(node.instructions, scope)
+
+    def visit_DeclarationList(self, node, scope):
+        for declaration in node.elements:
+            self.visit(declaration, scope)
+
+    def visit_Declaration(self, node, scope):
+        for init in node.initList.elements:
+            self.visit(init, scope)
+
+    def visit_Init(self, node, scope):
+        self.visit(node.right, scope)
+        names = scope[-1]
+        if node.left in names:
+            # redefinition fails at run time; leave both in place
+            self.keep.add(node)
+            if names[node.left] is not None:
+                self.keep.add(names[node.left])
+            return
+
+        names[node.left] = node
+        self.reads[node] = 0
+        self.writes[node] = []
+
+    def visit_FunList(self, node, scope):
+        for function in node.elements:
+            self.visit(function, scope)
+
+    def visit_Function(self, node, scope):
+        self.visit(node.body, scope + [dict((argument.id, None) for argument in node.arglist.elements)])
+
+    def visit_CompoundInstruction(self, node, scope):
+        scope = scope + [{}]
+        self.visit(node.decList, scope)
+        self.visit(node.incList, scope)
+
+    def visit_InstructionList(self, node, scope):
+        for instruction in node.elements:
+            self.visit(instruction, scope)
+
+    def visit_ExpressionList(self, node, scope):
+        for expression in node.elements:
+            self.visit(expression, scope)
+
+    def visit_Assignment(self, node, scope):
+        self.visit(node.right, scope)
+        init = self.lookup(node.left, scope)
+        if init is not None:
+            self.writes[init].append(node)
+
+    def visit_BinExpr(self, node, scope):
+        self.visit(node.left, scope)
+        self.visit(node.right, scope)
+
+    def visit_RelExpr(self, node, scope):
+        self.visit_BinExpr(node, scope)
+
+    def visit_ID(self, node, scope):
+        init = self.lookup(node.id, scope)
+        if init is not None:
+            self.reads[init] += 1
+
+    def visit_FunctionCall(self, node, scope):
+        self.visit(node.arglist, scope)
+        self.visit(node.id, scope)
+
+    def visit_PrintInstruction(self, node, scope):
+        self.visit(node.expr, scope)
+
+    def visit_ReturnInstruction(self, node, scope):
+        self.visit(node.returns, scope)
+
+    def visit_LabeledInstruction(self, node, scope):
+        self.visit(node.instruction, scope)
+
+    def visit_WhileLoopInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instructions, scope)
+
+    def visit_RepeatLoopInstruction(self, node, scope):
+        self.visit(node.instructions, scope)
+        self.visit(node.condition, scope)
+
+    def visit_IfInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instruction, scope)
+
+    def visit_IfElseInstruction(self, node, scope):
+        self.visit_IfInstruction(node, scope)
+        self.visit(node.no_instruction, scope)
+
+
+class DeadCodeEliminator(NodeVisitor):
+    # Optional pass between TypeChecker and Resolver. Drops statements that
+    # follow a break, continue or return in the same InstructionList, keeps
+    # only the taken branch of an if whose condition is a literal, removes
+    # loops that never run, and removes declarations that are never read
+    # together with the assignments to them. Repeats until the tree stops
+    # changing; every removal is recorded in `changes` as (lineno, message).
+    def __init__(self):
+        self.changes = []
+        self.dead = set()
+
+    def report(self, node, message):
+        self.changes.append((node.lineno or 0, message))
+
+    def generic_visit(self, node, symbols):
+        return node
+
+    def visit_Program(self, node, symbols):
+        while True:
+            self.visit(node.declarations, symbols)
+            self.visit(node.fundefs, symbols)
+            self.visit(node.instructions, symbols)
+            self.dead = Liveness().unused(node)
+            if not self.dead:
+                return node
+
+    def visit_DeclarationList(self, node, symbols):
+        declarations = []
+        for declaration in node.elements:
+            inits = declaration.initList.elements
+            for init in inits:
+                if init in self.dead:
+                    self.report(init, "removed unused variable {0}".format(init.left))
+            inits[:] = [init for init in inits if init not in self.dead]
+            if inits:
+                declarations.append(declaration)
+        node.elements[:] = declarations
+        return node
+
+    def visit_FunList(self, node, symbols):
+        for function in node.elements:
+            function.body = self.visit(function.body, symbols)
+        return node
+
+    def visit_CompoundInstruction(self, node, symbols):
+        self.visit(node.decList, symbols)
+        self.visit(node.incList, symbols)
+        return node
+
+    def visit_InstructionList(self, node, symbols):
+        elements = []
+        reachable = True
+        for instruction in node.elements:
+            if not reachable:
+                self.report(instruction, "removed unreachable statement")
+                continue
+
+            instruction = self.visit(instruction, symbols)
+            if isinstance(instruction, AST.InstructionList):
+                elements.extend(instruction.elements)
+            else:
+                elements.append(instruction)
+            reachable = completes(instruction)
+        node.elements[:] = elements
+        return node
+
+    def visit_Assignment(self, node, symbols):
+        if node in self.dead:
+            self.report(node, "removed assignment to unused variable {0}".format(node.left))
+            return empty()
+        return node
+
+    def visit_LabeledInstruction(self, node, symbols):
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfInstruction(self, node, symbols):
+        if isinstance(node.condition, AST.Const):
+            if constant(node.condition):
+                self.report(node, "if condition is always true, kept its branch")
+                return self.visit(node.instruction, symbols)
+            self.report(node, "removed if whose condition is always false")
+            return empty()
+
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfElseInstruction(self, node, symbols):
+        if isinstance(node.condition, AST.Const):
+            if constant(node.condition):
+                self.report(node, "if condition is always true, removed the else branch")
+                return self.visit(node.instruction, symbols)
+            self.report(node, "if condition is always false, kept only the else branch")
+            return self.visit(node.no_instruction, symbols)
+
+        node.instruction = self.visit(node.instruction, symbols)
+        node.no_instruction = self.visit(node.no_instruction, symbols)
+        return node
+
+    def visit_WhileLoopInstruction(self, node, symbols):
+        if isinstance(node.condition, AST.Const) and not constant(node.condition):
+            self.report(node, "removed while loop whose condition is always false")
+            return empty()
+
+        node.instructions = self.visit(node.instructions, symbols)
+        return node
+
+    def visit_RepeatLoopInstruction(self, node, symbols):
+        node.instructions = self.visit(node.instructions, symbols)
+        body = node.instructions
+        if (isinstance(node.condition, AST.Const) and constant(node.condition) and
+                not jumps(body, AST.BreakInstruction) and not jumps(body, AST.ContinueInstruction)):
+            self.report(node, "repeat loop always runs once, replaced by its body")
+            return body
+        return node
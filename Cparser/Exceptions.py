@@ -1,3 +1,11 @@
+# Completion signals returned by statements instead of raising. A statement
+# that completes normally returns None; a return statement stores its value
+# with the engine and signals RETURN.
+BREAK = 'break'
+CONTINUE = 'continue'
+RETURN = 'return'
+
+
 class ReturnValueException(Exception):
     def __init__(self, value):
         self.value = value
@@ -9,3 +17,48 @@ class BreakException(Exception):
 
 class ContinueException(Exception):
     pass
+
+
+class CompileError(Exception):
+    # the front end reported errors in a program, and printed them; the
+    # tree is not fit for the passes or the engines
+    pass
+
+
+class CallDepthException(Exception):
+    # more calls active at once than an engine was allowed
+    pass
+
+
+class TailCall(object):
+    # Value of `return f(...)` inside a function: the call still to be made.
+    # The caller makes it in trampoline() after the returning frame is gone,
+    # so tail recursion runs in constant Python stack space.
+    __slots__ = ('function', 'args')
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+
+def trampoline(value):
+    # makes pending tail calls until a plain value comes out; functions of
+    # the engines expose `enter(args)`, which runs one body and may return
+    # another TailCall
+    while value.__class__ is TailCall:
+        enter = getattr(value.function, 'enter', None)
+        if enter is None:
+            return value.function(*value.args)
+        value = enter(value.args)
+    return value
+
+
+def escape(signal, value=None):
+    # exception to raise for a signal that left the construct meant to
+    # consume it, e.g. a return outside any function
+    if signal is RETURN:
+        return ReturnValueException(value)
+    elif signal is BREAK:
+        return BreakException()
+    else:
+        return ContinueException()
@@ -0,0 +1,357 @@
+#!/usr/bin/python
+import copy
+import AST
+from ConstantFolder import text
+from DeadCodeEliminator import completes, jumps, pure
+from LoopInvariantMover import analyze, nodes
+from TypeChecker import NodeVisitor
+
+
+def cycles(effects):
+    # functions that can call themselves, directly or through others
+    cyclic = set()
+    for name in effects:
+        seen = set()
+        stack = list(effects[name].calls)
+        while stack:
+            callee = stack.pop()
+            if callee == name:
+                cyclic.add(name)
+                break
+            if callee in effects and callee not in seen:
+                seen.add(callee)
+                stack.extend(effects[callee].calls)
+    return cyclic
+
+
+def substitute(node, values):
+    # expression node with copies of values[name] for the IDs they name
+    if isinstance(node, AST.ID) and node.id in values:
+        return copy.deepcopy(values[node.id])
+    elif isinstance(node, AST.BinExpr):
+        node.left = substitute(node.left, values)
+        node.right = substitute(node.right, values)
+    elif isinstance(node, AST.FunctionCall):
+        arguments = node.arglist.elements
+        for i, argument in enumerate(arguments):
+            arguments[i] = substitute(argument, values)
+    return node
+
+
+def located(node, lineno):
+    node.setLineNo(lineno)
+    return node
+
+
+class Inliner(NodeVisitor):
+    # Optional pass between TypeChecker and Resolver, run before the other
+    # ones. Replaces calls to small functions that are not part of a call
+    # cycle with their bodies:
+    #  - a function whose body is a single `return expression;` is inlined
+    #    anywhere as that expression, with its arguments substituted when
+    #    they are pure and every argument that is not a plain name or a
+    #    literal is used at most once;
+    #  - any other function is inlined where the call is the whole right-hand
+    #    side of an assignment or the operand of a print or return. Its
+    #    arguments and locals get fresh names (a$1, ...) and each of its
+    #    returns becomes that assignment, print or return; a return that does
+    #    not end the body also breaks out of a `repeat ... until (1)` wrapped
+    #    around it.
+    # A call is never inlined where a local hides a name the function uses.
+    def __init__(self, threshold=40):
+        self.threshold = threshold
+        self.changes = []
+        self.count = 0
+        self.scope = []
+        self.functions = {}
+        self.effects = {}
+        self.writes = {}
+        self.wrapped = False
+
+    def report(self, node, message):
+        self.changes.append((node.lineno or 0, message))
+
+    def generic_visit(self, node, symbols):
+        return node
+
+    def visit_Program(self, node, symbols):
+        functions = node.fundefs.elements
+        self.effects, self.writes = analyze(functions)[:2]
+        recursive = cycles(self.effects)
+        assigned = set(inner.left for inner in nodes(node) if isinstance(inner, AST.Assignment) and not isinstance(inner, AST.Init))
+        names = [function.id for function in functions]
+
+        for function in functions:
+            effect = self.effects[function.id]
+            size = len(list(nodes(function.body)))
+            local = set(argument.id for argument in function.arglist.elements)
+            local.update(inner.left for inner in nodes(function.body) if isinstance(inner, AST.Init))
+            if function.id in recursive:
+                if size <= self.threshold:
+                    self.report(function, "not inlining {0}: recursive".format(function.id))
+            elif size <= self.threshold and names.count(function.id) == 1 and function.id not in assigned and \
+                    not local & (effect.reads | effect.writes | effect.calls):
+                self.functions[function.id] = function
+
+        self.scope = [set()]
+        for declaration in node.declarations.elements:
+            # functions do not exist yet while globals are initialized
+            self.scope[0].update(init.left for init in declaration.initList.elements)
+        self.scope[0].update(names)
+        self.visit(node.fundefs, symbols)
+        node.instructions = self.visit(node.instructions, symbols)
+        return node
+
+    def visit_FunList(self, node, symbols):
+        for function in node.elements:
+            self.scope.append(set(argument.id for argument in function.arglist.elements))
+            function.body = self.visit(function.body, symbols)
+            self.scope.pop()
+        return node
+
+    def visit_CompoundInstruction(self, node, symbols):
+        self.scope.append(set())
+        for declaration in node.decList.elements:
+            for init in declaration.initList.elements:
+                init.right = self.expression(init.right)
+                self.scope[-1].add(init.left)
+        node.incList = self.visit(node.incList, symbols)
+        self.scope.pop()
+        return node
+
+    def visit_InstructionList(self, node, symbols):
+        for i, instruction in enumerate(node.elements):
+            node.elements[i] = self.visit(instruction, symbols)
+        return node
+
+    def visit_Assignment(self, node, symbols):
+        return self.statement(node, 'right', symbols)
+
+    def visit_PrintInstruction(self, node, symbols):
+        return self.statement(node, 'expr', symbols)
+
+    def visit_ReturnInstruction(self, node, symbols):
+        return self.statement(node, 'returns', symbols)
+
+    def visit_LabeledInstruction(self, node, symbols):
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfInstruction(self, node, symbols):
+        node.condition = self.expression(node.condition)
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfElseInstruction(self, node, symbols):
+        self.visit_IfInstruction(node, symbols)
+        node.no_instruction = self.visit(node.no_instruction, symbols)
+        return node
+
+    def visit_WhileLoopInstruction(self, node, symbols):
+        if node.condition is not None:
+            node.condition = self.expression(node.condition)
+        node.instructions = self.visit(node.instructions, symbols)
+        return node
+
+    visit_RepeatLoopInstruction = visit_WhileLoopInstruction
+
+    def callee(self, call):
+        # the function a call may be replaced with here, if any
+        function = self.functions.get(call.id.id)
+        if function is None or function.arity() != len(call.arglist.elements):
+            return None
+
+        for name in self.free(function.id):
+            for names in reversed(self.scope):
+                if name in names:
+                    if names is not self.scope[0]:
+                        return None
+                    break
+        return function
+
+    def free(self, name):
+        # names the function and everything it calls use outside their frames
+        names = set([name])
+        seen = set()
+        stack = [name]
+        while stack:
+            name = stack.pop()
+            if name in seen or name not in self.effects:
+                continue
+            seen.add(name)
+            effect = self.effects[name]
+            names |= effect.reads | effect.writes | effect.calls
+            stack.extend(effect.calls)
+        return names
+
+    def expression(self, node):
+        if isinstance(node, AST.BinExpr):
+            node.left = self.expression(node.left)
+            node.right = self.expression(node.right)
+        elif isinstance(node, AST.FunctionCall):
+            arguments = node.arglist.elements
+            for i, argument in enumerate(arguments):
+                arguments[i] = self.expression(argument)
+            inlined = self.inline_expression(node)
+            if inlined is not None:
+                return self.expression(inlined)
+        return node
+
+    def inline_expression(self, call):
+        function = self.callee(call)
+        if function is None or function.body.decList.elements or len(function.body.incList.elements) != 1:
+            return None
+        returns = function.body.incList.elements[0]
+        if not isinstance(returns, AST.ReturnInstruction):
+            return None
+
+        parameters = [argument.id for argument in function.arglist.elements]
+        uses = dict((parameter, 0) for parameter in parameters)
+        calls = set()
+        for inner in nodes(returns.returns):
+            if isinstance(inner, AST.ID) and inner.id in uses:
+                uses[inner.id] += 1
+            elif isinstance(inner, AST.FunctionCall):
+                calls.add(inner.id.id)
+        # a call in the body that may assign a variable could change what a
+        # substituted argument reads
+        writing = any(self.writes.get(name, True) for name in calls)
+
+        values = {}
+        for parameter, argument in zip(parameters, call.arglist.elements):
+            plain = isinstance(argument, (AST.Const, AST.ID))
+            if not pure(argument) or (uses[parameter] > 1 and not plain) or \
+                    (writing and not isinstance(argument, AST.Const)):
+                return None
+            values[parameter] = argument
+
+        self.report(call, "inlined {0}".format(text(call)))
+        return substitute(copy.deepcopy(returns.returns), values)
+
+    def statement(self, node, attribute, symbols):
+        call = getattr(node, attribute)
+        if isinstance(call, AST.FunctionCall):
+            block = self.inline_statement(node, attribute, call)
+            if block is not None:
+                return self.visit(block, symbols)
+        setattr(node, attribute, self.expression(call))
+        return node
+
+    def inline_statement(self, node, attribute, call):
+        function = self.callee(call)
+        if function is None:
+            return None
+        body = function.body
+        if completes(body) or jumps(body, AST.BreakInstruction) or jumps(body, AST.ContinueInstruction):
+            return None
+        for inner in nodes(body):
+            if isinstance(inner, AST.LoopInstruction) and \
+                    any(isinstance(nested, AST.ReturnInstruction) for nested in nodes(inner.instructions)):
+                return None
+
+        self.count += 1
+        suffix = '${0}'.format(self.count)
+        lineno = node.lineno
+
+        body = copy.deepcopy(body)
+        renames = dict((argument.id, argument.id + suffix) for argument in function.arglist.elements)
+        renames.update((inner.left, inner.left + suffix) for inner in nodes(body) if isinstance(inner, AST.Init))
+        for inner in nodes(body):
+            if isinstance(inner, AST.ID) and inner.id in renames:
+                inner.id = renames[inner.id]
+            elif isinstance(inner, AST.Assignment) and inner.left in renames:
+                inner.left = renames[inner.left]
+
+        # a literal, or a name neither the function nor the calls of the
+        # arguments after it can change, is used in place of an argument the
+        # body never assigns; the others are copied into their renamed
+        # arguments first, in order
+        assigned = set(inner.left for inner in nodes(body) if isinstance(inner, AST.Assignment))
+        values = {}
+        inits = []
+        arguments = call.arglist.elements
+        for i, (argument, value) in enumerate(zip(function.arglist.elements, arguments)):
+            name = renames[argument.id]
+            if name not in assigned and (isinstance(value, AST.Const) or
+                                         (isinstance(value, AST.ID) and value.id not in self.writes[function.id] and
+                                          not self.written(value.id, arguments[i + 1:]))):
+                values[name] = value
+            else:
+                init = located(AST.Init(name, value), lineno)
+                init.addType(argument.type)
+                inits.append(init)
+        for inner in list(nodes(body)):
+            if isinstance(inner, (AST.Assignment, AST.Instruction)):
+                for slot in ('right', 'expr', 'returns', 'condition'):
+                    expression = getattr(inner, slot, None)
+                    if isinstance(expression, AST.Node):
+                        setattr(inner, slot, substitute(expression, values))
+
+        # every return becomes the statement the call was part of
+        if isinstance(node, AST.Assignment):
+            store = lambda value, lineno: located(AST.Assignment(node.left, value), lineno)
+        elif isinstance(node, AST.PrintInstruction):
+            store = lambda value, lineno: located(AST.PrintInstruction(value), lineno)
+        else:
+            store = lambda value, lineno: located(AST.ReturnInstruction(value), lineno)
+
+        self.wrapped = False
+        body = self.lower(body, store, not isinstance(node, AST.ReturnInstruction), True)
+        if self.wrapped:
+            once = located(AST.Integer(1), lineno)
+            once.type = 'int'
+            body = located(AST.RepeatLoopInstruction(once, AST.InstructionList([body])), lineno)
+
+        self.report(node, "inlined {0}".format(text(call)))
+        if not inits:
+            return body
+        # one declaration per argument, as their types may differ
+        declarations = AST.DeclarationList([located(AST.Declaration(init.type, AST.InitList([init])), lineno)
+                                            for init in inits])
+        return located(AST.CompoundInstruction(declarations, AST.InstructionList([body])), lineno)
+
+    def written(self, name, expressions):
+        # whether a call in expressions may assign the variable name
+        for expression in expressions:
+            for inner in nodes(expression):
+                if isinstance(inner, AST.FunctionCall) and name in self.writes.get(inner.id.id, (name,)):
+                    return True
+        return False
+
+    def lower(self, node, store, leaves, tail):
+        # node with every return replaced by store(value, lineno). When
+        # `leaves`, the stored statement does not leave the body by itself,
+        # so a return that is not at the `tail` of the body also breaks out of
+        # a wrapper loop
+        if isinstance(node, AST.ReturnInstruction):
+            replacement = store(node.returns, node.lineno)
+            if tail or not leaves:
+                return replacement
+            self.wrapped = True
+            return AST.InstructionList([replacement, located(AST.BreakInstruction(), node.lineno)])
+        elif isinstance(node, AST.InstructionList):
+            elements = []
+            instructions = node.elements
+            for i, instruction in enumerate(instructions):
+                rest = instructions[i + 1:]
+                if rest and leaves and type(instruction) is AST.IfInstruction and not completes(instruction.instruction):
+                    # `if (c) return a; rest` is `if (c) return a; else rest`
+                    instruction = located(AST.IfElseInstruction(instruction.condition, instruction.instruction,
+                                                                AST.InstructionList(rest)), instruction.lineno)
+                    rest = []
+                instruction = self.lower(instruction, store, leaves, tail and not rest)
+                if isinstance(instruction, AST.InstructionList):
+                    elements.extend(instruction.elements)
+                else:
+                    elements.append(instruction)
+                if not rest:
+                    break
+            node.elements[:] = elements
+        elif isinstance(node, AST.CompoundInstruction):
+            node.incList = self.lower(node.incList, store, leaves, tail)
+        elif isinstance(node, AST.IfElseInstruction):
+            node.instruction = self.lower(node.instruction, store, leaves, tail)
+            node.no_instruction = self.lower(node.no_instruction, store, leaves, tail)
+        elif isinstance(node, (AST.IfInstruction, AST.LabeledInstruction)):
+            node.instruction = self.lower(node.instruction, store, leaves, tail)
+        return node
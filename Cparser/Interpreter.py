@@ -1,8 +1,9 @@
 import AST
-from Memory import *
 from Exceptions import *
+from Memory import FramePool
+from Resolver import LOCAL
+from TypeChecker import ttype
 from visit import *
-from collections import defaultdict
 
 optype = {}
 optype["+"] = lambda x, y: x + y
@@ -24,16 +25,105 @@ optype["!="] = lambda x, y: 1 if x != y else 0
 optype["&&"] = lambda x, y: 1 if (x and y) else 0
 optype["||"] = lambda x, y: 1 if (x or y) else 0
 
-class Interpreter(object):
-    def __init__(self):
-        self.memory_stack = defaultdict(lambda: Memory(self.memory_stack[0]))
-        self.memory_stack[0] = Memory()
-        self.curr_stack = 1
+# Python source of every op, applied to the source of its operands. Used by
+# the typed mode of Interpreter to turn an expression whose operand types
+# TypeChecker accepted into a single function (see specialized), int/float
+# promotions included: the result is the same as with `optype`, but nothing
+# is dispatched per node. Where only the truth of the result counts (a
+# condition, or an operand of && or || in one), comparisons are left as
+# Python's bool (`tests`).
+forms = {'+': '({0} + {1})', '-': '({0} - {1})', '*': '({0} * {1})', '/': '({0} / {1})',
+         '%': '({0} % {1})', '|': '({0} | {1})', '&': '({0} & {1})', '^': '({0} ^ {1})',
+         'SHL': '({0} << {1})', 'SHR': '({0} >> {1})',
+         '<': '(1 if {0} < {1} else 0)', '>': '(1 if {0} > {1} else 0)',
+         '<=': '(1 if {0} <= {1} else 0)', '>=': '(1 if {0} >= {1} else 0)',
+         '==': '(1 if {0} == {1} else 0)', '!=': '(1 if {0} != {1} else 0)',
+         # both operands are always evaluated
+         '&&': 'and_({0}, {1})', '||': 'or_({0}, {1})'}
+tests = {'<': '({0} < {1})', '>': '({0} > {1})', '<=': '({0} <= {1})', '>=': '({0} >= {1})',
+         '==': '({0} == {1})', '!=': '({0} != {1})'}
+
+typed = set((op, left, right) for op in forms
+            for left in ('int', 'float', 'string') for right in ('int', 'float', 'string')
+            if ttype[op][left].get(right) is not None)
+
+factories = {}
+
+
+def source(node, condition, constants):
+    # Python expression for node over the frame `f` and the globals `g`, with
+    # its literals in `constants`; None if node is not a typed expression
+    if isinstance(node, AST.Const):
+        constants.append(node.value[1:-1] if isinstance(node, AST.String) else node.value)
+        return 'c{0}'.format(len(constants) - 1)
+    elif isinstance(node, AST.ID):
+        if node.address is None:
+            return 'None'
+        depth, slot = node.address
+        return ('f[{0}]' if depth == LOCAL else 'g[{0}]').format(slot)
+    elif node.__class__ in (AST.BinExpr, AST.RelExpr):
+        if (node.op,) + getattr(node, 'operand_types', (None, None)) not in typed:
+            return None
+        nested = condition and node.op in ('&&', '||')
+        left = source(node.left, nested, constants)
+        right = source(node.right, nested, constants) if left is not None else None
+        if right is None:
+            return None
+        return (tests if condition else forms).get(node.op, forms[node.op]).format(left, right)
+    return None
+
+
+def specialized(node, condition):
+    # function of (f, g) computing node, or None if it is not a typed expression
+    constants = []
+    expression = source(node, condition, constants)
+    if expression is None:
+        return None
+
+    names = ', '.join('c{0}'.format(i) for i in range(len(constants)))
+    factory = factories.get((names, expression))
+    if factory is None:
+        namespace = {'and_': optype['&&'], 'or_': optype['||']}
+        exec "def factory({0}):\n    return lambda f, g: {1}\n".format(names, expression) in namespace
+        factory = factories[(names, expression)] = namespace['factory']
+    return factory(*constants)
+
+
+def unknown(op):
+    # an op without an implementation fails only when evaluated
+    def operate(x, y):
+        raise KeyError(op)
+    return operate
+
+
+def bind(node, specialize, condition=False):
+    # prepares every BinExpr below node: `operate` is the implementation of
+    # its op and, if specialize, `evaluate` the function from specialized();
+    # `condition` when only the truth of node's value is used
+    if isinstance(node, AST.BinExpr) and not isinstance(node, AST.Assignment):
+        node.operate = optype[node.op] if node.op in optype else unknown(node.op)
+        node.evaluate = specialized(node, condition) if specialize else None
+        if node.evaluate is None:
+            condition = condition and node.op in ('&&', '||')
+            bind(node.left, specialize, condition)
+            bind(node.right, specialize, condition)
+        return
+
+    for child in AST.children(node):
+        bind(child, specialize, isinstance(node, (AST.LoopInstruction, AST.IfInstruction)) and
+             child is node.condition)
+
 
-    def get_scope(self, scope):
-        self.curr_stack += 1
-        self.memory_stack[self.curr_stack] = Memory(self.memory_stack[scope])
-        return self.curr_stack
+class Interpreter(object):
+    # `scope` is the list-backed frame of the running function; variables are
+    # read through the (depth, slot) addresses assigned by Resolver.
+    # Statements return a completion signal (None, BREAK, CONTINUE or RETURN).
+    # With `specialize` (the typed mode), each expression whose operand types
+    # TypeChecker accepted runs as one function built for it, see bind().
+    def __init__(self, specialize=False):
+        self.globals = []
+        self.return_value = None
+        self.specialize = specialize
 
     @on('node')
     def visit(self, node, scope=0):
@@ -41,9 +131,13 @@ class Interpreter(object):
 
     @when(AST.Program)
     def visit(self, node, scope=0):
+        bind(node, self.specialize)
+        scope = self.globals = [None] * node.frame_size
         node.declarations.accept(self, scope)
         node.fundefs.accept(self, scope)
-        node.instructions.accept(self, scope)
+        signal = node.instructions.accept(self, scope)
+        if signal is not None:
+            raise escape(signal, trampoline(self.return_value))
 
     @when(AST.List)
     def visit(self, node, scope=0):
@@ -53,65 +147,94 @@ class Interpreter(object):
 
         return tuple(r)
 
+    @when(AST.InstructionList)
+    def visit(self, node, scope=0):
+        for instruction in node.elements:
+            signal = instruction.accept(self, scope)
+            if signal is not None:
+                return signal
+
     @when(AST.Declaration)
     def visit(self, node, scope=0):
         node.initList.accept(self, scope)
 
     @when(AST.Init)
     def visit(self, node, scope=0):
-        if node.left in self.memory_stack[scope].keys():
+        if node.address is None:
             raise Exception("Variable {0} already defined".format(node.left))
         value = node.right.accept(self, scope)
-        self.memory_stack[scope][node.left] = value
+        scope[node.address[1]] = value
         return value
 
     @when(AST.Function)
     def visit(self, node, scope=0):
+        pool = FramePool(node.frame_size)
+
+        def enter(args):
+            if len(args) != node.arity():
+                raise Exception("{0} takes {1} argument(s); {2} given".format(node.id, node.arity(), len(args)))
+
+            new_scope = pool.acquire(args)
+            signal = node.body.accept(self, scope=new_scope)
+            pool.release(new_scope)
+
+            if signal is RETURN:
+                return self.return_value
+            elif signal is not None:
+                raise escape(signal)
+
         def fun(*args):
-            new_scope = self.get_scope(scope)
+            # enter() spelled out, to keep plain calls to one Python frame
             if len(args) != node.arity():
                 raise Exception("{0} takes {1} argument(s); {2} given".format(node.id, node.arity(), len(args)))
 
-            for i in range(node.arity()):
-                argument = node.arglist.elements[i]
-                self.memory_stack[new_scope][argument.id] = args[i]
+            new_scope = pool.acquire(args)
+            signal = node.body.accept(self, scope=new_scope)
+            pool.release(new_scope)
 
-            try:
-                node.body.accept(self, scope=new_scope)
-            except ReturnValueException as e:
-                return e.value
+            if signal is RETURN:
+                value = self.return_value
+                return trampoline(value) if value.__class__ is TailCall else value
+            elif signal is not None:
+                raise escape(signal)
 
-        self.memory_stack[scope][node.id] = fun
+        fun.enter = enter
+        memo = getattr(node, 'memo', None)
+        scope[node.address[1]] = fun if memo is None else memo.wrap(fun)
 
     @when(AST.CompoundInstruction)
     def visit(self, node, scope=0):
-        new_scope = self.get_scope(scope)
-        node.decList.accept(self, new_scope)
-        node.incList.accept(self, new_scope)
+        node.decList.accept(self, scope)
+        return node.incList.accept(self, scope)
 
     @when(AST.Assignment)
     def visit(self, node, scope=0):
-        if node.left in self.memory_stack[scope].scope_keys():
-            value = node.right.accept(self, scope)
-            self.memory_stack[scope].scope_setitem(node.left, value)
-            return value
-        else:
+        if node.address is None:
             raise Exception("Undeclared variable {0}".format(node.left))
 
+        value = node.right.accept(self, scope)
+        depth, slot = node.address
+        if depth == LOCAL:
+            scope[slot] = value
+        else:
+            self.globals[slot] = value
+
     @when(AST.BinExpr)
     def visit(self, node, scope=0):
-        left = node.left.accept(self, scope)
-        right = node.right.accept(self, scope)
+        evaluate = node.evaluate
+        if evaluate is not None:
+            return evaluate(scope, self.globals)
 
-        return optype[node.op](left, right)
+        visit = self.visit
+        return node.operate(visit(node.left, scope), visit(node.right, scope))
 
     @when(AST.Integer)
     def visit(self, node, scope=0):
-        return int(node.value)
+        return node.value
 
     @when(AST.Float)
     def visit(self, node, scope=0):
-        return float(node.value)
+        return node.value
 
     @when(AST.String)
     def visit(self, node, scope=0):
@@ -119,57 +242,52 @@ class Interpreter(object):
 
     @when(AST.ID)
     def visit(self, node, scope=0):
-        return self.memory_stack[scope][node.id]
+        if node.address is None:
+            return None
+
+        depth, slot = node.address
+        return scope[slot] if depth == LOCAL else self.globals[slot]
 
     @when(AST.WhileLoopInstruction)
     def visit(self, node, scope=0):
-        r = None
-        try:
-            while node.condition.accept(self, scope):
-                try:
-                    r = node.instructions.accept(self, scope)
-                except ContinueException:
-                    pass
-        except BreakException:
-            pass
-
-        return r
+        condition = node.condition
+        while condition is None or condition.accept(self, scope):
+            signal = node.instructions.accept(self, scope)
+            if signal is BREAK:
+                break
+            elif signal is RETURN:
+                return signal
 
     @when(AST.RepeatLoopInstruction)
     def visit(self, node, scope=0):
+        condition = node.condition
         run = True
-        r = None
-
-        try:
-            while run:
-                try:
-                    r = node.instructions.accept(self, scope)
-                except ContinueException:
-                    pass
 
-                run = not node.condition.accept(self, scope)
-        except BreakException:
-            pass
+        while run:
+            signal = node.instructions.accept(self, scope)
+            if signal is BREAK:
+                break
+            elif signal is RETURN:
+                return signal
 
-        return r
+            run = condition is None or not condition.accept(self, scope)
 
     @when(AST.IfInstruction)
     def visit(self, node, scope=0):
         if node.condition.accept(self, scope):
-            node.instruction.accept(self, scope)
+            return node.instruction.accept(self, scope)
 
     @when(AST.IfElseInstruction)
     def visit(self, node, scope=0):
         if node.condition.accept(self, scope):
-            node.instruction.accept(self, scope)
+            return node.instruction.accept(self, scope)
         else:
-            node.no_instruction.accept(self, scope)
+            return node.no_instruction.accept(self, scope)
 
     @when(AST.PrintInstruction)
     def visit(self, node, scope=0):
         value = node.expr.accept(self, scope)
         print value
-        return value
 
     @when(AST.LabeledInstruction)
     def visit(self, node, scope=0):
@@ -177,15 +295,22 @@ class Interpreter(object):
 
     @when(AST.ReturnInstruction)
     def visit(self, node, scope=0):
-        raise ReturnValueException(node.returns.accept(self, scope))
+        returns = node.returns
+        if returns.__class__ is AST.FunctionCall:
+            # the caller makes the call, see trampoline()
+            args = returns.arglist.accept(self, scope)
+            self.return_value = TailCall(returns.id.accept(self, scope), args)
+        else:
+            self.return_value = returns.accept(self, scope)
+        return RETURN
 
     @when(AST.ContinueInstruction)
     def visit(self, node, scope=0):
-        raise ContinueException()
+        return CONTINUE
 
     @when(AST.BreakInstruction)
     def visit(self, node, scope=0):
-        raise BreakException()
+        return BREAK
 
     @when(AST.FunctionCall)
     def visit(self, node, scope=0):
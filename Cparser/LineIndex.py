@@ -0,0 +1,34 @@
+from array import array
+from bisect import bisect_left
+
+
+class LineIndex(object):
+    # Offsets of the line ends ('\n') of a source, in order, kept as machine
+    # integers. The column of a position, counted from the last line end
+    # before it as find_tok_column always did, takes a bisection instead of
+    # a search back through the source.
+    def __init__(self, ends=()):
+        self.ends = array('l', ends)
+
+    @classmethod
+    def of(cls, text):
+        index = cls()
+        find = text.find
+        offset = find('\n')
+        while offset >= 0:
+            index.ends.append(offset)
+            offset = find('\n', offset + 1)
+        return index
+
+    def add(self, offset):
+        self.ends.append(offset)
+
+    def extend(self, offsets):
+        self.ends.extend(offsets)
+
+    def line(self, lexpos):
+        return bisect_left(self.ends, lexpos) + 1
+
+    def column(self, lexpos):
+        before = bisect_left(self.ends, lexpos)
+        return lexpos - (self.ends[before - 1] if before else 0)
@@ -0,0 +1,292 @@
+#!/usr/bin/python
+import AST
+from ConstantFolder import text
+from DeadCodeEliminator import pure
+from TypeChecker import NodeVisitor
+
+
+def nodes(node):
+    # node and all of its descendants
+    yield node
+    for child in AST.children(node):
+        for descendant in nodes(child):
+            yield descendant
+
+
+def shape(node):
+    # equal for expressions that compute the same value the same way; unlike
+    # text(), constants are told apart by their exact value and type
+    if isinstance(node, AST.Const):
+        return node.__class__, repr(node.value)
+    elif isinstance(node, AST.ID):
+        return AST.ID, node.id
+    elif isinstance(node, AST.FunctionCall):
+        return AST.FunctionCall, node.id.id, tuple(shape(argument) for argument in node.arglist.elements)
+    elif isinstance(node, AST.BinExpr):
+        return node.__class__, node.op, shape(node.left), shape(node.right)
+    return node
+
+
+class Effects(NodeVisitor):
+    # What a function body does outside its own frame: the names it reads and
+    # assigns that are not its arguments or locals, the functions it calls
+    # and whether it prints.
+    def __init__(self, function):
+        self.reads = set()
+        self.writes = set()
+        self.calls = set()
+        self.prints = False
+        self.visit(function.body, [set(argument.id for argument in function.arglist.elements)])
+
+    def local(self, name, scope):
+        return any(name in names for names in scope)
+
+    def visit_CompoundInstruction(self, node, scope):
+        scope = scope + [set()]
+        self.visit(node.decList, scope)
+        self.visit(node.incList, scope)
+
+    def visit_DeclarationList(self, node, scope):
+        for declaration in node.elements:
+            for init in declaration.initList.elements:
+                self.visit(init.right, scope)
+                scope[-1].add(init.left)
+
+    def visit_InstructionList(self, node, scope):
+        for instruction in node.elements:
+            self.visit(instruction, scope)
+
+    def visit_ExpressionList(self, node, scope):
+        for expression in node.elements:
+            self.visit(expression, scope)
+
+    def visit_Assignment(self, node, scope):
+        self.visit(node.right, scope)
+        if not self.local(node.left, scope):
+            self.writes.add(node.left)
+
+    def visit_BinExpr(self, node, scope):
+        self.visit(node.left, scope)
+        self.visit(node.right, scope)
+
+    def visit_RelExpr(self, node, scope):
+        self.visit_BinExpr(node, scope)
+
+    def visit_ID(self, node, scope):
+        if not self.local(node.id, scope):
+            self.reads.add(node.id)
+
+    def visit_FunctionCall(self, node, scope):
+        self.visit(node.arglist, scope)
+        self.calls.add(node.id.id)
+
+    def visit_PrintInstruction(self, node, scope):
+        self.prints = True
+        self.visit(node.expr, scope)
+
+    def visit_ReturnInstruction(self, node, scope):
+        self.visit(node.returns, scope)
+
+    def visit_LabeledInstruction(self, node, scope):
+        self.visit(node.instruction, scope)
+
+    def visit_WhileLoopInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instructions, scope)
+
+    def visit_RepeatLoopInstruction(self, node, scope):
+        self.visit_WhileLoopInstruction(node, scope)
+
+    def visit_IfInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instruction, scope)
+
+    def visit_IfElseInstruction(self, node, scope):
+        self.visit_IfInstruction(node, scope)
+        self.visit(node.no_instruction, scope)
+
+
+def analyze(functions):
+    # the Effects of every function, the names each one may assign outside
+    # its frame, through calls too, and the functions that neither print nor
+    # touch anything but their own frame
+    effects = dict((function.id, Effects(function)) for function in functions)
+    writes = dict((name, set(effect.writes)) for name, effect in effects.items())
+    changed = True
+    while changed:
+        changed = False
+        for name, effect in effects.items():
+            for callee in effect.calls & set(effects):
+                if not writes[callee] <= writes[name]:
+                    writes[name] |= writes[callee]
+                    changed = True
+
+    pure = set(name for name, effect in effects.items() if not effect.prints and not effect.writes and not effect.reads)
+    while True:
+        impure = set(name for name in pure if not effects[name].calls <= pure)
+        if not impure:
+            return effects, writes, pure
+        pure -= impure
+
+
+class LoopInvariantMover(NodeVisitor):
+    # Optional pass between TypeChecker and Resolver. Moves the expressions of
+    # a while or repeat loop whose operands the loop never changes into
+    # temporaries ($inv1, $inv2, ...) declared in a block wrapped around the
+    # loop. Since such an expression is then evaluated even when the loop
+    # body never runs, only expressions that cannot fail are moved, except
+    # from a while condition, which is evaluated on entry anyway, as long as
+    # every operand left in it before them cannot fail or print either; only
+    # there may calls to pure functions be moved too. Inner loops are handled
+    # first, so invariants climb as many levels as they can.
+    def __init__(self):
+        self.changes = []
+        self.temps = 0
+        self.scope = []
+        self.writes = {}
+        self.pure = set()
+
+    def report(self, node, message):
+        self.changes.append((node.lineno or 0, message))
+
+    def generic_visit(self, node, symbols):
+        return node
+
+    def declared(self, name):
+        return any(name in names for names in self.scope)
+
+    def is_function(self, name):
+        # the name resolves to a top-level function, not a variable hiding it
+        for names in reversed(self.scope):
+            if name in names:
+                return names is self.scope[0] and name in self.pure
+        return False
+
+    def visit_Program(self, node, symbols):
+        self.writes, self.pure = analyze(node.fundefs.elements)[1:]
+        self.scope = [set()]
+        self.visit(node.declarations, symbols)
+        self.scope[0].update(function.id for function in node.fundefs.elements)
+        self.visit(node.fundefs, symbols)
+        node.instructions = self.visit(node.instructions, symbols)
+        return node
+
+    def visit_DeclarationList(self, node, symbols):
+        for declaration in node.elements:
+            self.scope[-1].update(init.left for init in declaration.initList.elements)
+        return node
+
+    def visit_FunList(self, node, symbols):
+        for function in node.elements:
+            self.scope.append(set(argument.id for argument in function.arglist.elements))
+            function.body = self.visit(function.body, symbols)
+            self.scope.pop()
+        return node
+
+    def visit_CompoundInstruction(self, node, symbols):
+        self.scope.append(set())
+        self.visit(node.decList, symbols)
+        node.incList = self.visit(node.incList, symbols)
+        self.scope.pop()
+        return node
+
+    def visit_InstructionList(self, node, symbols):
+        for i, instruction in enumerate(node.elements):
+            node.elements[i] = self.visit(instruction, symbols)
+        return node
+
+    def visit_LabeledInstruction(self, node, symbols):
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfInstruction(self, node, symbols):
+        node.instruction = self.visit(node.instruction, symbols)
+        return node
+
+    def visit_IfElseInstruction(self, node, symbols):
+        node.instruction = self.visit(node.instruction, symbols)
+        node.no_instruction = self.visit(node.no_instruction, symbols)
+        return node
+
+    def visit_WhileLoopInstruction(self, node, symbols):
+        node.instructions = self.visit(node.instructions, symbols)
+
+        variant = set()
+        for inner in nodes(node):
+            if isinstance(inner, AST.Assignment):
+                variant.add(inner.left)
+            elif isinstance(inner, AST.FunctionCall):
+                variant |= self.writes.get(inner.id.id, set())
+
+        hoisted = []
+        if node.condition is not None:
+            eager = isinstance(node, AST.WhileLoopInstruction)
+            node.condition = self.hoist(node.condition, variant, hoisted, eager)
+
+        statements = [inner for inner in nodes(node.instructions) if isinstance(inner, (AST.Assignment, AST.Instruction))]
+        for statement in statements:
+            for attribute in ('right', 'expr', 'returns', 'condition'):
+                expression = getattr(statement, attribute, None)
+                if isinstance(expression, AST.Node):
+                    setattr(statement, attribute, self.hoist(expression, variant, hoisted, False))
+
+        if not hoisted:
+            return node
+
+        declarations = AST.DeclarationList([])
+        for name, expression in hoisted:
+            self.report(node, "hoisted {0} out of the loop into {1}".format(text(expression), name))
+            init = AST.Init(name, expression)
+            init.addType(expression.type)
+            init.setLineNo(node.lineno)
+            declaration = AST.Declaration(expression.type, AST.InitList([init]))
+            declaration.setLineNo(node.lineno)
+            declarations.add(declaration)
+
+        block = AST.CompoundInstruction(declarations, AST.InstructionList([node]))
+        block.setLineNo(node.lineno)
+        return block
+
+    visit_RepeatLoopInstruction = visit_WhileLoopInstruction
+
+    def invariant(self, node, variant):
+        if isinstance(node, AST.Const):
+            return True
+        elif isinstance(node, AST.ID):
+            return node.id not in variant and self.declared(node.id)
+        elif isinstance(node, AST.BinExpr):
+            return bool(getattr(node, 'type', None)) and \
+                self.invariant(node.left, variant) and self.invariant(node.right, variant)
+        elif isinstance(node, AST.FunctionCall):
+            return bool(node.type) and self.is_function(node.id.id) and \
+                all(self.invariant(argument, variant) for argument in node.arglist.elements)
+        return False
+
+    def hoist(self, node, variant, hoisted, eager):
+        # replaces the largest invariant subexpressions of node with
+        # temporaries; `eager` when node is evaluated on entry to the loop
+        if isinstance(node, (AST.BinExpr, AST.FunctionCall)) and self.invariant(node, variant) and (eager or pure(node)):
+            for name, expression in hoisted:
+                if shape(expression) == shape(node):
+                    break
+            else:
+                self.temps += 1
+                name = '$inv{0}'.format(self.temps)
+                hoisted.append((name, node))
+
+            temp = AST.ID(name)
+            temp.type = node.type
+            temp.setLineNo(node.lineno or 0)
+            return temp
+
+        # an operand that may fail or print is only eager while nothing
+        # evaluated before it, and left in place, can print or fail first
+        if isinstance(node, AST.BinExpr):
+            node.left = self.hoist(node.left, variant, hoisted, eager)
+            node.right = self.hoist(node.right, variant, hoisted, eager and pure(node.left))
+        elif isinstance(node, AST.FunctionCall):
+            arguments = node.arglist.elements
+            for i, argument in enumerate(arguments):
+                arguments[i] = self.hoist(argument, variant, hoisted, eager)
+                eager = eager and pure(arguments[i])
+        return node
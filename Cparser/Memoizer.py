@@ -0,0 +1,27 @@
+#!/usr/bin/python
+from LoopInvariantMover import analyze
+from Memory import MemoCache
+from TypeChecker import NodeVisitor
+
+
+class Memoizer(NodeVisitor):
+    # Optional pass, run after all the others. Gives every pure function (see
+    # analyze: it does not print, assign or read anything outside its frame
+    # and only calls pure functions) a MemoCache of at most `size` results in
+    # `memo`, which the engines consult on every call to it.
+    def __init__(self, size=1024):
+        self.size = size
+        self.changes = []
+
+    def generic_visit(self, node, symbols):
+        return node
+
+    def visit_Program(self, node, symbols):
+        functions = node.fundefs.elements
+        pure = analyze(functions)[2]
+        names = [function.id for function in functions]
+        for function in functions:
+            if function.id in pure and names.count(function.id) == 1:
+                function.memo = MemoCache(function.id, self.size)
+                self.changes.append((function.lineno, "memoizing {0}".format(function.id)))
+        return node
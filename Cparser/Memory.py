@@ -1,32 +1,85 @@
-class Memory(dict):
-    def __init__(self, parent_scope=None):
-        super(Memory, self).__init__()
-        self.parent_scope = parent_scope
-
-    def __getitem__(self, item):
-        if item in self.full_scope().keys():
-            return self.full_scope()[item]
-        else:
-            return None
+from collections import OrderedDict
 
-    def scope_setitem(self, key, value):
-        if key in self.keys():
-            self[key] = value
-        elif self.parent_scope is not None:
-            self.parent_scope.scope_setitem(key, value)
-        else:
-            self[key] = value
 
-    def full_scope(self):
-        parent_full_scope = ((self.parent_scope is not None) and self.parent_scope.full_scope().items()) or []
-        return dict(parent_full_scope + self.items())
+class FramePool(object):
+    # Free list of the list-backed frames of one function. A frame is cleared
+    # when released, so it does not keep dead values alive, and at most `limit`
+    # frames are kept, so a deep recursion does not pin its frames afterwards.
+    def __init__(self, size, limit=64):
+        self.size = size
+        self.limit = limit
+        self.free = []
+        self.empty = [None] * size
+
+    def acquire(self, args):
+        if self.free:
+            frame = self.free.pop()
+            frame[:len(args)] = args
+            return frame
+
+        frame = list(args)
+        frame.extend(self.empty[len(args):])
+        return frame
+
+    def release(self, frame):
+        if len(self.free) < self.limit:
+            frame[:] = self.empty
+            self.free.append(frame)
+
 
+MISSING = object()
+
+
+class MemoCache(object):
+    # Bounded LRU cache of the results of one pure function, keyed on its
+    # argument tuple. Only complete calls are cached: tail calls into the
+    # function go straight to its `enter`, so they keep running in constant
+    # stack space.
+    def __init__(self, name, size=1024):
+        self.name = name
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(args):
+        # 1 == 1.0 and 0.0 == -0.0, but they do not print the same
+        for arg in args:
+            if arg.__class__ is float:
+                return tuple((arg.__class__, repr(arg)) for arg in args)
+        return tuple(args)
+
+    def lookup(self, key):
+        value = self.entries.pop(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries[key] = value
+        return value
 
-    def scope_keys(self):
-        return self.full_scope().keys()
+    def store(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
 
+    def wrap(self, fun):
+        lookup, store, key = self.lookup, self.store, self.key
 
-class MemoryStack(dict):
-    pass
+        def memoized(*args):
+            k = key(args)
+            value = lookup(k)
+            if value is MISSING:
+                value = fun(*args)
+                store(k, value)
+            return value
 
+        memoized.enter = fun.enter
+        return memoized
 
+    def stats(self):
+        return "{0}: {1} hits, {2} misses, {3} evictions ({4} cached, limit {5})".format(
+            self.name, self.hits, self.misses, self.evictions, len(self.entries), self.size)
@@ -0,0 +1,106 @@
+import time
+from Interpreter import Interpreter
+
+
+class Counter(object):
+    # executions of a node, a line or a function, and their time: `total`
+    # from entering to leaving, counted once for recursive entries, and
+    # `own` without the time of the nodes visited meanwhile
+    __slots__ = ('count', 'total', 'own', 'active')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.own = 0.0
+        self.active = 0
+
+
+class Profile(object):
+    # What ProfilingInterpreter measured running a program: a Counter per
+    # node, per source line (a count is an entry from another line) and per
+    # AST.Function (a count is a call that ran the body; results of a memo
+    # cache run nothing). Expressions the typed engine evaluates as a whole
+    # count as one node.
+    def __init__(self, program):
+        self.nodes = {}
+        self.lines = {}
+        self.functions = {}
+        self.bodies = dict((function.body, function) for function in program.fundefs.elements)
+
+    def report(self, stream, source=None, limit=20):
+        # the counters sorted by time; all of them if limit is None
+        def top(items, key):
+            items = sorted(items, key=key, reverse=True)
+            return items if limit is None else items[:limit]
+
+        lines = source.splitlines() if source is not None else []
+        stream.write("{0:>8} {1:>12} {2:>14}  function\n".format('calls', 'total (ms)', 'per call (ms)'))
+        for function, counter in top(self.functions.items(), lambda item: item[1].total):
+            stream.write("{0:>8} {1:>12.3f} {2:>14.4f}  {3} (line {4})\n".format(
+                counter.count, counter.total * 1000, counter.total * 1000 / counter.count,
+                function.id, function.lineno))
+
+        stream.write("\n{0:>6} {1:>10} {2:>12} {3:>10}  source\n".format('line', 'count', 'total (ms)', 'self (ms)'))
+        for lineno, counter in top(self.lines.items(), lambda item: item[1].own):
+            text = lines[lineno - 1].strip() if 0 < lineno <= len(lines) else ''
+            stream.write("{0:>6} {1:>10} {2:>12.3f} {3:>10.3f}  {4}\n".format(
+                lineno, counter.count, counter.total * 1000, counter.own * 1000, text))
+
+        stream.write("\n{0:>6} {1:>10} {2:>12} {3:>10}  node\n".format('line', 'count', 'total (ms)', 'self (ms)'))
+        for node, counter in top(self.nodes.items(), lambda item: item[1].own):
+            stream.write("{0:>6} {1:>10} {2:>12.3f} {3:>10.3f}  {4}\n".format(
+                node.lineno or '-', counter.count, counter.total * 1000, counter.own * 1000,
+                node.__class__.__name__))
+
+
+class ProfilingInterpreter(Interpreter):
+    # Interpreter timing every node it visits into profile; the handlers
+    # are those of Interpreter, reached through this visit()
+    def __init__(self, profile, specialize=False):
+        Interpreter.__init__(self, specialize)
+        self.profile = profile
+        self.inner = [0.0]  # time of the nodes visited inside each running visit
+        self.line = None  # line of the innermost running visit
+
+    def visit(self, node, scope=0):
+        profile = self.profile
+        counters = [self.counter(profile.nodes, node)]
+        outer = self.line
+        if node.lineno:
+            line = self.counter(profile.lines, node.lineno)
+            if node.lineno != outer:
+                line.count += 1
+            counters.append(line)
+            self.line = node.lineno
+        function = profile.bodies.get(node)
+        if function is not None:
+            call = self.counter(profile.functions, function)
+            call.count += 1
+            counters.append(call)
+
+        for counter in counters:
+            counter.active += 1
+        inner = self.inner
+        inner.append(0.0)
+        start = time.time()
+        try:
+            return Interpreter.visit(self, node, scope)
+        finally:
+            elapsed = time.time() - start
+            self.line = outer
+            own = elapsed - inner.pop()
+            inner[-1] += elapsed
+            counters[0].count += 1
+            for counter in counters:
+                counter.own += own
+                counter.active -= 1
+                if not counter.active:
+                    counter.total += elapsed
+
+    @staticmethod
+    def counter(counters, key):
+        try:
+            return counters[key]
+        except KeyError:
+            counter = counters[key] = Counter()
+            return counter
@@ -0,0 +1,174 @@
+import mmap
+import re
+from scanner import Scanner
+from LineIndex import LineIndex
+
+# The rules of Scanner as one master regex with a named group per rule, so a
+# token costs one match instead of a match and a rule call. lex() tries the
+# rules in a fixed order (t_ignore, the function rules as they are defined,
+# the string rules longest first, the literals last); here only rules that
+# can start with the same character keep that order between them, so the
+# frequent ones come first. Ignored characters are skipped by the match of
+# the token that follows them, and TYPE words are matched as ID (see
+# RegexScanner.tokens).
+rules = [
+    ('ID', r'[a-zA-Z_]\w*'),
+    ('newline', r'\n+'),
+    ('FLOAT', r'\d+(?:\.\d*)|\.\d+'),
+    ('INTEGER', r'\d+'),
+    ('OR', r'\|\|'),
+    ('EQ', r'=='),
+    ('NEQ', r'!='),
+    ('LE', r'<='),
+    ('GE', r'>='),
+    ('AND', r'&&'),
+    ('SHL', r'<<'),
+    ('SHR', r'>>'),
+    ('BLOCK_COMMENT', r'/\*(?:.|\n)*?\*/'),
+    ('literal', '[' + re.escape(Scanner.literals) + ']'),
+    ('newline2', r'(?:\r\n)+'),
+    ('LINE_COMMENT', r'\#.*'),
+    ('STRING', r'\"(?:[^\\\n]|(?:\\.))*?\"'),
+]
+
+ignore = Scanner.t_ignore
+master = re.compile('[' + re.escape(ignore) + ']*(?:' +
+                    '|'.join('(?P<{0}>{1})'.format(name, rule) for name, rule in rules) + ')')
+kinds = [None] + [name for name, rule in rules]
+types = frozenset(['int', 'float', 'string'])
+
+
+class Token(object):
+    # the attributes of ply's LexToken that the parser uses
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __repr__(self):
+        return 'LexToken({0},{1!r},{2},{3})'.format(self.type, self.value, self.lineno, self.lexpos)
+
+
+class RegexScanner(object):
+    # Drop-in for Scanner, without ply: the same tokens with the same values,
+    # line numbers and positions, and the same message for an illegal
+    # character. Identifiers are interned.
+    #
+    # The source may be a string, anything else the re module matches in
+    # (an mmap), or a file read `chunk` bytes at a time; tokens are made as
+    # the parser asks for them, and of a file only the text from the
+    # current token on is kept. Line ends are indexed as they are passed.
+    streams = True
+
+    def __init__(self, chunk=1 << 16):
+        self.chunk = chunk
+        self.errors = 0  # illegal characters met, in all sources
+        self.lexdata = ''
+        self.stream = None
+        self.lexpos = 0
+        self.lineno = 1
+        self.lines = LineIndex()
+
+    def build(self):
+        pass
+
+    def find_tok_column(self, token):
+        return self.lines.column(token.lexpos)
+
+    def input(self, text):
+        if isinstance(text, (basestring, mmap.mmap)):
+            self.lexdata, self.stream = text, None
+        else:
+            self.lexdata, self.stream = '', text
+        self.lexpos = 0
+        self.lineno = 1
+        self.lines = LineIndex()
+        # the generator's own next() is the fastest way to hand out tokens
+        self.token = self.tokens().next
+
+    def token(self):
+        return None
+
+    def partial(self, m, data, pos, end):
+        # whether more of the stream could make a different match at pos:
+        # the match reaches the end of what was read, a block comment is
+        # not closed yet (and only '/' matched), or a string is not
+        if m is None:
+            return data.find('\n', pos) < 0
+        stop = m.end()
+        return stop == end or kinds[m.lastindex] == 'literal' and data[stop - 1:stop + 1] == '/*'
+
+    def tokens(self):
+        data = self.lexdata
+        stream = self.stream
+        match = master.match
+        reserved = Scanner.reserved
+        lines = self.lines
+        base = 0
+        end = len(data)
+        pos = self.lexpos
+        more = stream is not None
+
+        while True:
+            m = match(data, pos) if pos < end else None
+            if more and self.partial(m, data, pos, end):
+                chunk = stream.read(self.chunk)
+                more = bool(chunk)
+                # the character before pos stays for the boundary of TYPE
+                cut = max(pos - 1, 0)
+                data = data[cut:] + chunk
+                base += cut
+                pos -= cut
+                end = len(data)
+                continue
+
+            if m is None:
+                while pos < end and data[pos] in ignore:
+                    pos += 1
+                if pos >= end:
+                    break
+                print("Illegal character '{0}' ({1}) in line {2}".format(data[pos], hex(ord(data[pos])), self.lineno))
+                self.errors += 1
+                pos += 1
+                continue
+
+            index = m.lastindex
+            value = m.group(index)
+            pos = m.end()
+            start = pos - len(value)
+            kind = kinds[index]
+            if kind == 'ID':
+                # t_TYPE, tried before t_ID, needs a word boundary in front
+                if value in types and not (start and (data[start - 1].isalnum() or data[start - 1] == '_')):
+                    kind = 'TYPE'
+                else:
+                    kind = reserved.get(value, 'ID')
+                    value = intern(value)
+            elif kind == 'literal':
+                kind = value
+            elif kind == 'newline':
+                self.lineno += pos - start
+                lines.extend(xrange(base + start, base + pos))
+                continue
+            elif kind == 'newline2':
+                self.lineno += (pos - start) / 2
+                lines.extend(xrange(base + start + 1, base + pos, 2))
+                continue
+            elif kind == 'BLOCK_COMMENT':
+                offset = value.find('\n')
+                while offset >= 0:
+                    self.lineno += 1
+                    lines.add(base + start + offset)
+                    offset = value.find('\n', offset + 1)
+                continue
+            elif kind == 'LINE_COMMENT':
+                continue
+
+            token = Token()
+            token.type = kind
+            token.value = value
+            token.lineno = self.lineno
+            token.lexpos = base + start
+            self.lexpos = base + pos
+            yield token
+
+        self.lexpos = base + pos
+        while True:
+            yield None
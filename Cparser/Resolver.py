@@ -0,0 +1,162 @@
+#!/usr/bin/python
+from TypeChecker import NodeVisitor
+
+# Addresses are (depth, slot) pairs. Functions may only be defined at top
+# level, so a variable lives either in the frame of the running function
+# (LOCAL) or in the program frame (GLOBAL). Code outside functions runs
+# directly in the program frame, so its variables are all LOCAL.
+LOCAL = 0
+GLOBAL = 1
+
+
+class Layout(object):
+    # slot allocation of one runtime frame; sibling blocks reuse slots
+    def __init__(self):
+        self.next = 0
+        self.size = 0
+        self.names = {}
+
+    def allocate(self, name):
+        slot = self.next
+        self.next += 1
+        self.size = max(self.size, self.next)
+        self.names[slot] = name if self.names.get(slot, name) == name else self.names[slot] + '/' + name
+        return slot
+
+
+class Scope(object):
+    def __init__(self, parent, layout):
+        self.parent = parent
+        self.layout = layout
+        self.names = {}
+        self.start = layout.next
+
+    def declare(self, name):
+        self.names[name] = self.layout.allocate(name)
+        return self.names[name]
+
+    def lookup(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.names:
+                return scope.layout, scope.names[name]
+            scope = scope.parent
+        return None, None
+
+    def close(self):
+        self.layout.next = self.start
+
+
+class Resolver(NodeVisitor):
+    # Runs after TypeChecker. Sets `address` on every ID, Assignment, Init and
+    # Function (None when the name cannot be resolved, or for an Init that
+    # redefines a name of the same block), and `frame_size` / `varnames` on
+    # Program and every Function.
+    def address(self, name, scope):
+        layout, slot = scope.lookup(name)
+        if layout is None:
+            return None
+        return (LOCAL if layout is scope.layout else GLOBAL), slot
+
+    def visit_Program(self, node, scope):
+        layout = Layout()
+        scope = Scope(None, layout)
+        self.visit(node.declarations, scope)
+
+        for function in node.fundefs.elements:
+            if function.id not in scope.names:
+                scope.declare(function.id)
+        self.visit(node.fundefs, scope)
+        self.visit(node.instructions, scope)
+
+        node.frame_size = layout.size
+        node.varnames = layout.names
+
+    def visit_DeclarationList(self, node, scope):
+        for declaration in node.elements:
+            self.visit(declaration, scope)
+
+    def visit_Declaration(self, node, scope):
+        for init in node.initList.elements:
+            self.visit(init, scope)
+
+    def visit_Init(self, node, scope):
+        if node.left in scope.names:
+            node.address = None
+            return
+
+        self.visit(node.right, scope)
+        node.address = LOCAL, scope.declare(node.left)
+
+    def visit_FunList(self, node, scope):
+        for function in node.elements:
+            self.visit(function, scope)
+
+    def visit_Function(self, node, scope):
+        layout = Layout()
+        function_scope = Scope(scope, layout)
+        for argument in node.arglist.elements:
+            function_scope.declare(argument.id)
+
+        self.visit(node.body, function_scope)
+        node.address = LOCAL, scope.names[node.id]
+        node.frame_size = layout.size
+        node.varnames = layout.names
+
+    def visit_CompoundInstruction(self, node, scope):
+        block_scope = Scope(scope, scope.layout)
+        self.visit(node.decList, block_scope)
+        self.visit(node.incList, block_scope)
+        block_scope.close()
+
+    def visit_InstructionList(self, node, scope):
+        for instruction in node.elements:
+            self.visit(instruction, scope)
+
+    def visit_ExpressionList(self, node, scope):
+        for expression in node.elements:
+            self.visit(expression, scope)
+
+    def visit_Assignment(self, node, scope):
+        self.visit(node.right, scope)
+        node.address = self.address(node.left, scope)
+
+    def visit_BinExpr(self, node, scope):
+        self.visit(node.left, scope)
+        self.visit(node.right, scope)
+
+    def visit_RelExpr(self, node, scope):
+        self.visit_BinExpr(node, scope)
+
+    def visit_ID(self, node, scope):
+        node.address = self.address(node.id, scope)
+
+    def visit_FunctionCall(self, node, scope):
+        self.visit(node.arglist, scope)
+        self.visit(node.id, scope)
+
+    def visit_PrintInstruction(self, node, scope):
+        self.visit(node.expr, scope)
+
+    def visit_ReturnInstruction(self, node, scope):
+        self.visit(node.returns, scope)
+
+    def visit_LabeledInstruction(self, node, scope):
+        self.visit(node.instruction, scope)
+
+    def visit_WhileLoopInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instructions, scope)
+
+    def visit_RepeatLoopInstruction(self, node, scope):
+        self.visit(node.instructions, scope)
+        self.visit(node.condition, scope)
+
+    def visit_IfInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instruction, scope)
+
+    def visit_IfElseInstruction(self, node, scope):
+        self.visit(node.condition, scope)
+        self.visit(node.instruction, scope)
+        self.visit(node.no_instruction, scope)
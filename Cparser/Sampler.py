@@ -0,0 +1,76 @@
+import sys
+import threading
+import time
+from collections import defaultdict
+
+import Interpreter
+
+# Sampling profiler of the interpreter engines. A background thread wakes
+# up every `interval` seconds and reads the Python stack of the thread
+# running Interpreter (sys._current_frames): the node of the innermost
+# handler frame that has a line is where the program is, and every frame of
+# the closures Interpreter makes of an AST.Function is a call of that
+# function, made from the line of the handler frame above it. Nothing runs
+# in the interpreter thread itself, so the cost is that of the samples.
+#
+# The samples are kept as collapsed stacks, the input of flamegraph.pl and
+# of speedscope: one line per stack, its frames `function:line` from the
+# top level down, separated by `;`, and the number of times it was seen.
+
+FILENAME = Interpreter.Interpreter.__init__.__func__.__code__.co_filename
+CALLS = ('fun', 'enter')
+TOP = 'program'
+
+
+class Sampler(object):
+    def __init__(self, interval=0.005, thread=None):
+        self.interval = interval
+        self.thread = thread if thread is not None else threading.current_thread().ident
+        self.stacks = defaultdict(int)
+        self.samples = 0
+        self.running = False
+        self.worker = None
+
+    def start(self):
+        self.running = True
+        self.worker = threading.Thread(target=self.run)
+        self.worker.daemon = True
+        self.worker.start()
+
+    def stop(self):
+        self.running = False
+        self.worker.join()
+
+    def run(self):
+        while self.running:
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self.thread)
+            if frame is not None:
+                self.sample(frame)
+
+    def sample(self, frame):
+        # innermost first: the line a function is at is that of the first
+        # handler frame with a line found before its call frame, or the line
+        # of its definition while it enters its body
+        stack = []
+        line = None
+        while frame is not None:
+            code = frame.f_code
+            if code.co_filename == FILENAME:
+                if code.co_name in CALLS:
+                    function = frame.f_locals['node']
+                    stack.append("{0}:{1}".format(function.id, line or function.lineno))
+                    line = None
+                elif not line:
+                    line = getattr(frame.f_locals.get('node'), 'lineno', None)
+            frame = frame.f_back
+        if not line and not stack:
+            return
+        stack.append("{0}:{1}".format(TOP, line or 0))
+        stack.reverse()
+        self.stacks[';'.join(stack)] += 1
+        self.samples += 1
+
+    def write(self, stream):
+        for stack, count in sorted(self.stacks.items()):
+            stream.write("{0} {1}\n".format(stack, count))
@@ -0,0 +1,317 @@
+import AST
+from Exceptions import *
+from Interpreter import optype
+from Memory import FramePool, MISSING
+from Resolver import LOCAL
+
+
+class Procedure(object):
+    # value of a function name in the stack interpreter
+    __slots__ = ('node', 'pool', 'memo')
+
+    def __init__(self, node):
+        self.node = node
+        self.pool = FramePool(node.frame_size)
+        self.memo = getattr(node, 'memo', None)
+
+    def __repr__(self):
+        return "<function {0}>".format(self.node.id)
+
+
+class StackInterpreter(object):
+    # Walks the same resolved tree as Interpreter, but keeps its own stack:
+    # `work` holds the (handler, node, scope) steps still to run, innermost
+    # last, and `values` the results of evaluated expressions. Handlers never
+    # call each other, so neither nested expressions nor deep recursion use
+    # the Python stack, and at most `max_depth` (None for no limit) calls may
+    # be active at a time.
+    #
+    # A call leaves a `leave` step under the steps of the function body, and
+    # a loop keeps its next test under the steps of its body; break,
+    # continue and return pop steps up to the nearest of them.
+    def __init__(self, max_depth=None):
+        self.max_depth = max_depth
+        self.depth = 0
+        self.globals = []
+        self.values = []
+        self.work = []
+
+        # steps that mark where a jump stops; bound once so `is` finds them
+        self.while_test = self.while_test
+        self.repeat_test = self.repeat_test
+        self.leave = self.leave
+        self.loops = (self.while_test, self.repeat_test)
+
+        self.handlers = {
+            AST.Program: self.program,
+            AST.DeclarationList: self.sequence,
+            AST.InitList: self.sequence,
+            AST.FunList: self.sequence,
+            AST.InstructionList: self.sequence,
+            AST.ExpressionList: self.sequence,
+            AST.Declaration: self.declaration,
+            AST.Init: self.init,
+            AST.Function: self.function,
+            AST.CompoundInstruction: self.compound,
+            AST.Assignment: self.assignment,
+            AST.BinExpr: self.binary,
+            AST.RelExpr: self.binary,
+            AST.Integer: self.constant,
+            AST.Float: self.constant,
+            AST.String: self.string,
+            AST.ID: self.name,
+            AST.FunctionCall: self.call,
+            AST.WhileLoopInstruction: self.while_loop,
+            AST.RepeatLoopInstruction: self.repeat,
+            AST.IfInstruction: self.if_test,
+            AST.IfElseInstruction: self.if_test,
+            AST.PrintInstruction: self.print_value,
+            AST.LabeledInstruction: self.labeled,
+            AST.ReturnInstruction: self.return_value,
+            AST.ContinueInstruction: self.continue_loop,
+            AST.BreakInstruction: self.break_loop,
+        }
+
+    def run(self, program):
+        self.schedule(program, None)
+        self.execute()
+
+    def execute(self):
+        work = self.work
+        pop = work.pop
+        while work:
+            handler, node, scope = pop()
+            handler(node, scope)
+
+    def schedule(self, node, scope):
+        self.work.append((self.handlers[node.__class__], node, scope))
+
+    def unwind(self, stops):
+        # pops steps up to the nearest one whose handler is in stops, and
+        # returns it still on the stack; None if there is none
+        work = self.work
+        while work:
+            step = work[-1]
+            handler = step[0]
+            for stop in stops:
+                if handler is stop:
+                    return step
+            work.pop()
+        return None
+
+    def jump(self, signal, stops):
+        # unwinds for a break or continue; like Interpreter, one that
+        # reaches the end of a function or of the program is an error
+        step = self.unwind(stops + (self.leave,))
+        if step is None or step[0] is self.leave:
+            raise escape(signal)
+        return step
+
+    # statements
+
+    def program(self, node, scope):
+        scope = self.globals = [None] * node.frame_size
+        self.schedule(node.instructions, scope)
+        self.schedule(node.fundefs, scope)
+        self.schedule(node.declarations, scope)
+
+    def sequence(self, node, scope):
+        handlers = self.handlers
+        self.work.extend([(handlers[element.__class__], element, scope) for element in reversed(node.elements)])
+
+    def declaration(self, node, scope):
+        self.schedule(node.initList, scope)
+
+    def init(self, node, scope):
+        if node.address is None:
+            raise Exception("Variable {0} already defined".format(node.left))
+        self.work.append((self.store_local, node.address[1], scope))
+        self.schedule(node.right, scope)
+
+    def store_local(self, slot, scope):
+        scope[slot] = self.values.pop()
+
+    def store_global(self, slot, scope):
+        self.globals[slot] = self.values.pop()
+
+    def function(self, node, scope):
+        scope[node.address[1]] = Procedure(node)
+
+    def compound(self, node, scope):
+        self.schedule(node.incList, scope)
+        self.schedule(node.decList, scope)
+
+    def assignment(self, node, scope):
+        if node.address is None:
+            raise Exception("Undeclared variable {0}".format(node.left))
+        depth, slot = node.address
+        self.work.append((self.store_local if depth == LOCAL else self.store_global, slot, scope))
+        self.schedule(node.right, scope)
+
+    def while_loop(self, node, scope):
+        # not while_test itself: a jump must not stop at a loop not yet begun
+        self.while_test(node, scope)
+
+    def while_test(self, node, scope):
+        if node.condition is None:
+            self.while_body(node, scope)
+        else:
+            self.work.append((self.while_check, node, scope))
+            self.schedule(node.condition, scope)
+
+    def while_check(self, node, scope):
+        if self.values.pop():
+            self.while_body(node, scope)
+
+    def while_body(self, node, scope):
+        self.work.append((self.while_test, node, scope))
+        self.schedule(node.instructions, scope)
+
+    def repeat(self, node, scope):
+        self.work.append((self.repeat_test, node, scope))
+        self.schedule(node.instructions, scope)
+
+    def repeat_test(self, node, scope):
+        if node.condition is None:
+            self.repeat(node, scope)
+        else:
+            self.work.append((self.repeat_check, node, scope))
+            self.schedule(node.condition, scope)
+
+    def repeat_check(self, node, scope):
+        if not self.values.pop():
+            self.repeat(node, scope)
+
+    def if_test(self, node, scope):
+        self.work.append((self.if_check, node, scope))
+        self.schedule(node.condition, scope)
+
+    def if_check(self, node, scope):
+        if self.values.pop():
+            self.schedule(node.instruction, scope)
+        elif node.__class__ is AST.IfElseInstruction:
+            self.schedule(node.no_instruction, scope)
+
+    def print_value(self, node, scope):
+        self.work.append((self.output, node, scope))
+        self.schedule(node.expr, scope)
+
+    def output(self, node, scope):
+        print self.values.pop()
+
+    def labeled(self, node, scope):
+        self.schedule(node.instruction, scope)
+
+    def continue_loop(self, node, scope):
+        self.jump(CONTINUE, self.loops)
+
+    def break_loop(self, node, scope):
+        self.jump(BREAK, self.loops)
+        self.work.pop()
+
+    def return_value(self, node, scope):
+        returns = node.returns
+        if returns.__class__ is AST.FunctionCall and scope is not self.globals:
+            # made in place of the returning call, see tail_call()
+            self.work.append((self.tail_call, returns, scope))
+            self.schedule(returns.id, scope)
+            self.schedule(returns.arglist, scope)
+        else:
+            self.work.append((self.returned, node, scope))
+            self.schedule(returns, scope)
+
+    def returned(self, node, scope):
+        step = self.unwind((self.leave,))
+        if step is None:
+            raise escape(RETURN, self.values.pop())
+        self.work.pop()
+        self.leave(step[1], step[2], self.values.pop())
+
+    # expressions
+
+    def constant(self, node, scope):
+        self.values.append(node.value)
+
+    def string(self, node, scope):
+        self.values.append(node.value[1:-1])
+
+    def name(self, node, scope):
+        if node.address is None:
+            self.values.append(None)
+            return
+
+        depth, slot = node.address
+        self.values.append(scope[slot] if depth == LOCAL else self.globals[slot])
+
+    def binary(self, node, scope):
+        self.work.append((self.operate, optype[node.op], scope))
+        self.schedule(node.right, scope)
+        self.schedule(node.left, scope)
+
+    def operate(self, operator, scope):
+        values = self.values
+        right = values.pop()
+        values[-1] = operator(values[-1], right)
+
+    def call(self, node, scope):
+        self.work.append((self.enter, node, scope))
+        self.schedule(node.id, scope)
+        self.schedule(node.arglist, scope)
+
+    def callee(self, node):
+        # pops the function and the arguments of the call at node
+        values = self.values
+        fun = values.pop()
+        if fun.__class__ is not Procedure:
+            raise TypeError("'{0}' object is not callable".format(type(fun).__name__))
+
+        count = len(node.arglist.elements)
+        if count != fun.node.arity():
+            raise Exception("{0} takes {1} argument(s); {2} given".format(fun.node.id, fun.node.arity(), count))
+        if count:
+            args = values[-count:]
+            del values[-count:]
+        else:
+            args = []
+        return fun, args
+
+    def enter(self, node, scope):
+        fun, args = self.callee(node)
+        pending = None
+        if fun.memo is not None:
+            key = fun.memo.key(args)
+            value = fun.memo.lookup(key)
+            if value is not MISSING:
+                self.values.append(value)
+                return
+            pending = (fun.memo, key)
+
+        if self.depth == self.max_depth:
+            raise CallDepthException("maximum call depth of {0} exceeded calling {1}".format(
+                self.max_depth, fun.node.id))
+        self.depth += 1
+        self.start(fun, args, pending)
+
+    def start(self, fun, args, pending):
+        frame = fun.pool.acquire(args)
+        self.work.append((self.leave, (fun, frame), pending))
+        self.schedule(fun.node.body, frame)
+
+    def tail_call(self, node, scope):
+        # the result of the callee becomes that of the running call, so the
+        # callee takes over its `leave` step, memo included, and its depth
+        fun, args = self.callee(node)
+        self.unwind((self.leave,))
+        (current, frame), pending = self.work.pop()[1:]
+        current.pool.release(frame)
+        self.start(fun, args, pending)
+
+    def leave(self, call, pending, value=None):
+        # reached directly when the body ends without a return; the
+        # function then returns None
+        fun, frame = call
+        fun.pool.release(frame)
+        self.depth -= 1
+        self.values.append(value)
+        if pending is not None:
+            pending[0].store(pending[1], value)
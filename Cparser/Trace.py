@@ -0,0 +1,73 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+
+import AST
+from Interpreter import Interpreter
+from visit import *
+
+# Spans of the phases of a run in the Chrome trace event format, which
+# chrome://tracing, Perfetto and speedscope open. Every span is a complete
+# event ("X") with the peak RSS of the process when it ended, which is also
+# kept as a counter ("C"), so the viewer draws memory under the spans.
+# Spans of one thread nest by their times.
+
+
+def peak_rss():
+    # in kB (ru_maxrss is in bytes on OS X)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if os.uname()[0] == 'Darwin' else peak
+
+
+class Tracer(object):
+    def __init__(self, process='main.py'):
+        self.pid = os.getpid()
+        self.start = time.time()
+        self.events = [{'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'args': {'name': process}}]
+
+    def timestamp(self, moment):
+        # microseconds since the tracer was made
+        return round((moment - self.start) * 1e6, 3)
+
+    @contextmanager
+    def span(self, name, category='phase', **args):
+        begin = time.time()
+        try:
+            yield args
+        finally:
+            end = time.time()
+            args['peak_rss_kb'] = peak = peak_rss()
+            self.events.append({'name': name, 'cat': category, 'ph': 'X', 'pid': self.pid,
+                                'tid': threading.current_thread().ident, 'ts': self.timestamp(begin),
+                                'dur': round((end - begin) * 1e6, 3), 'args': args})
+            self.events.append({'name': 'peak RSS', 'ph': 'C', 'pid': self.pid, 'ts': self.timestamp(end),
+                                'args': {'kB': peak}})
+
+    def write(self, stream):
+        json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, stream)
+
+
+class TracingInterpreter(Interpreter):
+    # Interpreter making a span of every call the top level of the program
+    # makes; calls made in those are not traced
+    visit = extend(Interpreter.visit)
+    call = Interpreter.visit.dispatcher.targets[AST.FunctionCall]
+
+    def __init__(self, tracer, specialize=False):
+        Interpreter.__init__(self, specialize)
+        self.tracer = tracer
+        self.calling = False
+
+    @when(AST.FunctionCall)
+    def visit(self, node, scope=0):
+        if self.calling:
+            return TracingInterpreter.call(self, node, scope)
+        self.calling = True
+        try:
+            with self.tracer.span(node.id.id, 'call', line=node.lineno):
+                return TracingInterpreter.call(self, node, scope)
+        finally:
+            self.calling = False
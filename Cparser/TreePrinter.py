@@ -118,7 +118,7 @@ class TreePrinter:
 
     @addToClass(AST.Const)
     def printTree(self):
-        result = self.value
+        result = str(self.value)
         return result
 
     @addToClass(AST.ID)
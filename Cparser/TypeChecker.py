@@ -2,7 +2,6 @@
 import AST
 import SymbolTable
 from collections import defaultdict
-from random import Random
 
 ttype = defaultdict(lambda: defaultdict(lambda: defaultdict(None)))
 ttype['+']['int']['int'] = 'int'
@@ -74,6 +73,15 @@ class NodeVisitor(object):
 
 
 class TypeChecker(NodeVisitor):
+    # Prints every error it finds and counts them in `errors`; a tree with
+    # errors is not fit for the passes or the engines.
+    def __init__(self):
+        self.errors = 0
+
+    def error(self, message, *args):
+        print(message.format(*args))
+        self.errors += 1
+
     def visit_Program(self, node, symbols):
         symbolscope = SymbolTable.SymbolTable(None, 'program')
         self.visit(node.declarations, symbolscope)
@@ -86,23 +94,25 @@ class TypeChecker(NodeVisitor):
         type1 = self.visit(node.left, symbols)  # type1 = node.left.accept(self)
         type2 = self.visit(node.right, symbols)  # type2 = node.right.accept(self)
         op = node.op
+        node.operand_types = (type1, type2)
         try:
-            return ttype[op][type1][type2]
+            node.type = ttype[op][type1][type2]
         except KeyError:
-            error_str = "Semantic error at line {0} - wrong binary expression"
-            print(error_str.format(node.lineno))
-            return None
+            self.error("Semantic error at line {0} - wrong binary expression", node.lineno)
+            node.type = None
+        return node.type
 
     def visit_RelExpr(self, node, symbols):
         type1 = self.visit(node.left, symbols)  # type1 = node.left.accept(self)
         type2 = self.visit(node.right, symbols)  # type2 = node.right.accept(self)
         op = node.op
+        node.operand_types = (type1, type2)
         try:
-            return ttype[op][type1][type2]
+            node.type = ttype[op][type1][type2]
         except KeyError:
-            error_str = "Semantic error at line {0} - wrong relational expression"
-            print(error_str.format(node.lineno))
-            return None
+            self.error("Semantic error at line {0} - wrong relational expression", node.lineno)
+            node.type = None
+        return node.type
 
     def visit_DeclarationList(self, node, symbols):
         for declaration in node.elements:
@@ -114,8 +124,7 @@ class TypeChecker(NodeVisitor):
 
     def visit_Init(self, node, symbols):
         if node.left in symbols.symbols.keys():
-            error_str = "Semantic error at line {0} - already defined {1}"
-            print(error_str.format(node.lineno,node.left))
+            self.error("Semantic error at line {0} - already defined {1}", node.lineno, node.left)
         else:
             symbol = SymbolTable.Symbol(node.left, node.type)
             symbols.put(node.left, symbol)
@@ -123,8 +132,7 @@ class TypeChecker(NodeVisitor):
         try:
             ttype['='][node.type][self.visit(node.right, symbols)]
         except KeyError:
-            error_str = "Semantic error at line {0} - invalid initialization"
-            print(error_str.format(node.lineno))
+            self.error("Semantic error at line {0} - invalid initialization", node.lineno)
             return None
 
 
@@ -140,8 +148,7 @@ class TypeChecker(NodeVisitor):
             argList.append(a)
 
         if node.id in symbols.symbols.keys():
-            error_str = "Semantic error at line {0} - function {1} already declared"
-            print(error_str.format(node.lineno,node.id))
+            self.error("Semantic error at line {0} - function {1} already declared", node.lineno, node.id)
         else:
             symbol = SymbolTable.FunctionSymbol(node.id, node.retType, dict(argList))
             symbols.put(node.id, symbol)
@@ -170,16 +177,14 @@ class TypeChecker(NodeVisitor):
         if symbols.checkIfLoop():
             return True
         else:
-            error_str = "Semantic error at line {0} - break instruction called outside of loop"
-            print(error_str.format(node.lineno))
+            self.error("Semantic error at line {0} - break instruction called outside of loop", node.lineno)
             return None
 
     def visit_ContinueInstruction(self,node,symbols):
         if symbols.checkIfLoop():
             return True
         else:
-            error_str = "Semantic error at line {0} - continue instruction called outside of loop"
-            print(error_str.format(node.lineno))
+            self.error("Semantic error at line {0} - continue instruction called outside of loop", node.lineno)
             return None
 
     def visit_PrintInstruction(self, node, symbols):
@@ -189,8 +194,7 @@ class TypeChecker(NodeVisitor):
         try:
             ttype['='][symbols.getFunctionType()][self.visit(node.returns, symbols)]
         except KeyError:
-            error_str = "Semantic error at line {0} - wrong type in return statement"
-            print(error_str.format(node.lineno))
+            self.error("Semantic error at line {0} - wrong type in return statement", node.lineno)
             return None
 
     def visit_WhileLoopInstruction(self, node, symbols):
@@ -219,17 +223,16 @@ class TypeChecker(NodeVisitor):
         try:
             ttype['='][symbols.get(node.left).type][self.visit(node.right, symbols)]
         except KeyError:
-            error_str = "Semantic error at line {0} - wrong assignement"
-            print(error_str.format(node.lineno))
+            self.error("Semantic error at line {0} - wrong assignement", node.lineno)
             return None
 
     def visit_ID(self, node, symbols):
         if symbols.get(node.id):
-            return symbols.get(node.id).type
+            node.type = symbols.get(node.id).type
         else:
-            error_str = "Semantic error at line {0} - variable not defined"
-            print(error_str.format(node.lineno))
-            return None
+            self.error("Semantic error at line {0} - variable not defined", node.lineno)
+            node.type = None
+        return node.type
 
     def visit_FunctionCall(self, node, symbols):
         symbol = symbols.get(str(node.id))
@@ -237,25 +240,28 @@ class TypeChecker(NodeVisitor):
             expected = len(node.arglist.elements)
             given = len(symbol.arguments)
             if expected != given:
-                print("Incorrect amount of arguments. Expected: {0}, given: {1} in line: {2}".format(expected, given, node.lineno))
+                self.error("Incorrect amount of arguments. Expected: {0}, given: {1} in line: {2}", expected, given, node.lineno)
             else:
                 for argtype, arg in zip(symbol.arguments, node.arglist.elements):
                     try:
                         ttype['='][symbol.arguments[argtype]][self.visit(arg, symbols)]
                     except KeyError:
-                        error_str = "Semantic error at line {0} - wrong argument type"
-                        print(error_str.format(node.lineno))
+                        self.error("Semantic error at line {0} - wrong argument type", node.lineno)
 
-            return symbols.get(str(node.id)).type
+            node.type = symbols.get(str(node.id)).type
         else:
-            print("Function not defined")
-            return False
+            self.error("Function not defined")
+            node.type = False
+        return node.type
 
     def visit_Integer(self, node, symbols):
-        return 'int'
+        node.type = 'int'
+        return node.type
 
     def visit_Float(self, node, symbols):
-        return 'float'
+        node.type = 'float'
+        return node.type
 
     def visit_String(self, node, symbols):
-        return 'string'
+        node.type = 'string'
+        return node.type
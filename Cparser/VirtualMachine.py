@@ -0,0 +1,162 @@
+from Bytecode import *
+from Exceptions import *
+from Interpreter import optype
+from Memory import FramePool, MISSING
+
+
+class VirtualMachine(object):
+    def __init__(self):
+        self.globals = []
+
+    def run(self, program):
+        self.globals = [None] * program.nlocals
+        for function in program.functions:
+            function.pool = FramePool(function.nlocals)
+        self.execute(program)
+
+    def execute(self, program):
+        # one dispatch loop for the whole program: calls push the caller's
+        # state onto `frames` instead of recursing into Python
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []
+        g = f = self.globals
+        code = program
+        ops, consts = code.code, code.consts
+        pc = 0
+
+        while True:
+            op = ops[pc]
+            arg = ops[pc + 1]
+            pc += 2
+
+            if op == LOAD_LOCAL:
+                push(f[arg])
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == STORE_LOCAL:
+                f[arg] = pop()
+            elif op == JUMP_IF_FALSE:
+                if not pop():
+                    pc = arg
+            elif op == JUMP:
+                pc = arg
+            elif op == LOAD_GLOBAL:
+                push(g[arg])
+            elif op == STORE_GLOBAL:
+                g[arg] = pop()
+            elif op == BINARY_ADD:
+                right = pop()
+                stack[-1] = stack[-1] + right
+            elif op == BINARY_SUBTRACT:
+                right = pop()
+                stack[-1] = stack[-1] - right
+            elif op == COMPARE_LT:
+                right = pop()
+                stack[-1] = 1 if stack[-1] < right else 0
+            elif op == COMPARE_EQ:
+                right = pop()
+                stack[-1] = 1 if stack[-1] == right else 0
+            elif op == BINARY_MODULO:
+                right = pop()
+                stack[-1] = stack[-1] % right
+            elif op == BINARY_MULTIPLY:
+                right = pop()
+                stack[-1] = stack[-1] * right
+            elif op == COMPARE_LE:
+                right = pop()
+                stack[-1] = 1 if stack[-1] <= right else 0
+            elif op == COMPARE_GT:
+                right = pop()
+                stack[-1] = 1 if stack[-1] > right else 0
+            elif op == COMPARE_GE:
+                right = pop()
+                stack[-1] = 1 if stack[-1] >= right else 0
+            elif op == COMPARE_NE:
+                right = pop()
+                stack[-1] = 1 if stack[-1] != right else 0
+            elif op == CALL:
+                fun = pop()
+                if not isinstance(fun, Code):
+                    raise TypeError("'{0}' object is not callable".format(type(fun).__name__))
+                if arg != fun.arity:
+                    raise Exception("{0} takes {1} argument(s); {2} given".format(fun.name, fun.arity, arg))
+
+                memo = fun.memo
+                if memo is not None:
+                    # the result is stored by the RET that hands it back here
+                    key = memo.key(stack[-arg:] if arg else ())
+                    value = memo.lookup(key)
+                    if value is not MISSING:
+                        if arg:
+                            del stack[-arg:]
+                        push(value)
+                        continue
+                    memo = (memo, key)
+
+                frames.append((code, pc, f, memo))
+                if arg:
+                    f = fun.pool.acquire(stack[-arg:])
+                    del stack[-arg:]
+                else:
+                    f = fun.pool.acquire(())
+                code = fun
+                ops, consts = code.code, code.consts
+                pc = 0
+            elif op == TAIL_CALL:
+                fun = pop()
+                if not isinstance(fun, Code):
+                    raise TypeError("'{0}' object is not callable".format(type(fun).__name__))
+                if arg != fun.arity:
+                    raise Exception("{0} takes {1} argument(s); {2} given".format(fun.name, fun.arity, arg))
+
+                code.pool.release(f)
+                if arg:
+                    f = fun.pool.acquire(stack[-arg:])
+                    del stack[-arg:]
+                else:
+                    f = fun.pool.acquire(())
+                code = fun
+                ops, consts = code.code, code.consts
+                pc = 0
+            elif op == RET:
+                if not frames:
+                    raise ReturnValueException(pop())
+                code.pool.release(f)
+                code, pc, f, memo = frames.pop()
+                ops, consts = code.code, code.consts
+                if memo is not None:
+                    memo[0].store(memo[1], stack[-1])
+            elif op == BINARY_DIVIDE:
+                right = pop()
+                stack[-1] = stack[-1] / right
+            elif op == PRINT:
+                print pop()
+            elif op == BINARY_OR:
+                right = pop()
+                stack[-1] = stack[-1] | right
+            elif op == BINARY_AND:
+                right = pop()
+                stack[-1] = stack[-1] & right
+            elif op == BINARY_XOR:
+                right = pop()
+                stack[-1] = stack[-1] ^ right
+            elif op == BINARY_LSHIFT:
+                right = pop()
+                stack[-1] = stack[-1] << right
+            elif op == BINARY_RSHIFT:
+                right = pop()
+                stack[-1] = stack[-1] >> right
+            elif op == LOGICAL_AND:
+                right = pop()
+                stack[-1] = optype['&&'](stack[-1], right)
+            elif op == LOGICAL_OR:
+                right = pop()
+                stack[-1] = optype['||'](stack[-1], right)
+            elif op == RAISE:
+                raise Exception(consts[arg])
+            elif op == HALT:
+                return
+            else:
+                raise Exception("Unknown opcode {0} at {1} in {2}".format(op, pc - 2, code.name))
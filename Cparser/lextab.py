@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'BREAK', 'CONTINUE', 'ELSE', 'EQ', 'FLOAT', 'GE', 'ID', 'IF', 'INTEGER', 'LE', 'NEQ', 'OR', 'PRINT', 'REPEAT', 'RETURN', 'SHL', 'SHR', 'STRING', 'TYPE', 'UNTIL', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = '{}()<>=;:,+-*/%&|^'
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_newline>\\n+)|(?P<t_newline2>(\\r\\n)+)|(?P<t_LINE_COMMENT>\\#.*)|(?P<t_BLOCK_COMMENT>/\\*(.|\\n)*?\\*/)|(?P<t_FLOAT>\\d+(\\.\\d*)|\\.\\d+)|(?P<t_INTEGER>\\d+)|(?P<t_STRING>\\"([^\\\\\\n]|(\\\\.))*?\\")|(?P<t_TYPE>\\b(int|float|string)\\b)|(?P<t_ID>[a-zA-Z_]\\w*)|(?P<t_OR>\\|\\|)|(?P<t_LE><=)|(?P<t_EQ>==)|(?P<t_AND>&&)|(?P<t_SHR>>>)|(?P<t_SHL><<)|(?P<t_NEQ>!=)|(?P<t_GE>>=)', [None, ('t_newline', 'newline'), ('t_newline2', 'newline2'), None, ('t_LINE_COMMENT', 'LINE_COMMENT'), ('t_BLOCK_COMMENT', 'BLOCK_COMMENT'), None, ('t_FLOAT', 'FLOAT'), None, ('t_INTEGER', 'INTEGER'), ('t_STRING', 'STRING'), None, None, ('t_TYPE', 'TYPE'), None, ('t_ID', 'ID'), (None, 'OR'), (None, 'LE'), (None, 'EQ'), (None, 'AND'), (None, 'SHR'), (None, 'SHL'), (None, 'NEQ'), (None, 'GE')])]}
+_lexstateignore = {'INITIAL': ' \t\x0c'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
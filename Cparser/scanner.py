@@ -1,19 +1,25 @@
-import ply.lex as lex
+import tables
+from LineIndex import LineIndex
 
 
 class Scanner(object):
+    errors = 0  # illegal characters met, in all sources
+
     def find_tok_column(self, token):
-        last_cr = self.lexer.lexdata.rfind('\n', 0, token.lexpos)
-        if last_cr < 0:
-            last_cr = 0
-        return token.lexpos - last_cr
+        # the line ends are indexed on the first error in a source
+        lexdata = self.lexer.lexdata
+        if getattr(self, 'indexed', None) is not lexdata:
+            self.lines = LineIndex.of(lexdata)
+            self.indexed = lexdata
+        return self.lines.column(token.lexpos)
 
 
     def build(self):
-        self.lexer = lex.lex(object=self)
+        self.lexer = tables.lexer(self)
 
     def input(self, text):
         self.lexer.input(text)
+        self.lexer.lineno = 1
 
     def token(self):
         return self.lexer.token()
@@ -49,6 +55,7 @@ class Scanner(object):
 
     def t_error(self, t):
         print("Illegal character '{0}' ({1}) in line {2}".format(t.value[0], hex(ord(t.value[0])), t.lexer.lineno))
+        self.errors += 1
         t.lexer.skip(1)
 
 
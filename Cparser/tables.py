@@ -0,0 +1,110 @@
+import hashlib
+import os
+import ply.lex as lex
+import ply.yacc as yacc
+
+# Prebuilt tables of the lexer (lextab.py) and of the LALR parser
+# (parsetab.py), generated next to this file. Loading them skips what lex()
+# and yacc() do on every call: reflecting over the t_ and p_ rules,
+# validating them and checking the grammar. They are trusted as long as
+# grammar.sig holds the digest of the files the grammar is written in, and
+# generated again, with all the checks, when it does not.
+
+DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+SOURCES = ('scanner.py', 'Cparser.py')
+SIGNATURE = os.path.join(DIRECTORY, 'grammar.sig')
+PACKAGE = __name__.rpartition('.')[0]
+
+rebuilt = set()
+
+
+def signature():
+    digest = hashlib.md5()
+    for name in SOURCES:
+        with open(os.path.join(DIRECTORY, name), 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def current():
+    # whether the prebuilt tables were generated from the grammar as it is
+    try:
+        with open(SIGNATURE) as stored:
+            return stored.read().strip() == signature()
+    except IOError:
+        return False
+
+
+class Methods(object):
+    # name -> bound method of obj, looked up the way the table readers of
+    # ply look up rules in the dict they are given
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __getitem__(self, name):
+        return getattr(self.obj, name)
+
+
+def lexer(scanner):
+    # a ply lexer running the t_ rules of scanner
+    if current():
+        try:
+            import lextab
+            lexobj = lex.Lexer()
+            lexobj.readtab(lextab, Methods(scanner))
+            return lexobj
+        except (ImportError, SyntaxError, AttributeError):
+            pass
+
+    lexobj = lex.lex(object=scanner)
+    try:
+        discard('lextab')
+        lexobj.writetab('lextab', DIRECTORY)
+    except (IOError, OSError):
+        return lexobj
+    written('lextab')
+    return lexobj
+
+
+def parser(module):
+    # a ply parser running the p_ rules of module
+    if current():
+        try:
+            import parsetab
+            table = yacc.LRTable()
+            table.read_table(parsetab)
+            table.bind_callables(Methods(module))
+            return yacc.LRParser(table, module.p_error)
+        except (ImportError, SyntaxError, AttributeError, yacc.VersionError):
+            pass
+
+    # yacc() keeps a parsetab.py of the same grammar, so only the
+    # existence of a new one tells that it could write it
+    try:
+        discard('parsetab')
+    except OSError:
+        return yacc.yacc(module=module, write_tables=False, debug=False)
+    parser = yacc.yacc(module=module, tabmodule=PACKAGE + '.parsetab', outputdir=DIRECTORY, debug=False)
+    if os.path.exists(os.path.join(DIRECTORY, 'parsetab.py')):
+        written('parsetab')
+    return parser
+
+
+def discard(table):
+    # removes the table and its compiled form, which could otherwise be
+    # imported in its place when both are written within the same second
+    for name in (table + '.py', table + '.pyc'):
+        path = os.path.join(DIRECTORY, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def written(table):
+    # once both tables are generated again, they are marked current
+    rebuilt.add(table)
+    if rebuilt == set(['lextab', 'parsetab']):
+        try:
+            with open(SIGNATURE, 'w') as stored:
+                stored.write(signature() + '\n')
+        except IOError:
+            pass
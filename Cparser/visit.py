@@ -3,7 +3,7 @@
 
 import inspect
 
-__all__ = ['on', 'when']
+__all__ = ['on', 'when', 'extend']
 
 
 def on(param_name):
@@ -25,39 +25,81 @@ def when(param_type):
         if not isinstance(dispatcher, Dispatcher):
             dispatcher = dispatcher.dispatcher
         dispatcher.add_target(param_type, fn)
+        return dispatcher.entry
 
-        def ff(*args, **kw):
-            return dispatcher(*args, **kw)
+    return f
 
-        ff.dispatcher = dispatcher
-        return ff
 
-    return f
+def extend(entry):
+    # for a subclass of a visitor: `visit = extend(Base.visit)` starts a
+    # dispatcher with the targets of Base.visit, to which @when in the
+    # subclass adds or replaces handlers without changing Base
+    base = entry.dispatcher
+    dispatcher = Dispatcher(base.param_name, base.default)
+    dispatcher.targets.update(base.targets)
+    return dispatcher.entry
 
 
 class Dispatcher(object):
+    # Every concrete class is resolved to exactly one handler: the target of
+    # the nearest class in its MRO, or the function decorated with @on when
+    # there is none. The result is cached, so later calls cost one dict hit.
     def __init__(self, param_name, fn):
-        frame = inspect.currentframe().f_back.f_back  # these 2 lines
-        top_level = frame.f_locals == frame.f_globals  # seem redundant
         self.param_index = inspect.getargspec(fn).args.index(param_name)
         self.param_name = param_name
+        self.default = fn
         self.targets = {}
+        self.cache = {}
+        self.entry = self.make_entry()
 
-    def __call__(self, *args, **kw):
-        typ = args[self.param_index].__class__
-        d = self.targets.get(typ)
-        if d is not None:
-            return d(*args, **kw)
+    def make_entry(self):
+        cache = self.cache
+        resolve = self.resolve
+
+        if self.param_index == 1:
+            def ff(self, param, *args, **kw):
+                try:
+                    target = cache[param.__class__]
+                except KeyError:
+                    target = resolve(param.__class__)
+                return target(self, param, *args, **kw)
         else:
-            issub = issubclass
-            t = self.targets
-            ks = t.iterkeys()
+            index = self.param_index
+
+            def ff(*args, **kw):
+                typ = args[index].__class__
+                try:
+                    target = cache[typ]
+                except KeyError:
+                    target = resolve(typ)
+                return target(*args, **kw)
 
-            val = [t[k](*args, **kw) for k in ks if issub(typ, k)]
-            if len(val) == 1:
-                return val[0]
-            else:
-                return val
+        ff.dispatcher = self
+        return ff
+
+    def __call__(self, *args, **kw):
+        return self.entry(*args, **kw)
 
     def add_target(self, typ, target):
         self.targets[typ] = target
+        self.cache.clear()
+
+    def resolve(self, typ):
+        for klass in inspect.getmro(typ):
+            if klass in self.targets:
+                target = self.targets[klass]
+                break
+        else:
+            target = self.default
+
+        self.cache[typ] = target
+        return target
+
+    def table(self, classes=()):
+        # (class, handler class) pairs for every target and every given class
+        rows = []
+        for typ in sorted(set(self.targets) | set(classes), key=lambda typ: typ.__name__):
+            target = self.resolve(typ)
+            owner = [klass for klass in self.targets if self.targets[klass] is target]
+            rows.append((typ, owner[0] if owner else None))
+        return rows
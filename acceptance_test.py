@@ -1,38 +1,189 @@
 #!/usr/bin/env python
-import unittest
+import argparse
+import multiprocessing
 import os
+import subprocess
+import sys
+import time
+import traceback
+import unittest
+from StringIO import StringIO
+
+import main
+from Cparser.CompactAST import CompactTree
+
+# Runs every .in program under a directory in-process and compares what it
+# prints with the .expected file next to it, the way main.py would print it.
+# Each process builds its parsers once and runs its share of the programs
+# with them; the time of every phase is kept per program. The output of a
+# program that fails is written to its .actual file.
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PHASES = ('lex', 'parse', 'typecheck', 'passes', 'execute')
+
+parsers = {}  # scanner name -> (Cparser, ply parser), of this process
+
+
+def run_program(path, engine='interpreter', scanner='ply', optimize=(), compact=False):
+    # what the program at path prints, the seconds each phase took and the
+    # traceback of an exception that stopped it, if one did; with compact,
+    # the phases after parsing work on the views of a CompactTree
+    if scanner not in parsers:
+        parsers[scanner] = main.build_parser(scanner)
+    c_parser, parser = parsers[scanner]
+    with open(path) as source:
+        text = source.read()
+
+    times = []
+    error = None
+    stdout, stderr = sys.stdout, sys.stderr
+    output = sys.stdout = StringIO()
+    # only stdout is compared, as memo statistics go to stderr
+    sys.stderr = StringIO()
+    try:
+        start = time.time()
+        before = main.reported(c_parser)
+        c_parser.scanner.input(text)
+        tokens = []
+        token = c_parser.scanner.token()
+        while token is not None:
+            tokens.append(token)
+            token = c_parser.scanner.token()
+        times.append(time.time())
+
+        result = parser.parse(lexer=main.Replay(tokens))
+        if compact and result is not None:
+            result = CompactTree(result).view()
+        times.append(time.time())
+        main.typecheck(result, c_parser, before)
+        times.append(time.time())
+        result = main.transform(result, optimize)
+        times.append(time.time())
+        main.execute(result, engine)
+        times.append(time.time())
+    except main.CompileError:
+        # what the program printed are its errors, as with main.py
+        pass
+    except Exception:
+        error = traceback.format_exc()
+    finally:
+        sys.stdout, sys.stderr = stdout, stderr
+
+    times = [end - begin for begin, end in zip([start] + times, times)]
+    times.extend([0.0] * (len(PHASES) - len(times)))
+    return output.getvalue(), times, error
+
+
+def expected(path):
+    with open(os.path.splitext(path)[0] + '.expected') as result:
+        return result.read()
+
+
+def run_test(job):
+    # (path, whether it passed, phase times, error) for a (path, engine,
+    # scanner, optimize, compact) job
+    path = job[0]
+    output, times, error = run_program(*job)
+    passed = output == expected(path)
+    if not passed:
+        with open(os.path.splitext(path)[0] + '.actual', 'w') as actual:
+            actual.write(output)
+    return path, passed, times, error
+
+
+def programs(directory):
+    found = []
+    for dirpath, dirnames, filenames in os.walk(directory):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            if filename.endswith('.in') and not filename.startswith('.') and \
+                    os.path.exists(os.path.splitext(path)[0] + '.expected'):
+                found.append(path)
+    return sorted(found)
 
 
 class AcceptanceTests(unittest.TestCase):
     @classmethod
-    def add_test(cls, dirpath, filename):
-        basename = os.path.splitext(filename)[0]
+    def setUpClass(cls):
+        sys.setrecursionlimit(max(sys.getrecursionlimit(), 5000))
 
-        dirname = os.path.join(*os.path.split(dirpath)[1:])
-        name = os.path.join(dirname, basename)
+    def test_deep_expression(self):
+        # the engines that keep their own stacks run an expression nested
+        # far deeper than the Python stack goes, through main.py, which runs
+        # the recursive front end on a deeper one
+        text = "int x = 0;\nx = {0};\nprint x;\n".format(' + '.join(['1'] * 20000))
+        for engine in ('stack', 'vm'):
+            process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), '-', '--engine', engine],
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            output, errors = process.communicate(text)
+            self.assertEqual(output, "20000\n", "deep expression printed on {0}:\n{1}{2}".format(
+                engine, output, errors[-500:]))
 
-        def file2func_name(filename):
-            return 'test_' + filename
+    @classmethod
+    def add_test(cls, path, engine, compact=False):
+        # every engine has to print what the .expected file holds, from the
+        # node objects and from a CompactTree
+        name = os.path.splitext(os.path.relpath(path, ROOT))[0]
 
         def test_func(self):
-            print("RUNNING TEST tests\\{}".format(filename))
-            os.system("python main.py tests\\{0} > tests\\{1}.actual".format(filename, name))
-            diff = os.system("fc tests\\{0}.actual tests\\{0}.expected > NUL".format(name))
-            self.assertFalse(diff, "files {0}.actual and {0}.expected differ".format(name))
+            output, times, error = run_program(path, engine, compact=compact)
+            self.assertEqual(output, expected(path), "{0} printed on {1}{2}:\n{3}{4}".format(
+                name, engine, ' (compact)' if compact else '', output, error or ''))
 
-        func_name = file2func_name(name)
-        setattr(cls, func_name, test_func)
+        setattr(cls, 'test_{0}_{1}{2}'.format(name.replace(os.sep, '_'), engine, '_compact' if compact else ''),
+                test_func)
 
     @classmethod
     def add_tests(cls, dir):
-        for dirpath, dirnames, filenames in os.walk(dir):
-            for filename in filenames:
-                if filename.startswith('.'):
-                    continue
-                elif filename.endswith('.in'):
-                    cls.add_test(dirpath, filename)
+        for path in programs(dir):
+            for engine in main.engines:
+                cls.add_test(path, engine)
+                cls.add_test(path, engine, compact=True)
+
+
+AcceptanceTests.add_tests(os.path.join(ROOT, 'tests'))
 
 
 if __name__ == '__main__':
-    AcceptanceTests.add_tests('tests/')
-    unittest.main()
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('directories', nargs='*', default=[os.path.join(ROOT, 'tests')])
+    argparser.add_argument('-j', '--jobs', type=int, default=multiprocessing.cpu_count(),
+                           help="processes to run the programs in (default: one per CPU)")
+    argparser.add_argument('--engine', choices=sorted(main.engines), default='interpreter')
+    argparser.add_argument('--scanner', choices=sorted(main.scanners), default='ply')
+    argparser.add_argument('-O', '--optimize', action='append', default=[],
+                           choices=[name for name, module, optimizer in main.optimizers])
+    argparser.add_argument('--compact', action='store_true',
+                           help="run the phases after parsing on the views of a CompactTree")
+    argparser.add_argument('-q', '--quiet', action='store_true', help="print only failures and totals")
+    args = argparser.parse_args()
+    sys.setrecursionlimit(5000)
+
+    jobs = [(path, args.engine, args.scanner, tuple(args.optimize), args.compact)
+            for directory in args.directories for path in programs(directory)]
+    start = time.time()
+    if args.jobs > 1:
+        pool = multiprocessing.Pool(args.jobs)
+        results = pool.imap(run_test, jobs, max(1, len(jobs) // (args.jobs * 8)))
+    else:
+        results = (run_test(job) for job in jobs)
+
+    print("{0:<32} {1}   total (ms)".format('', ' '.join("{0:>9}".format(phase) for phase in PHASES)))
+    totals = [0.0] * len(PHASES)
+    failed = 0
+    for path, passed, times, error in results:
+        totals = [total + phase for total, phase in zip(totals, times)]
+        if not passed:
+            failed += 1
+        if passed and args.quiet:
+            continue
+        print("{0:<32} {1} {2:>12.2f}  {3}".format(
+            os.path.relpath(path)[-32:], ' '.join("{0:>9.2f}".format(phase * 1000) for phase in times),
+            sum(times) * 1000, 'ok' if passed else 'FAIL'))
+        if not passed and error is not None:
+            sys.stdout.write(error)
+
+    print("{0:<32} {1} {2:>12.2f}".format(
+        'all', ' '.join("{0:>9.2f}".format(total * 1000) for total in totals), sum(totals) * 1000))
+    print("{0} passed, {1} failed in {2:.2f} s".format(len(jobs) - failed, failed, time.time() - start))
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# Benchmark for acceptance_test.py.
+#
+# Copies every program of tests/ with its expected output into a corpus
+# several times over, then times checking the corpus the way the old
+# runner did, with one main.py process per program, and with
+# acceptance_test.py in one process and in a process per CPU.
+
+import argparse
+import glob
+import multiprocessing
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+
+
+def spawned(corpus):
+    failed = 0
+    with open(os.devnull, 'w') as devnull:
+        for path in sorted(glob.glob(os.path.join(corpus, '*.in'))):
+            output = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), path, '--no-cache'],
+                                      stdout=subprocess.PIPE, stderr=devnull).communicate()[0]
+            with open(os.path.splitext(path)[0] + '.expected') as expected:
+                failed += output != expected.read()
+    return failed
+
+
+def runner(corpus, jobs):
+    with open(os.devnull, 'w') as devnull:
+        return subprocess.call([sys.executable, os.path.join(ROOT, 'acceptance_test.py'), corpus,
+                                '-q', '-j', str(jobs)], stdout=devnull)
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--copies', type=int, default=5)
+    args = argparser.parse_args()
+
+    corpus = tempfile.mkdtemp()
+    try:
+        count = 0
+        for path in sorted(glob.glob(os.path.join(ROOT, 'tests', '*.in'))):
+            base = os.path.splitext(path)[0]
+            for copy in range(args.copies):
+                target = os.path.join(corpus, '{0}_{1}'.format(os.path.basename(base), copy))
+                shutil.copy(path, target + '.in')
+                shutil.copy(base + '.expected', target + '.expected')
+                count += 1
+
+        cpus = multiprocessing.cpu_count()
+        cases = [
+            ('main.py per program', lambda: spawned(corpus)),
+            ('in-process, -j 1', lambda: runner(corpus, 1)),
+            ('in-process, -j {0}'.format(cpus), lambda: runner(corpus, cpus)),
+        ]
+        print("{0} programs".format(count))
+        print("{0:<22} {1:>9} {2:>8}".format('', 'time (s)', 'speedup'))
+        first = None
+        for name, case in cases:
+            start = time.time()
+            if case():
+                sys.exit("{0}: programs failed".format(name))
+            elapsed = time.time() - start
+            first = first or elapsed
+            print("{0:<22} {1:>9.2f} {2:>7.1f}x".format(name, elapsed, first / elapsed))
+    finally:
+        shutil.rmtree(corpus)
+
+
+if __name__ == '__main__':
+    run()
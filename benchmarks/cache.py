@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# Benchmark for the compile cache.
+#
+# Times whole runs of main.py on a generated program of many small
+# functions: without the cache, filling an empty cache, and loading the
+# program from a warm one.
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from common import ROOT, spawn, synthetic
+
+
+def measure(command, runs, before=None):
+    # the median seconds of a run
+    times = spawn(command, runs, before=before)
+    return times[len(times) // 2]
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--functions', type=int, default=200)
+    argparser.add_argument('--runs', type=int, default=10)
+    args = argparser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    try:
+        program = os.path.join(scratch, 'program.in')
+        with open(program, 'w') as source:
+            source.write(synthetic(args.functions))
+        directory = os.path.join(scratch, 'cache')
+        main = [sys.executable, os.path.join(ROOT, 'main.py'), program, '--cache-dir', directory]
+
+        def empty():
+            shutil.rmtree(directory, ignore_errors=True)
+
+        uncached = measure(main + ['--no-cache'], args.runs)
+        cold = measure(main + ['--cache'], args.runs, empty)
+        warm = measure(main + ['--cache'], args.runs)
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+        print("{0} functions, {1} bytes of source, {2} bytes cached".format(
+            args.functions, os.path.getsize(program), size))
+        print("{0:<14} {1:>11} {2:>8}".format('', 'median (ms)', 'speedup'))
+        for name, elapsed in (('no cache', uncached), ('cold cache', cold), ('warm cache', warm)):
+            print("{0:<14} {1:>11.1f} {2:>7.2f}x".format(name, elapsed * 1000, uncached / elapsed))
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# Microbenchmark for user function calls.
+#
+# Runs a naive recursive fib, where every call ends in a `return`, on each
+# engine and reports interpreted calls per second (execution only; parsing
+# and checking are not timed).
+
+import argparse
+import sys
+
+from common import execute, fastest, main
+
+PROGRAM = """
+int fib(int n) {
+    if (n < 2)
+        return n;
+    return fib(n - 1) + fib(n - 2);
+}
+
+print fib(%d);
+"""
+
+
+def calls(n):
+    # fib(n) makes fib(n - 1) + fib(n - 2) + 1 calls
+    a, b = 1, 1
+    for i in range(n - 1):
+        a, b = b, a + b + 1
+    return b if n > 0 else 1
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--engines', nargs='+', default=sorted(main.engines))
+    argparser.add_argument('-n', type=int, default=20, help="fib argument (default: 20)")
+    argparser.add_argument('--repeat', type=int, default=3)
+    args = argparser.parse_args()
+    sys.setrecursionlimit(5000)
+
+    print("{0:<12} {1:>10} {2:>10} {3:>12}".format('engine', 'calls', 'best (s)', 'calls/s'))
+    for engine in args.engines:
+        elapsed = fastest(args.repeat, execute, PROGRAM % args.n, engine)[0]
+        print("{0:<12} {1:>10} {2:>10.3f} {3:>12.0f}".format(engine, calls(args.n), elapsed, calls(args.n) / elapsed))
+
+
+if __name__ == '__main__':
+    run()
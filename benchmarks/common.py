@@ -0,0 +1,94 @@
+# What the benchmarks share. Importing it puts the repository on sys.path,
+# so a script imports main and Cparser next to it; the rest are the programs
+# of tests/ and a generated one of many small functions, timing an engine
+# in this process with its output kept aside, and timing whole processes.
+
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from StringIO import StringIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import main
+
+FUNCTION = """
+int f{0}(int n) {{
+    int i = 0, total = {0};
+    while (i < n) {{
+        if (i % 2 == 0) total = total + i * 3;
+        else total = total - 1;
+        i = i + 1;
+    }}
+    return total;
+}}
+"""
+
+
+def test(name):
+    # the source of tests/<name>.in
+    with open(os.path.join(ROOT, 'tests', name + '.in')) as source:
+        return source.read()
+
+
+def tests():
+    # the sources of every program in tests/, in the order of their names
+    return [test(name[:-3]) for name in sorted(os.listdir(os.path.join(ROOT, 'tests'))) if name.endswith('.in')]
+
+
+def synthetic(functions, argument=3, function=FUNCTION):
+    # a program of `functions` copies of function, each called once
+    parts = ["int total = 0;\n"]
+    parts.extend(function.format(i) for i in range(functions))
+    parts.extend("total = total + f{0}({1});\n".format(i, argument) for i in range(functions))
+    parts.append("print total;\n")
+    return ''.join(parts)
+
+
+@contextmanager
+def captured():
+    # sys.stdout goes to the StringIO this gives while the block runs
+    stdout, sys.stdout = sys.stdout, StringIO()
+    try:
+        yield sys.stdout
+    finally:
+        sys.stdout = stdout
+
+
+def execute(text, engine, optimize=(), settings=None):
+    # (seconds engine took to run text, what it printed, the program); the
+    # front end and the passes in optimize run first and are not timed
+    program = main.frontend(text, optimize, None, settings)
+    with captured() as output:
+        start = time.time()
+        main.engines[engine](program)
+        elapsed = time.time() - start
+    return elapsed, output.getvalue(), program
+
+
+def fastest(repeat, measure, *args, **options):
+    # the result of the quickest of repeat calls of measure, which returns
+    # a tuple of the seconds it took and anything else
+    best = None
+    for i in range(repeat):
+        result = measure(*args, **options)
+        if best is None or result[0] < best[0]:
+            best = result
+    return best
+
+
+def spawn(command, runs, cwd=None, before=None):
+    # the sorted seconds of runs of command, its output discarded; before
+    # is called ahead of every run, untimed
+    times = []
+    with open(os.devnull, 'w') as devnull:
+        for i in range(runs):
+            if before is not None:
+                before()
+            start = time.time()
+            if subprocess.call(command, cwd=cwd, stdout=devnull):
+                sys.exit("{0} failed".format(' '.join(command)))
+            times.append(time.time() - start)
+    return sorted(times)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# Microbenchmark for visit.Dispatcher.
+#
+# Times Interpreter.visit dispatch on nodes whose class has its own handler
+# (Integer, Assignment) and on nodes resolved through the MRO (RelExpr ->
+# BinExpr, InstructionList -> List), with handlers that do no work.
+# --table prints the fully resolved dispatch table of every visitor instead.
+
+import argparse
+import time
+
+import common  # puts the repository on sys.path
+from Cparser import AST
+from Cparser.Interpreter import Interpreter
+from Cparser.ClosureCompiler import ClosureCompiler
+from Cparser.Bytecode import BytecodeCompiler
+
+visitors = [(Interpreter, 'visit'), (ClosureCompiler, 'compile'), (BytecodeCompiler, 'compile')]
+
+node_classes = [klass for klass in vars(AST).values() if isinstance(klass, type) and issubclass(klass, AST.Node)]
+
+
+def print_tables():
+    for visitor, name in visitors:
+        print("{0}.{1}:".format(visitor.__name__, name))
+        for typ, owner in vars(visitor)[name].dispatcher.table(node_classes):
+            print("  {0:<24} -> {1}".format(typ.__name__, owner.__name__ if owner else '(default)'))
+
+
+def measure(nodes, repeat):
+    dispatcher = vars(Interpreter)['visit'].dispatcher
+    targets = dict(dispatcher.targets)
+    for typ in targets:
+        dispatcher.add_target(typ, lambda self, node, scope=0: None)
+
+    try:
+        visit = Interpreter().visit
+        start = time.time()
+        for i in xrange(repeat):
+            for node in nodes:
+                visit(node, None)
+        return (time.time() - start) / (repeat * len(nodes))
+    finally:
+        for typ, target in targets.items():
+            dispatcher.add_target(typ, target)
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--repeat', type=int, default=200000)
+    argparser.add_argument('--table', action='store_true', help="print the resolved dispatch tables")
+    args = argparser.parse_args()
+
+    if args.table:
+        print_tables()
+        return
+
+    integer = AST.Integer('1')
+    cases = [
+        ('exact', [integer, AST.Assignment('a', integer)]),
+        ('mro', [AST.RelExpr('<', integer, integer), AST.InstructionList([])]),
+    ]
+    for label, nodes in cases:
+        print("{0:<6} {1:>8.0f} ns/dispatch".format(label, measure(nodes, args.repeat) * 1e9))
+
+
+if __name__ == '__main__':
+    run()
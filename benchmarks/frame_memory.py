@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# Peak memory regression benchmark for frame lifetimes.
+#
+# Runs main.py on the same loop-heavy program with growing iteration counts
+# and reads the peak RSS of every child process. Frames are released when a
+# call returns and blocks allocate nothing, so the peak must stay flat no
+# matter how many iterations run; the script exits with status 1 otherwise.
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT
+
+PROGRAM = """
+int k = 0, s = 0;
+
+int step(int k) {
+    {
+        int t = k * 2;
+        {
+            int u = t + 1;
+            return u;
+        }
+    }
+}
+
+while (k < %d) {
+    int x = step(k);
+    {
+        int y = x %% 7;
+        s = s + y;
+    }
+    k = k + 1;
+}
+print s;
+"""
+
+
+def peak_rss(engine, iterations):
+    fd, path = tempfile.mkstemp(suffix='.in')
+    with os.fdopen(fd, 'w') as source:
+        source.write(PROGRAM % iterations)
+
+    try:
+        with open(os.devnull, 'w') as devnull:
+            child = subprocess.Popen([sys.executable, os.path.join(ROOT, 'main.py'), '--engine', engine, path],
+                                     cwd=ROOT, stdout=devnull)
+            _, status, usage = os.wait4(child.pid, 0)
+    finally:
+        os.remove(path)
+
+    if status:
+        raise Exception("main.py failed for {0} with {1} iterations".format(engine, iterations))
+    return usage.ru_maxrss
+
+
+def main():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--engines', nargs='+', default=['interpreter', 'closure', 'vm'])
+    argparser.add_argument('--iterations', nargs='+', type=int, default=[1000, 10000, 100000])
+    argparser.add_argument('--tolerance', type=int, default=2048,
+                           help="allowed peak growth in KB between the smallest and largest run")
+    args = argparser.parse_args()
+
+    failed = False
+    print("{0:<12} {1:>10} {2:>14}".format('engine', 'iterations', 'peak RSS (KB)'))
+    for engine in args.engines:
+        peaks = []
+        for iterations in args.iterations:
+            peaks.append(peak_rss(engine, iterations))
+            print("{0:<12} {1:>10} {2:>14}".format(engine, iterations, peaks[-1]))
+
+        growth = peaks[-1] - peaks[0]
+        if growth > args.tolerance:
+            print("{0}: peak grew by {1} KB, more than {2} KB".format(engine, growth, args.tolerance))
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# Benchmark for lexing large sources.
+#
+# Generates a source of the given size from the programs in tests/ and lexes
+# it in a fresh process for every way of reading it: into a string, mapped
+# into memory and, for RegexScanner, as a stream read in chunks. Reports the
+# throughput and the peak resident memory of each process, next to that of
+# a process that only imports the scanners.
+
+import argparse
+import mmap
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import tests
+from Cparser.RegexScanner import RegexScanner
+from Cparser.scanner import Scanner
+
+scanners = {'ply': Scanner, 'regex': RegexScanner}
+cases = [
+    ('ply', 'read'),
+    ('ply', 'mmap'),
+    ('regex', 'read'),
+    ('regex', 'mmap'),
+    ('regex', 'stream'),
+]
+
+
+def lex(scanner, mode, path):
+    # the number of tokens in the file at path, which are not kept
+    sourcefile = open(path, 'r')
+    if mode == 'read':
+        text = sourcefile.read()
+    elif mode == 'mmap':
+        text = mmap.mmap(sourcefile.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        text = sourcefile
+
+    scanner = scanners[scanner]()
+    scanner.build()
+    scanner.input(text)
+    count = 0
+    token = scanner.token
+    while token() is not None:
+        count += 1
+    return count
+
+
+def child(scanner, mode, path):
+    start = time.time()
+    count = lex(scanner, mode, path) if mode != 'none' else 0
+    elapsed = time.time() - start
+    print("{0} {1} {2}".format(elapsed, count, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def generate(path, size):
+    chunk = '\n'.join(tests())
+    with open(path, 'w') as output:
+        for i in range(int(size * 1024 * 1024 / len(chunk) + 1)):
+            output.write(chunk)
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--size', type=float, default=8, help="megabytes of source (default: 8)")
+    argparser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = argparser.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    handle, path = tempfile.mkstemp(suffix='.in')
+    os.close(handle)
+    try:
+        generate(path, args.size)
+        megabytes = os.path.getsize(path) / 1024.0 / 1024.0
+        print("{0:.1f} MB of source".format(megabytes))
+        print("{0:<14} {1:<8} {2:>9} {3:>10} {4:>8} {5:>14}".format(
+            'scanner', 'source', 'time (s)', 'tokens', 'MB/s', 'peak RSS (MB)'))
+        counts = set()
+        for scanner, mode in [('ply', 'none')] + cases:
+            output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child',
+                                              scanner, mode, path])
+            elapsed, count, rss = output.split()
+            elapsed, count, rss = float(elapsed), int(count), int(rss) / 1024.0
+            if mode == 'none':
+                print("{0:<14} {1:<8} {2:>9} {3:>10} {4:>8} {5:>14.1f}".format('imports only', '', '', '', '', rss))
+                continue
+            counts.add(count)
+            print("{0:<14} {1:<8} {2:>9.3f} {3:>10} {4:>8.2f} {5:>14.1f}".format(
+                scanner, mode, elapsed, count, megabytes / elapsed, rss))
+        if len(counts) != 1:
+            sys.exit("the scanners made different numbers of tokens")
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# Benchmark for loop-invariant code motion.
+#
+# Runs nested while loops whose inner body recomputes expressions of
+# variables the loops never assign, on each engine with and without
+# `-O licm`, and reports the execution time of both (parsing, checking and
+# the pass itself are not timed).
+
+import argparse
+import sys
+
+from common import execute, fastest, main
+
+PROGRAM = """
+int n = %d, width = 7, height = 3, total = 0, i = 0, j = 0;
+
+while (i < n) {
+    j = 0;
+    while (j < n) {
+        total = total + (width * height + n) %% 97 + j * (width - height);
+        j = j + 1;
+    }
+    i = i + 1;
+}
+print total;
+"""
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--engines', nargs='+', default=sorted(main.engines))
+    argparser.add_argument('-n', type=int, default=200, help="iterations of each loop (default: 200)")
+    argparser.add_argument('--repeat', type=int, default=3)
+    args = argparser.parse_args()
+
+    print("{0:<12} {1:>10} {2:>10} {3:>8}".format('engine', 'plain (s)', 'licm (s)', 'speedup'))
+    for engine in args.engines:
+        plain, expected, program = fastest(args.repeat, execute, PROGRAM % args.n, engine)
+        hoisted, output, program = fastest(args.repeat, execute, PROGRAM % args.n, engine, ['licm'])
+        if output != expected:
+            sys.exit("{0}: output differs with -O licm".format(engine))
+        print("{0:<12} {1:>10.3f} {2:>10.3f} {3:>7.2f}x".format(engine, plain, hoisted, plain / hoisted))
+
+
+if __name__ == '__main__':
+    run()
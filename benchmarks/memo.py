@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+# Benchmark for memoization of pure functions.
+#
+# Runs a doubly recursive function on each engine with and without
+# `-O memo` and reports the execution time of both (parsing, checking and
+# the pass itself are not timed), along with the cache statistics.
+
+import argparse
+import sys
+
+from common import execute, fastest, main
+
+PROGRAM = """
+int fib(int n) {
+    if (n < 2)
+        return n;
+    return fib(n - 1) + fib(n - 2);
+}
+
+print fib(%d);
+"""
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--engines', nargs='+', default=sorted(main.engines))
+    argparser.add_argument('-n', type=int, default=22, help="argument of fib (default: 22)")
+    argparser.add_argument('--memo-size', type=int, default=1024)
+    argparser.add_argument('--repeat', type=int, default=3)
+    args = argparser.parse_args()
+
+    print("{0:<12} {1:>10} {2:>10} {3:>8}".format('engine', 'plain (s)', 'memo (s)', 'speedup'))
+    for engine in args.engines:
+        settings = {'memo': {'size': args.memo_size}}
+        plain, expected, program = fastest(args.repeat, execute, PROGRAM % args.n, engine, [], settings)
+        cached, output, program = fastest(args.repeat, execute, PROGRAM % args.n, engine, ['memo'], settings)
+        memo = program.fundefs.elements[0].memo
+        if output != expected:
+            sys.exit("{0}: output differs with -O memo".format(engine))
+        print("{0:<12} {1:>10.3f} {2:>10.3f} {3:>7.2f}x   {4}".format(engine, plain, cached, plain / cached, memo.stats()))
+
+
+if __name__ == '__main__':
+    run()
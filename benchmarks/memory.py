@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# Memory benchmark for program trees.
+#
+# Parses and checks a generated program of many small functions, then
+# counts the bytes held by its tree (with sys.getsizeof, every object
+# once) in three forms: node objects with a __dict__, as the classes of
+# AST were before they had __slots__; the node objects of AST; and the
+# arrays of a CompactTree. Also times compacting and expanding the tree
+# and printing it through the views.
+
+import argparse
+import sys
+import time
+import types
+
+from common import main, synthetic
+from Cparser import AST
+from Cparser.CompactAST import CompactTree
+
+FUNCTION = """
+int f{0}(int n) {{
+    int i = 0, total = {0};
+    while (i < n) {{
+        if (i % 2 == 0) total = total + i * 3 - (n + 1) / 2;
+        else total = total - 1;
+        i = i + 1;
+    }}
+    print "f{0}";
+    return total;
+}}
+"""
+
+opaque = (type, types.FunctionType, types.BuiltinFunctionType, types.ModuleType)
+
+
+def with_dict(node, classes={}):
+    # a copy of the tree in classes without __slots__
+    if isinstance(node, list):
+        return [with_dict(element) for element in node]
+    if not isinstance(node, AST.Node):
+        return node
+    cls = node.__class__
+    if cls not in classes:
+        classes[cls] = type(cls.__name__, (object,), {})
+    copy = classes[cls]()
+    for name in AST.fields(cls):
+        if hasattr(node, name):
+            setattr(copy, name, with_dict(getattr(node, name)))
+    return copy
+
+
+def size(root):
+    # bytes of root and of everything it refers to, each object once
+    seen = set()
+    total = 0
+    stack = [root]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, opaque):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, AST.Node):
+            stack.extend(getattr(obj, name) for name in AST.fields(obj.__class__) if hasattr(obj, name))
+        elif isinstance(obj, (list, tuple)):
+            stack.extend(obj)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return total
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--functions', type=int, default=2000)
+    args = argparser.parse_args()
+    sys.setrecursionlimit(10000)
+
+    text = synthetic(args.functions, function=FUNCTION)
+    program = main.check(text, 'regex')
+    start = time.time()
+    tree = CompactTree(program)
+    compacting = time.time() - start
+    # before the views made by printing are kept in the tree
+    compact_size = size(tree)
+    start = time.time()
+    expanded = tree.expand()
+    expanding = time.time() - start
+    start = time.time()
+    printed = str(tree.view())
+    printing = time.time() - start
+    if printed != str(program) or str(expanded) != printed:
+        sys.exit("the compact tree differs from the program")
+
+    print("{0} nodes, {1} bytes of source".format(len(tree), len(text)))
+    print("{0:<22} {1:>12} {2:>10}".format('form', 'bytes', 'per node'))
+    forms = [
+        ('objects with __dict__', size(with_dict(program))),
+        ('objects with __slots__', size(program)),
+        ('compact arrays', compact_size),
+    ]
+    for name, total in forms:
+        print("{0:<22} {1:>12} {2:>10.1f}".format(name, total, total / float(len(tree))))
+    print("compact {0:.2f} s, expand {1:.2f} s, print through views {2:.2f} s".format(
+        compacting, expanding, printing))
+
+
+if __name__ == '__main__':
+    run()
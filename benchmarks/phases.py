@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# Phase benchmark suite.
+#
+#   phases.py run [-o results.json]     times every workload
+#   phases.py compare BASELINE CURRENT  flags phases that got slower
+#
+# The workloads are programs of tests/ scaled up (fib.in with a larger
+# max, primes.in to a larger bound, scopes.in nested deeply, loops.in
+# looping longer) and a synthetic source of many functions. Each is run
+# --repeat times in this process by acceptance_test.run_program, which
+# times lexing, parsing, TypeChecker, the passes and execution apart.
+
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import common
+from common import main, test
+import acceptance_test
+from acceptance_test import PHASES
+
+
+def replace(text, *pairs):
+    for old, new in pairs:
+        if old not in text:
+            raise ValueError("{0!r} is not in the program".format(old))
+        text = text.replace(old, new)
+    return text
+
+
+def fib(scale):
+    return replace(test('fib'), ('int max = 15;', 'int max = {0};'.format(int(round(18 + math.log(scale, 2))))))
+
+
+def primes(scale):
+    bound = int(2000 * scale)
+    return replace(test('primes'), ('primes(100)', 'primes({0})'.format(bound)),
+                   ('up to 100...', 'up to {0}...'.format(bound)))
+
+
+def scopes(scale):
+    depth = int(200 * scale)
+    lines = ["int d = 0;", "d = 1;", "print d;"]
+    for level in range(depth):
+        lines.append("{ int d = 0; d = " + str(level + 2) + "; print d;")
+    lines.append("}" * depth)
+    lines.append("print d;")
+    return '\n'.join(lines) + '\n'
+
+
+def loops(scale):
+    count = int(20000 * scale)
+    return replace(test('loops'), ('a < 100', 'a < {0}'.format(count)), ('a==15', 'a=={0}'.format(count // 2)),
+                   ('a>100', 'a>{0}'.format(count)))
+
+
+def synthetic(scale):
+    return common.synthetic(int(300 * scale), 2)
+
+
+workloads = [
+    ('fib', fib),
+    ('primes', primes),
+    ('scopes', scopes),
+    ('loops', loops),
+    ('synthetic', synthetic),
+]
+
+
+def statistics(samples):
+    ordered = sorted(samples)
+    middle = len(ordered) // 2
+    median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+    mean = sum(samples) / len(samples)
+    deviation = math.sqrt(sum((sample - mean) ** 2 for sample in samples) / len(samples))
+    return {'min': ordered[0], 'median': median, 'mean': mean, 'stdev': deviation}
+
+
+def measure(args):
+    scratch = tempfile.mkdtemp()
+    results = {}
+    try:
+        for name, make in workloads:
+            if args.workloads and name not in args.workloads:
+                continue
+            path = os.path.join(scratch, name + '.in')
+            with open(path, 'w') as source:
+                source.write(make(args.scale))
+
+            samples = dict((phase, []) for phase in PHASES)
+            for i in range(args.repeat):
+                output, times, error = acceptance_test.run_program(path, args.engine, args.scanner)
+                if error is not None:
+                    sys.exit("{0}:\n{1}".format(name, error))
+                for phase, elapsed in zip(PHASES, times):
+                    samples[phase].append(elapsed)
+
+            results[name] = {'bytes': os.path.getsize(path),
+                             'phases': dict((phase, statistics(samples[phase])) for phase in PHASES)}
+            sys.stderr.write("{0:<10} {1}\n".format(name, ' '.join(
+                "{0} {1:.1f} ms".format(phase, results[name]['phases'][phase]['median'] * 1000)
+                for phase in PHASES)))
+    finally:
+        shutil.rmtree(scratch)
+    return results
+
+
+def run(args):
+    sys.setrecursionlimit(10000)
+    results = {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'engine': args.engine,
+        'scanner': args.scanner,
+        'scale': args.scale,
+        'repeat': args.repeat,
+        'workloads': measure(args),
+    }
+    with open(args.output, 'w') as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    sys.stderr.write("results written to {0}\n".format(args.output))
+
+
+def compare(args):
+    with open(args.baseline) as stored:
+        baseline = json.load(stored)
+    with open(args.current) as stored:
+        current = json.load(stored)
+    for key in ('engine', 'scanner', 'scale'):
+        if baseline.get(key) != current.get(key):
+            print("warning: {0} differs: {1} in the baseline, {2} now".format(key, baseline.get(key), current.get(key)))
+
+    regressions = 0
+    print("{0:<10} {1:<10} {2:>13} {3:>13} {4:>7}".format('workload', 'phase', 'baseline (ms)', 'current (ms)', 'ratio'))
+    for name in sorted(set(baseline['workloads']) & set(current['workloads'])):
+        for phase in PHASES:
+            before = baseline['workloads'][name]['phases'][phase]['median']
+            after = current['workloads'][name]['phases'][phase]['median']
+            ratio = after / before if before else float('inf') if after else 1.0
+            # phases of a millisecond or so are within noise
+            slower = ratio > 1 + args.threshold and after - before > args.min_delta / 1000.0
+            faster = ratio < 1 - args.threshold and before - after > args.min_delta / 1000.0
+            regressions += slower
+            print("{0:<10} {1:<10} {2:>13.2f} {3:>13.2f} {4:>6.2f}x {5}".format(
+                name, phase, before * 1000, after * 1000, ratio,
+                'REGRESSION' if slower else 'faster' if faster else ''))
+    print("{0} regression(s) over {1:.0%}".format(regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    commands = argparser.add_subparsers(dest='command')
+    running = commands.add_parser('run', help="time the workloads and save the results")
+    running.add_argument('-o', '--output', default='phases.json')
+    running.add_argument('--repeat', type=int, default=5)
+    running.add_argument('--scale', type=float, default=1.0, help="size of the workloads (default: 1)")
+    running.add_argument('--engine', choices=sorted(main.engines), default='interpreter')
+    running.add_argument('--scanner', choices=sorted(main.scanners), default='ply')
+    running.add_argument('workloads', nargs='*', help="workloads to run (default: all)")
+    comparing = commands.add_parser('compare', help="compare results with a baseline")
+    comparing.add_argument('baseline')
+    comparing.add_argument('current')
+    comparing.add_argument('--threshold', type=float, default=0.10,
+                           help="slowdown of a median that counts as a regression (default: 0.10)")
+    comparing.add_argument('--min-delta', type=float, default=1.0, metavar='MS',
+                           help="smallest slowdown in milliseconds that counts (default: 1)")
+    args = argparser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
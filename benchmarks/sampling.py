@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# Benchmark for the sampling profiler.
+#
+# Runs tests/primes.in scaled up to a larger bound on the interpreter, in
+# turns without and with a Sampler reading its stack (main.py --sample),
+# and reports the execution time of both, the overhead of sampling and
+# the number of samples taken (parsing and checking are not timed).
+
+import argparse
+import sys
+import time
+
+from common import captured, main, test
+from Cparser.Sampler import Sampler
+
+
+def program(bound):
+    return test('primes').replace('primes(100)', 'primes({0})'.format(bound))
+
+
+def measure(text, engine, interval):
+    result = main.frontend(text)
+    sampler = Sampler(interval) if interval else None
+    with captured() as output:
+        start = time.time()
+        if sampler is not None:
+            sampler.start()
+        main.engines[engine](result)
+        if sampler is not None:
+            sampler.stop()
+        elapsed = time.time() - start
+    return elapsed, output.getvalue(), sampler.samples if sampler is not None else 0
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('-n', type=int, default=2000, help="bound of primes() (default: 2000)")
+    argparser.add_argument('--interval', type=float, default=5.0, metavar='MS',
+                           help="time between two samples (default: 5)")
+    argparser.add_argument('--engine', choices=('interpreter', 'typed'), default='interpreter')
+    argparser.add_argument('--repeat', type=int, default=3)
+    args = argparser.parse_args()
+
+    text = program(args.n)
+    plain = sampled = None
+    for i in range(args.repeat):
+        # alternated, so that drifts of the machine hit both alike
+        elapsed, expected, samples = measure(text, args.engine, None)
+        plain = elapsed if plain is None else min(plain, elapsed)
+        elapsed, output, samples = measure(text, args.engine, args.interval / 1000.0)
+        sampled = elapsed if sampled is None else min(sampled, elapsed)
+        if output != expected:
+            sys.exit("output differs with sampling")
+    print("{0:>10} {1:>12} {2:>9} {3:>8}".format('plain (s)', 'sampled (s)', 'overhead', 'samples'))
+    print("{0:>10.3f} {1:>12.3f} {2:>8.1%} {3:>8}".format(plain, sampled, sampled / plain - 1, samples))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# Benchmark for the scanners.
+#
+# Checks that RegexScanner produces the same tokens as the ply Scanner (type,
+# value, line and position) for every program in tests/, then times both on
+# a generated source of several megabytes made of those programs and of
+# comments, strings and CRLF line ends, and reports their throughput.
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+from common import ROOT
+from Cparser.RegexScanner import RegexScanner
+from Cparser.scanner import Scanner
+
+EXTRA = """
+/* a block comment
+   over three lines */
+string s = "quoted \\"text\\"";   # a line comment\r
+float f = .5 + 1. * 2.25;\r
+int i = 1 << 2 >> 1 || 3 && 4 == 5 != 6 <= 7 >= 8;\r
+"""
+
+
+def tokens(scanner, text):
+    scanner.build()
+    scanner.input(text)
+    result = []
+    token = scanner.token()
+    while token is not None:
+        result.append((token.type, token.value, token.lineno, token.lexpos))
+        token = scanner.token()
+    return result
+
+
+def measure(scanner, text, repeat):
+    best = None
+    for i in range(repeat):
+        start = time.time()
+        count = len(tokens(scanner(), text))
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, count
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--size', type=float, default=4, help="megabytes of source (default: 4)")
+    argparser.add_argument('--repeat', type=int, default=3)
+    args = argparser.parse_args()
+
+    sources = []
+    for path in sorted(glob.glob(os.path.join(ROOT, 'tests', '*.in'))):
+        with open(path) as source:
+            text = source.read()
+        if tokens(Scanner(), text) != tokens(RegexScanner(), text):
+            sys.exit("{0}: tokens differ".format(os.path.relpath(path, ROOT)))
+        sources.append(text)
+
+    chunk = '\n'.join(sources) + EXTRA
+    text = chunk * int(args.size * 1024 * 1024 / len(chunk) + 1)
+    if tokens(Scanner(), text) != tokens(RegexScanner(), text):
+        sys.exit("generated source: tokens differ")
+
+    megabytes = len(text) / 1024.0 / 1024.0
+    print("{0:.1f} MB of source, same tokens from both scanners".format(megabytes))
+    print("{0:<14} {1:>9} {2:>10} {3:>8}".format('scanner', 'time (s)', 'tokens', 'MB/s'))
+    for name, scanner in (('ply', Scanner), ('regex', RegexScanner)):
+        elapsed, count = measure(scanner, text, args.repeat)
+        print("{0:<14} {1:>9.3f} {2:>10} {3:>8.2f}".format(name, elapsed, count, megabytes / elapsed))
+
+
+if __name__ == '__main__':
+    run()
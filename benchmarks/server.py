@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# Benchmark for server.py.
+#
+# Runs a hello-world program many times: by spawning main.py, by spawning
+# client.py against a running server, and by sending requests to the server
+# from this process over connections kept open, one at a time and from
+# several threads at once. Reports requests per second for each.
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import ROOT, spawn
+import client
+
+HELLO = 'print "hello, world";\n'
+
+
+def throughput(command, runs):
+    # runs of command per second
+    return runs / sum(spawn(command, runs))
+
+
+def requests(path, runs):
+    connection = client.connect(path)
+    try:
+        for i in range(runs):
+            answer = client.request(connection, HELLO)
+            if answer['stdout'] != "hello, world\n":
+                sys.exit("unexpected answer: {0!r}".format(answer))
+    finally:
+        connection.close()
+
+
+def wait_for(path, server):
+    for i in range(200):
+        if server.poll() is not None:
+            sys.exit("server.py exited")
+        try:
+            client.connect(path).close()
+            return
+        except Exception:
+            time.sleep(0.05)
+    sys.exit("server.py did not start")
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--spawns', type=int, default=20)
+    argparser.add_argument('--requests', type=int, default=2000)
+    argparser.add_argument('--threads', type=int, default=4)
+    args = argparser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    path = os.path.join(scratch, 'server.sock')
+    program = os.path.join(scratch, 'hello.in')
+    with open(program, 'w') as source:
+        source.write(HELLO)
+
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'server.py'), path,
+                               '--workers', str(args.threads)])
+    try:
+        wait_for(path, server)
+        results = [
+            ('spawn main.py', throughput([sys.executable, os.path.join(ROOT, 'main.py'), program, '--no-cache'],
+                                         args.spawns)),
+            ('spawn client.py', throughput([sys.executable, os.path.join(ROOT, 'client.py'), path, program],
+                                           args.spawns)),
+        ]
+
+        start = time.time()
+        requests(path, args.requests)
+        results.append(('1 connection', args.requests / (time.time() - start)))
+
+        each = args.requests // args.threads
+        threads = [threading.Thread(target=requests, args=(path, each)) for i in range(args.threads)]
+        start = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results.append(('{0} connections'.format(args.threads), each * args.threads / (time.time() - start)))
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+        shutil.rmtree(scratch)
+
+    print("{0:<18} {1:>10} {2:>8}".format('', 'requests/s', 'speedup'))
+    for name, rate in results:
+        print("{0:<18} {1:>10.1f} {2:>7.1f}x".format(name, rate, rate / results[0][1]))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# Cold-start benchmark for main.py.
+#
+# Times whole processes running main.py on a one-line program: from the
+# repository and from another working directory, both loading the prebuilt
+# lexer and parser tables, and from a copy of the sources whose tables are
+# generated again on every run, against a bare `python -c pass`.
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from common import ROOT, spawn
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('--runs', type=int, default=20)
+    args = argparser.parse_args()
+
+    scratch = tempfile.mkdtemp()
+    try:
+        program = os.path.join(scratch, 'trivial.in')
+        with open(program, 'w') as source:
+            source.write("print 1;\n")
+
+        copy = os.path.join(scratch, 'copy')
+        os.mkdir(copy)
+        shutil.copy(os.path.join(ROOT, 'main.py'), copy)
+        shutil.copytree(os.path.join(ROOT, 'Cparser'), os.path.join(copy, 'Cparser'),
+                        ignore=shutil.ignore_patterns('*.pyc'))
+        signature = os.path.join(copy, 'Cparser', 'grammar.sig')
+
+        def stale():
+            if os.path.exists(signature):
+                os.remove(signature)
+
+        main = [sys.executable, os.path.join(ROOT, 'main.py'), program]
+        cases = [
+            ('python -c pass', [sys.executable, '-c', 'pass'], ROOT, None),
+            ('prebuilt tables', main, ROOT, None),
+            ('prebuilt, other cwd', main, scratch, None),
+            ('regenerated tables', [sys.executable, os.path.join(copy, 'main.py'), program], copy, stale),
+        ]
+
+        print("{0:<22} {1:>9} {2:>11}".format('', 'min (ms)', 'median (ms)'))
+        for name, command, cwd, before in cases:
+            times = spawn(command, args.runs, cwd, before)
+            best, median = times[0], times[len(times) // 2]
+            print("{0:<22} {1:>9.1f} {2:>11.1f}".format(name, best * 1000, median * 1000))
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+# Benchmark for type-specialized operations.
+#
+# Runs an arithmetic-heavy loop on the interpreter, once evaluating every
+# operation through `optype` and once in the typed mode (--engine typed),
+# which binds a function to each expression from the operand types
+# TypeChecker recorded, and reports the execution time of both (parsing
+# and checking are not timed).
+
+import argparse
+import sys
+
+from common import execute, fastest
+
+PROGRAM = """
+int i = 0, total = 0;
+float x = 0.5, acc = 0.0;
+
+while (i < %d) {
+    total = (total + i * 3 - i / 7) %% 100003;
+    acc = acc + x * i - i / 2;
+    if (i %% 3 == 0 && total > 100)
+        total = total - 1;
+    i = i + 1;
+}
+print total;
+print acc;
+"""
+
+
+def run():
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('-n', type=int, default=20000, help="iterations of the loop (default: 20000)")
+    argparser.add_argument('--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    generic, expected, program = fastest(args.repeat, execute, PROGRAM % args.n, 'interpreter')
+    typed, output, program = fastest(args.repeat, execute, PROGRAM % args.n, 'typed')
+    if output != expected:
+        sys.exit("output differs with --engine typed")
+    print("{0:>12} {1:>10} {2:>8}".format('generic (s)', 'typed (s)', 'speedup'))
+    print("{0:>12.3f} {1:>10.3f} {2:>7.2f}x".format(generic, typed, generic / typed))
+
+
+if __name__ == '__main__':
+    run()
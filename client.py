@@ -0,0 +1,105 @@
+import argparse
+import json
+import socket
+import struct
+import sys
+
+# Thin client of server.py: sends a program to a running server and prints
+# what running it printed, without importing the compiler itself.
+#
+# Messages on the socket are JSON objects, each sent as its length in four
+# bytes (network order) followed by its text. A request holds the source
+# and the options of main.py; the answer holds stdout, stderr, the exit
+# status and the time spent in the front end and in the engine. JSON holds
+# text, so the source goes as what it decodes to along with the encoding
+# that gives its bytes back: UTF-8, or Latin-1 for anything that is not.
+# The output comes back decoded the same way.
+
+HEADER = struct.Struct('!I')
+
+
+def send(connection, message):
+    data = json.dumps(message)
+    connection.sendall(HEADER.pack(len(data)) + data)
+
+
+def receive_exactly(connection, size):
+    parts = []
+    while size:
+        part = connection.recv(min(size, 1 << 16))
+        if not part:
+            return None
+        parts.append(part)
+        size -= len(part)
+    return ''.join(parts)
+
+
+def receive(connection):
+    # the next message, or None once the other side has closed
+    header = receive_exactly(connection, HEADER.size)
+    if header is None:
+        return None
+    data = receive_exactly(connection, HEADER.unpack(header)[0])
+    if data is None:
+        return None
+    return json.loads(data)
+
+
+def connect(path):
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    connection.connect(path)
+    return connection
+
+
+def decode(source):
+    # (text, encoding) of the bytes source
+    try:
+        return source.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        return source.decode('latin-1'), 'latin-1'
+
+
+def request(connection, source, **options):
+    if isinstance(source, str):
+        source, options['encoding'] = decode(source)
+    options['source'] = source
+    send(connection, options)
+    return receive(connection)
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('socket', help="path of the socket server.py listens on")
+    argparser.add_argument('filename', help="program to run, or - for the standard input")
+    argparser.add_argument('--engine', default='interpreter')
+    argparser.add_argument('--scanner', default='ply')
+    argparser.add_argument('--max-depth', type=int, metavar='CALLS')
+    argparser.add_argument('-O', '--optimize', action='append', default=[])
+    argparser.add_argument('--report', action='store_true')
+    argparser.add_argument('--timing', action='store_true',
+                           help="print the time the server spent to stderr")
+    args = argparser.parse_args()
+
+    try:
+        sourcefile = sys.stdin if args.filename == '-' else open(args.filename, "rb")
+    except IOError:
+        print("Cannot open {0} file".format(args.filename))
+        sys.exit(0)
+
+    try:
+        connection = connect(args.socket)
+    except socket.error as e:
+        sys.exit("cannot connect to {0}: {1}".format(args.socket, e))
+    source, encoding = decode(sourcefile.read())
+    answer = request(connection, source, encoding=encoding, engine=args.engine, scanner=args.scanner,
+                     max_depth=args.max_depth, optimize=args.optimize, report=args.report)
+    connection.close()
+    if answer is None:
+        sys.exit("the server closed the connection")
+
+    sys.stdout.write(answer['stdout'].encode(encoding))
+    sys.stderr.write(answer['stderr'].encode(encoding))
+    if args.timing:
+        sys.stderr.write("front end {0:.2f} ms, run {1:.2f} ms\n".format(
+            answer['timing']['frontend'] * 1000, answer['timing']['run'] * 1000))
+    sys.exit(answer['status'])
@@ -1,31 +1,377 @@
 import sys
-import ply.yacc as yacc
-import Cparser.TreePrinter
-from Cparser.Cparser import Cparser
-from Cparser.TypeChecker import TypeChecker
-from Cparser.Interpreter import Interpreter
+import argparse
+import importlib
+import mmap
+from Cparser.Exceptions import CallDepthException, CompileError
 import os
 
+# Modules past the parser are imported only when a run needs them: many runs
+# are short, and importing everything takes longer than running them.
+
+# optional AST passes, run in this order between type checking and resolution
+optimizers = [
+    ('inline', 'Cparser.Inliner', 'Inliner'),
+    ('fold', 'Cparser.ConstantFolder', 'ConstantFolder'),
+    ('dce', 'Cparser.DeadCodeEliminator', 'DeadCodeEliminator'),
+    ('licm', 'Cparser.LoopInvariantMover', 'LoopInvariantMover'),
+    ('memo', 'Cparser.Memoizer', 'Memoizer'),
+]
+
+
+# lexers for the same tokens, by name: module and class
+scanners = {
+    'ply': ('Cparser.scanner', 'Scanner'),
+    'regex': ('Cparser.RegexScanner', 'RegexScanner'),
+}
+
+
+def build_parser(scanner):
+    # a Cparser lexing with scanner, and the ply parser running its rules;
+    # both can parse one program after another
+    from Cparser.Cparser import Cparser
+    from Cparser import tables
+
+    module, scanner = scanners[scanner]
+    c_parser = Cparser(getattr(importlib.import_module(module), scanner)())
+    return c_parser, tables.parser(c_parser)
+
+
+def reported(c_parser):
+    # the errors c_parser and its scanner have printed, in all sources
+    return c_parser.errors + c_parser.scanner.errors
+
+
+def typecheck(result, c_parser, before):
+    # result, which c_parser parsed once `before` errors had been reported,
+    # checked by TypeChecker; CompileError if either printed errors
+    from Cparser.TypeChecker import TypeChecker
+
+    if result is None or reported(c_parser) != before:
+        raise CompileError("syntax errors")
+    typeChecker = TypeChecker()
+    typeChecker.visit(result, None)  # or alternatively ast.accept(typeChecker)
+    if typeChecker.errors:
+        raise CompileError("{0} semantic error(s)".format(typeChecker.errors))
+    return result
+
+
+def check(text, scanner, parser=None):
+    # the tree of the program, checked by TypeChecker
+    c_parser, parser = parser or build_parser(scanner)
+    if not isinstance(text, (basestring, mmap.mmap)) and not getattr(c_parser.scanner, 'streams', False):
+        text = text.read()
+    before = reported(c_parser)
+    result = parser.parse(text, lexer=c_parser.scanner)
+    return typecheck(result, c_parser, before)
+
+
+def cached_check(text, scanner, cache, parser=None):
+    # check() through cache, which keeps what it prints as well; a stream
+    # is not cached, as it would have to be read whole first
+    if cache is None or not isinstance(text, (basestring, mmap.mmap)):
+        return check(text, scanner, parser)
+
+    from Cparser.Cache import Recorder
+    key = cache.key(text)
+    entry = cache.load(key)
+    if entry is not None:
+        result, diagnostics = entry
+        sys.stdout.write(diagnostics)
+        return result
+
+    recorder = sys.stdout = Recorder(sys.stdout)
+    try:
+        result = check(text, scanner, parser)
+    finally:
+        sys.stdout = recorder.stream
+    if result is not None:
+        cache.store(key, result, recorder.text())
+    return result
+
+
+def transform(result, optimize=(), report=None, settings=None):
+    # the optimization passes in optimize, then Resolver, on a checked tree
+    from Cparser.Resolver import Resolver
+
+    for name, module, optimizer in optimizers:
+        if name in optimize:
+            optimizer = getattr(importlib.import_module(module), optimizer)
+            optimizer = optimizer(**(settings or {}).get(name, {}))
+            result = optimizer.visit(result, None)
+            if report is not None:
+                report.extend((name, lineno, message) for lineno, message in optimizer.changes)
+    Resolver().visit(result, None)
+    return result
+
+
+class Replay(object):
+    # hands the parser the tokens lexed beforehand
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+
+    def token(self):
+        if self.position == len(self.tokens):
+            return None
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+
+def traced_frontend(tracer, source, optimize=(), report=None, settings=None, scanner='ply'):
+    # frontend() without the cache, with a span of every phase in tracer;
+    # the program is read and lexed whole before it is parsed, so that each
+    # is timed apart
+    with tracer.span('read') as args:
+        text = source[:] if isinstance(source, (basestring, mmap.mmap)) else source.read()
+        args['bytes'] = len(text)
+    with tracer.span('build parser', scanner=scanner):
+        c_parser, parser = build_parser(scanner)
+    with tracer.span('scan') as args:
+        before = reported(c_parser)
+        c_parser.scanner.input(text)
+        tokens = list(iter(c_parser.scanner.token, None))
+        args['tokens'] = len(tokens)
+    with tracer.span('parse'):
+        result = parser.parse(lexer=Replay(tokens))
+    with tracer.span('typecheck'):
+        typecheck(result, c_parser, before)
+    with tracer.span('passes', optimize=list(optimize)):
+        return transform(result, optimize, report, settings)
+
+
+def frontend(text, optimize=(), report=None, settings=None, scanner='ply', cache=None, parser=None):
+    result = cached_check(text, scanner, cache, parser)
+    return transform(result, optimize, report, settings)
+
+
+# how far deep() lets a function recurse: the front end and the bytecode
+# compiler take a few frames per level of nesting of the program, of less
+# than a kilobyte each, so the stack engine and the vm run programs nested
+# tens of thousands of levels deep
+DEEP_STACK = 512 << 20
+DEEP_RECURSION = 200000
+
+
+def deep(function, *args, **options):
+    # function(*args, **options) on a thread of DEEP_STACK bytes of stack,
+    # with the recursion limit raised to DEEP_RECURSION meanwhile
+    import threading
+
+    outcome = []
+
+    def run():
+        try:
+            outcome.append((True, function(*args, **options)))
+        except BaseException:
+            outcome.append((False, sys.exc_info()))
+
+    size = threading.stack_size(DEEP_STACK)
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(DEEP_RECURSION)
+    try:
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+    finally:
+        threading.stack_size(size)
+        sys.setrecursionlimit(limit)
+    done, value = outcome[0]
+    if not done:
+        raise value[0], value[1], value[2]
+    return value
+
+
+def open_source(filename):
+    # '-' is the standard input, lexed as it is read; a file is mapped into
+    # memory instead of read into a string, unless it cannot be mapped
+    if filename == '-':
+        return sys.stdin
+    sourcefile = open(filename, "r")
+    if os.fstat(sourcefile.fileno()).st_size == 0:
+        # empty, or a pipe
+        return sourcefile
+    try:
+        return mmap.mmap(sourcefile.fileno(), 0, access=mmap.ACCESS_READ)
+    except (mmap.error, ValueError):
+        return sourcefile
+
+
+def run_interpreter(program, profile=None, tracer=None, specialize=False):
+    from Cparser.Interpreter import Interpreter
+    if profile is not None:
+        from Cparser.Profiler import ProfilingInterpreter
+        program.accept(ProfilingInterpreter(profile, specialize))
+    elif tracer is not None:
+        from Cparser.Trace import TracingInterpreter
+        program.accept(TracingInterpreter(tracer, specialize))
+    else:
+        program.accept(Interpreter(specialize))
+
+
+def run_typed(program, **options):
+    run_interpreter(program, specialize=True, **options)
+
+
+def run_stack(program, max_depth=None):
+    from Cparser.StackInterpreter import StackInterpreter
+    StackInterpreter(max_depth).run(program)
+
+
+def run_closures(program):
+    from Cparser.ClosureCompiler import ClosureCompiler
+    ClosureCompiler().run(program)
+
+
+def run_vm(program):
+    # program.code, if it was compiled beforehand
+    from Cparser.Bytecode import BytecodeCompiler
+    from Cparser.VirtualMachine import VirtualMachine
+    code = getattr(program, 'code', None)
+    VirtualMachine().run(code if code is not None else BytecodeCompiler().compile_program(program))
+
+
+engines = {
+    'interpreter': run_interpreter,
+    'typed': run_typed,
+    'stack': run_stack,
+    'closure': run_closures,
+    'vm': run_vm,
+}
+
+
+def execute(program, engine, max_depth=None, profile=None, tracer=None):
+    # runs program on engine and returns the exit status; profile, a
+    # Cparser.Profiler.Profile, is filled in by the interpreter engines, and
+    # they give tracer, a Cparser.Trace.Tracer, a span of every top-level call
+    options = {'max_depth': max_depth} if engine == 'stack' else {}
+    if profile is not None:
+        options['profile'] = profile
+    if tracer is not None and engine in ('interpreter', 'typed'):
+        options['tracer'] = tracer
+    try:
+        engines[engine](program, **options)
+    except CallDepthException as e:
+        sys.stderr.write("error: {0}\n".format(e))
+        return 1
+    finally:
+        for function in program.fundefs.elements:
+            if getattr(function, 'memo', None) is not None:
+                sys.stderr.write(function.memo.stats() + "\n")
+    return 0
+
 
 if __name__ == '__main__':
     os.sys.setrecursionlimit(5000)
-    filename = sys.argv[1] if len(sys.argv) > 1 else "example.txt"
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('filename', nargs='?', default="example.txt",
+                           help="program to run, or - for the standard input")
+    argparser.add_argument('--engine', choices=sorted(engines), default='interpreter',
+                           help="execution engine (default: interpreter)")
+    argparser.add_argument('--max-depth', type=int, metavar='CALLS',
+                           help="largest number of active calls under --engine stack (default: no limit)")
+    argparser.add_argument('--scanner', choices=sorted(scanners), default='ply',
+                           help="lexer to tokenize the source with (default: ply)")
+    argparser.add_argument('--disassemble', action='store_true',
+                           help="print the compiled bytecode of every function instead of running")
+    argparser.add_argument('-O', '--optimize', action='append', default=[],
+                           choices=[name for name, module, optimizer in optimizers],
+                           help="enable an optimization pass (may be repeated)")
+    argparser.add_argument('--inline-size', type=int, default=40, metavar='NODES',
+                           help="largest function body, in AST nodes, that -O inline copies (default: 40)")
+    argparser.add_argument('--memo-size', type=int, default=1024, metavar='ENTRIES',
+                           help="results each function keeps under -O memo (default: 1024)")
+    argparser.add_argument('--report', action='store_true',
+                           help="print the changes made by optimization passes to stderr")
+    argparser.add_argument('--cache', action='store_const', const=True,
+                           help="keep the checked program in --cache-dir, and load it from there on the next "
+                           "run of the same source; also on when CPARSER_CACHE is set in the environment")
+    argparser.add_argument('--no-cache', dest='cache', action='store_const', const=False,
+                           help="do not use the cache even if CPARSER_CACHE is set")
+    argparser.add_argument('--cache-dir', default=os.path.join(os.path.expanduser('~'), '.cache', 'Cparser'),
+                           metavar='DIRECTORY', help="where --cache keeps checked programs "
+                           "(default: ~/.cache/Cparser)")
+    argparser.add_argument('--cache-size', type=int, default=64, metavar='MB',
+                           help="largest size of the cache before old programs are removed (default: 64)")
+    tools = argparser.add_mutually_exclusive_group()
+    tools.add_argument('--profile', nargs='?', const='-', metavar='FILE',
+                       help="time every node, line and function the interpreter runs and write the "
+                       "report to FILE, or the top of it to stderr")
+    tools.add_argument('--sample', metavar='FILE',
+                       help="sample where the interpreter is while it runs and write the collapsed "
+                       "stacks, for a flame graph, to FILE")
+    tools.add_argument('--trace', metavar='FILE',
+                       help="write spans of the phases of the run, and of every call the top level of the "
+                       "program makes, with the peak RSS, to FILE as a Chrome trace (the cache is not used)")
+    argparser.add_argument('--sample-interval', type=float, default=5.0, metavar='MS',
+                           help="time between two samples of --sample (default: 5)")
+    args = argparser.parse_args()
+    filename = args.filename
+    if (args.profile is not None or args.sample is not None) and args.engine not in ('interpreter', 'typed'):
+        argparser.error("--profile and --sample need --engine interpreter or typed")
 
     try:
-        sourcefile = open(filename, "r")
+        source = open_source(filename)
     except IOError:
         print("Cannot open {0} file".format(filename))
         sys.exit(0)
 
-    c_parser = Cparser()
-    parser = yacc.yacc(module=c_parser)
-    text = sourcefile.read()
-    result = parser.parse(text, lexer=c_parser.scanner)
-
-    typeChecker = TypeChecker()
-    typeChecker.visit(result, None)  # or alternatively ast.accept(typeChecker)
+    changes = []
+    settings = {'inline': {'threshold': args.inline_size}, 'memo': {'size': args.memo_size}}
+    cache = None
+    if args.cache or args.cache is None and os.environ.get('CPARSER_CACHE'):
+        from Cparser.Cache import CompileCache
+        cache = CompileCache(args.cache_dir, args.cache_size << 20)
+    tracer = None
+    try:
+        if args.trace is not None:
+            from Cparser.Trace import Tracer
+            tracer = Tracer()
+            result = deep(traced_frontend, tracer, source, args.optimize, changes, settings, args.scanner)
+        else:
+            result = deep(frontend, source, args.optimize, changes, settings, args.scanner, cache)
+    except CompileError:
+        # the errors are printed already
+        sys.exit(1)
+    if args.report:
+        for name, lineno, message in changes:
+            sys.stderr.write("{0}: line {1}: {2}\n".format(name, lineno, message))
 
     #print(result)
-    #result.accept(Interpreter())
-
-
+    if args.disassemble or args.engine == 'vm':
+        from Cparser.Bytecode import BytecodeCompiler
+        result.code = deep(BytecodeCompiler().compile_program, result)
+    if args.disassemble:
+        from Cparser.Bytecode import disassemble
+        print(disassemble(result.code))
+    elif args.profile is not None:
+        from Cparser.Profiler import Profile
+        profile = Profile(result)
+        status = execute(result, args.engine, args.max_depth, profile)
+        text = source[:] if isinstance(source, (str, mmap.mmap)) else None
+        if args.profile == '-':
+            profile.report(sys.stderr, text)
+        else:
+            with open(args.profile, 'w') as output:
+                profile.report(output, text, limit=None)
+        sys.exit(status)
+    elif args.sample is not None:
+        from Cparser.Sampler import Sampler
+        sampler = Sampler(args.sample_interval / 1000.0)
+        sampler.start()
+        try:
+            status = execute(result, args.engine, args.max_depth)
+        finally:
+            sampler.stop()
+        with open(args.sample, 'w') as output:
+            sampler.write(output)
+        sys.exit(status)
+    elif tracer is not None:
+        try:
+            with tracer.span('execute', engine=args.engine):
+                status = execute(result, args.engine, args.max_depth, tracer=tracer)
+        finally:
+            with open(args.trace, 'w') as output:
+                tracer.write(output)
+        sys.exit(status)
+    elif execute(result, args.engine, args.max_depth):
+        sys.exit(1)
@@ -0,0 +1,212 @@
+import argparse
+import ctypes
+import os
+import Queue
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from StringIO import StringIO
+
+import main
+from client import send, receive
+
+# Compile and run server: keeps the parser tables, the checker and the
+# engines loaded, and runs the programs client.py sends it on a Unix socket.
+#
+# Connections wait in a queue for one of `workers` threads, which answers
+# every request on a connection until the client closes it. Each worker has
+# its own parser per scanner, as ply parsers keep their state on the parser
+# object, and every run gets a fresh engine. sys.stdout and sys.stderr are
+# replaced by Output, so what a worker prints goes to its own request.
+#
+# A run gets `timeout` seconds. Threads cannot be killed, so a Deadline
+# raises Timeout in the worker once they are over (PyThreadState_SetAsyncExc);
+# the worker answers with an error and takes the next request. The exception
+# comes between two Python bytecodes, so a single long operation in C, such
+# as building a huge string, finishes first.
+
+
+class Output(object):
+    # stands in for a stream: writes of a thread that is capturing go to its
+    # buffer, those of other threads to the stream
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is None:
+            self.stream.write(text)
+        else:
+            buffer.write(text)
+
+    def capture(self):
+        self.local.buffer = StringIO()
+
+    def release(self):
+        text = self.local.buffer.getvalue()
+        self.local.buffer = None
+        return text
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+class Timeout(BaseException):
+    # not an Exception, so that no handler of the engines catches it
+    pass
+
+
+def interrupt(thread, exception):
+    # raises exception in thread when it runs its next bytecode; None
+    # takes back one that is still pending
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_long(thread), ctypes.py_object(exception) if exception is not None else None)
+
+
+class Deadline(object):
+    # raises Timeout in the thread that made it after seconds, unless
+    # cancel() comes first; cancel() also drops a Timeout that is on its way,
+    # so once it returns none is raised outside the block it guards
+    def __init__(self, seconds):
+        self.thread = threading.current_thread().ident
+        self.lock = threading.Lock()
+        self.done = False
+        self.expired = False
+        self.timer = threading.Timer(seconds, self.expire)
+        self.timer.daemon = True
+        self.timer.start()
+
+    def expire(self):
+        with self.lock:
+            if not self.done:
+                self.expired = True
+                interrupt(self.thread, Timeout)
+
+    def cancel(self):
+        self.timer.cancel()
+        with self.lock:
+            self.done = True
+            if self.expired:
+                interrupt(self.thread, None)
+
+
+class Server(object):
+    def __init__(self, path, workers=4, timeout=30.0):
+        self.path = path
+        self.workers = workers
+        self.timeout = timeout
+        self.connections = Queue.Queue()
+        self.stdout = sys.stdout = Output(sys.stdout)
+        self.stderr = sys.stderr = Output(sys.stderr)
+
+    def serve(self):
+        listener = self.listen()
+        for i in range(self.workers):
+            worker = threading.Thread(target=self.work)
+            worker.daemon = True
+            worker.start()
+        try:
+            while True:
+                connection, address = listener.accept()
+                self.connections.put(connection)
+        finally:
+            listener.close()
+            os.remove(self.path)
+
+    def listen(self):
+        if os.path.exists(self.path):
+            # left by a server that is gone, unless one still answers
+            try:
+                probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                probe.connect(self.path)
+                probe.close()
+                sys.exit("a server is already listening on {0}".format(self.path))
+            except socket.error:
+                os.remove(self.path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.path)
+        os.chmod(self.path, 0600)
+        listener.listen(64)
+        return listener
+
+    def work(self):
+        parsers = {}
+        while True:
+            connection = self.connections.get()
+            try:
+                message = receive(connection)
+                while message is not None:
+                    send(connection, self.handle(message, parsers))
+                    message = receive(connection)
+            except (socket.error, ValueError):
+                pass
+            finally:
+                connection.close()
+
+    def handle(self, message, parsers):
+        scanner = message.get('scanner', 'ply')
+        engine = message.get('engine', 'interpreter')
+        if scanner not in main.scanners or engine not in main.engines:
+            return {'stdout': '', 'stderr': "unknown scanner or engine\n", 'status': 2,
+                    'timing': {'frontend': 0.0, 'run': 0.0}}
+        if scanner not in parsers:
+            parsers[scanner] = main.build_parser(scanner)
+
+        settings = {'inline': {'threshold': message.get('inline_size') or 40},
+                    'memo': {'size': message.get('memo_size') or 1024}}
+        encoding = message.get('encoding') or 'utf-8'
+        changes = []
+        status = 0
+        self.stdout.capture()
+        self.stderr.capture()
+        start = time.time()
+        ran = None
+        try:
+            deadline = Deadline(self.timeout)
+            try:
+                source = message['source'].encode(encoding)
+                result = main.frontend(source, message.get('optimize') or (), changes, settings,
+                                       scanner, parser=parsers[scanner])
+                if message.get('report'):
+                    for name, lineno, text in changes:
+                        sys.stderr.write("{0}: line {1}: {2}\n".format(name, lineno, text))
+                ran = time.time()
+                status = main.execute(result, engine, message.get('max_depth'))
+            finally:
+                deadline.cancel()
+        except Timeout:
+            sys.stderr.write("error: stopped after {0:g} s\n".format(self.timeout))
+            status = 1
+        except main.CompileError:
+            # the errors are in stdout already
+            status = 1
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+            status = 1
+        end = time.time()
+        if ran is None:
+            ran = end
+        return {'stdout': self.stdout.release().decode(encoding, 'replace'),
+                'stderr': self.stderr.release().decode(encoding, 'replace'),
+                'status': status,
+                'timing': {'frontend': ran - start, 'run': end - ran}}
+
+
+if __name__ == '__main__':
+    argparser = argparse.ArgumentParser()
+    argparser.add_argument('socket', help="path of the Unix socket to listen on")
+    argparser.add_argument('--workers', type=int, default=4,
+                           help="requests run at the same time (default: 4)")
+    argparser.add_argument('--timeout', type=float, default=30.0, metavar='SECONDS',
+                           help="time a request may take before it is stopped (default: 30)")
+    args = argparser.parse_args()
+
+    sys.setrecursionlimit(5000)
+    # deep programs recurse as far in the workers as in main.py
+    threading.stack_size(64 << 20)
+    signal.signal(signal.SIGTERM, lambda number, frame: sys.exit(0))
+    Server(args.socket, args.workers, args.timeout).serve()